@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Benchmark runner for the Taakra Backend API
+
+Drives fixed scenarios against a server backed by the generated benchmark
+dataset (npm run bench:seed), stores the results as JSON and compares them
+with a baseline to flag latency or throughput regressions.
+
+    python benchmark.py run --save-baseline
+    python benchmark.py run --baseline benchmarks/baseline.json
+    python benchmark.py compare benchmarks/results/<run>.json benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from colorama import Fore, Style
+
+from test_all_apis import get_session, percentile
+
+DEFAULT_MANIFEST = 'benchmarks/dataset.json'
+DEFAULT_BASELINE = 'benchmarks/baseline.json'
+RESULTS_DIR = 'benchmarks/results'
+
+SEARCH_TERMS = ['bench', 'competition', 'hall', 'block', 'category 3', 'code', 'ready team', 'submit']
+AUTOCOMPLETE_PREFIXES = ['bench', 'bench competition 1', 'bench competition 42', 'bench competition 9']
+CATALOG_SORTS = [None, 'most-registrations', 'new', 'trending']
+MAX_PAGES = 5
+
+
+def bench_id(manifest, kind, index):
+    """Deterministic ObjectId used by the data generator"""
+    return f"{manifest['idPrefix']}{manifest['idKinds'][kind]:02x}{index:020x}"
+
+
+def user_email(manifest, index):
+    return manifest['userEmailPattern'].replace('{index}', str(index))
+
+
+class Context:
+    """Shared state for one benchmark run: server, dataset and logged-in users"""
+
+    def __init__(self, base_url, manifest, pool_size, seed):
+        self.base_url = base_url
+        self.manifest = manifest
+        self.seed = seed
+        self.thread_state = threading.local()
+        self.admin_token = self.login(manifest['adminEmail'])
+
+        # Users 1..pool_size are also chat users, so each has message history
+        pool_size = min(pool_size, manifest['chatUsers'] - 1, manifest['users'] - 1)
+        with ThreadPoolExecutor(max_workers=min(pool_size, 16)) as executor:
+            tokens = list(executor.map(lambda i: self.login(user_email(manifest, i)), range(1, pool_size + 1)))
+        self.users = [{'index': i + 1, 'token': token} for i, token in enumerate(tokens)]
+
+    def login(self, email):
+        response = get_session().post(
+            f"{self.base_url}/api/auth/login",
+            json={'email': email, 'password': self.manifest['password']},
+            timeout=30,
+        )
+        response.raise_for_status()
+        return response.json()['data']['accessToken']
+
+    def request(self, method, path, token=None, **kwargs):
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        return get_session().request(method, f"{self.base_url}{path}", headers=headers, timeout=30, **kwargs)
+
+    def state(self):
+        """Per-thread scratch space (pagination cursors)"""
+        if not hasattr(self.thread_state, 'cursors'):
+            self.thread_state.cursors = {}
+        return self.thread_state.cursors
+
+
+# Each scenario takes the context and returns (operation, teardown).
+# operation(i) performs one request and returns True on success.
+
+def scenario_catalog_browse(ctx):
+    """Page through the competition listing with keyset cursors"""
+    def operation(i):
+        sort = CATALOG_SORTS[i % len(CATALOG_SORTS)]
+        cursors = ctx.state()
+        cursor, pages = cursors.get(sort, (None, 0))
+
+        params = {'limit': 20}
+        if sort:
+            params['sort'] = sort
+        if cursor:
+            params['cursor'] = cursor
+
+        response = ctx.request('GET', '/api/competitions', params=params)
+        if response.status_code != 200:
+            return False
+
+        next_cursor = response.json().get('pagination', {}).get('nextCursor')
+        cursors[sort] = (next_cursor, pages + 1) if next_cursor and pages + 1 < MAX_PAGES else (None, 0)
+        return True
+
+    return operation, None
+
+
+def scenario_search(ctx):
+    """Full-text search alternating with autocomplete"""
+    def operation(i):
+        if i % 2 == 0:
+            term = SEARCH_TERMS[(i // 2) % len(SEARCH_TERMS)]
+            response = ctx.request('GET', '/api/competitions', params={'search': term, 'limit': 20})
+        else:
+            prefix = AUTOCOMPLETE_PREFIXES[(i // 2) % len(AUTOCOMPLETE_PREFIXES)]
+            response = ctx.request('GET', '/api/competitions/autocomplete', params={'q': prefix})
+        return response.status_code == 200
+
+    return operation, None
+
+
+def scenario_registration_burst(ctx):
+    """Concurrent registrations; created ones are removed afterwards so reruns match"""
+    created = []
+    created_lock = threading.Lock()
+    competitions = ctx.manifest['competitions']
+
+    def operation(i):
+        user = ctx.users[i % len(ctx.users)]
+        competition = random.Random(ctx.seed * 1000003 + i).randrange(competitions)
+        response = ctx.request('POST', '/api/registrations', token=user['token'],
+                               json={'competition': bench_id(ctx.manifest, 'competition', competition)})
+        if response.status_code == 201:
+            with created_lock:
+                created.append(response.json()['data']['_id'])
+            return True
+        # Already registered (generated data or an earlier op) is a valid outcome
+        return response.status_code == 400
+
+    def teardown():
+        for registration_id in created:
+            ctx.request('DELETE', f'/api/registrations/{registration_id}', token=ctx.admin_token)
+
+    return operation, teardown
+
+
+def scenario_admin_stats(ctx):
+    """Admin dashboard statistics"""
+    def operation(i):
+        return ctx.request('GET', '/api/admin/stats', token=ctx.admin_token).status_code == 200
+
+    return operation, None
+
+
+def scenario_chat_history(ctx):
+    """Newest chat page, then older pages via the `before` cursor"""
+    chat_users = ctx.manifest['chatUsers']
+
+    def operation(i):
+        user = ctx.users[i % len(ctx.users)]
+        peer = bench_id(ctx.manifest, 'user', (user['index'] + 1) % chat_users)
+        cursors = ctx.state()
+        before, pages = cursors.get(user['index'], (None, 0))
+
+        params = {'limit': 50}
+        if before:
+            params['before'] = before
+
+        response = ctx.request('GET', f'/api/chat/{peer}', token=user['token'], params=params)
+        if response.status_code != 200:
+            return False
+
+        pagination = response.json().get('pagination', {})
+        more = pagination.get('hasMore') and pages + 1 < MAX_PAGES
+        cursors[user['index']] = (pagination.get('before'), pages + 1) if more else (None, 0)
+        return True
+
+    return operation, None
+
+
+def scenario_login_burst(ctx):
+    """Logins spread over every generated user, as when registration opens"""
+    users = ctx.manifest['users']
+
+    def operation(i):
+        index = 1 + random.Random(ctx.seed * 1000003 + i).randrange(users - 1)
+        response = ctx.request('POST', '/api/auth/login',
+                               json={'email': user_email(ctx.manifest, index),
+                                     'password': ctx.manifest['password']})
+        return response.status_code == 200
+
+    return operation, None
+
+
+SCENARIOS = {
+    'catalog-browse': scenario_catalog_browse,
+    'search': scenario_search,
+    'registration-burst': scenario_registration_burst,
+    'admin-stats': scenario_admin_stats,
+    'chat-history': scenario_chat_history,
+    'login-burst': scenario_login_burst,
+}
+
+
+def run_scenario(ctx, name, requests_count, concurrency, warmup):
+    """Run one scenario and return its latency and throughput summary"""
+    operation, teardown = SCENARIOS[name](ctx)
+
+    # Warmup indexes follow the timed ones so both sets are reproducible
+    for i in range(warmup):
+        operation(requests_count + i)
+
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def timed(i):
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            ok = operation(i)
+        except Exception:
+            ok = False
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(timed, range(requests_count)))
+    wall = time.perf_counter() - started
+
+    if teardown:
+        teardown()
+
+    latencies.sort()
+    return {
+        'requests': requests_count,
+        'errors': errors,
+        'concurrency': concurrency,
+        'duration_s': round(wall, 3),
+        'throughput_rps': round(requests_count / wall, 2) if wall > 0 else 0.0,
+        'latency_ms': {
+            'mean': round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            'p50': round(percentile(latencies, 50), 2),
+            'p95': round(percentile(latencies, 95), 2),
+            'p99': round(percentile(latencies, 99), 2),
+            'max': round(latencies[-1], 2) if latencies else 0.0,
+        },
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(current, baseline, threshold):
+    """Print a comparison table and return the list of regressions"""
+    regressions = []
+
+    print(f"\n{Fore.CYAN}{'Scenario':<20} {'p95 ms':>18} {'change':>8} {'req/s':>18} {'change':>8}{Style.RESET_ALL}")
+    for name, result in current['scenarios'].items():
+        base = baseline['scenarios'].get(name)
+        if not base:
+            print(f"{name:<20} {'(no baseline)':>18}")
+            continue
+
+        p95, base_p95 = result['latency_ms']['p95'], base['latency_ms']['p95']
+        rps, base_rps = result['throughput_rps'], base['throughput_rps']
+        p95_change = (p95 - base_p95) / base_p95 * 100 if base_p95 else 0.0
+        rps_change = (rps - base_rps) / base_rps * 100 if base_rps else 0.0
+
+        problems = []
+        if p95_change > threshold:
+            problems.append(f"p95 +{p95_change:.1f}%")
+        if rps_change < -threshold:
+            problems.append(f"throughput {rps_change:.1f}%")
+        if result['errors'] > base['errors']:
+            problems.append(f"errors {base['errors']} -> {result['errors']}")
+
+        color = Fore.RED if problems else Fore.GREEN
+        print(f"{color}{name:<20} {base_p95:>8.1f} -> {p95:<8.1f} {p95_change:>+7.1f}% "
+              f"{base_rps:>8.1f} -> {rps:<8.1f} {rps_change:>+7.1f}%{Style.RESET_ALL}")
+
+        regressions.extend(f"{name}: {problem}" for problem in problems)
+
+    if regressions:
+        print(f"\n{Fore.RED}Regressions beyond {threshold}%:{Style.RESET_ALL}")
+        for regression in regressions:
+            print(f"  - {regression}")
+    else:
+        print(f"\n{Fore.GREEN}No regressions beyond {threshold}%{Style.RESET_ALL}")
+
+    return regressions
+
+
+def load_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+
+
+def command_run(args):
+    manifest = load_json(args.manifest)
+    names = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        sys.exit(f"Unknown scenarios: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+
+    print(f"{Fore.CYAN}Logging in benchmark users...{Style.RESET_ALL}")
+    ctx = Context(args.base_url, manifest, args.pool_users, args.seed)
+
+    results = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'base_url': args.base_url,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'warmup': args.warmup,
+            'seed': args.seed,
+            'dataset': manifest,
+        },
+        'scenarios': {},
+    }
+
+    for name in names:
+        print(f"{Fore.CYAN}Running {name}...{Style.RESET_ALL}", end=' ', flush=True)
+        summary = run_scenario(ctx, name, args.requests, args.concurrency, args.warmup)
+        results['scenarios'][name] = summary
+        latency = summary['latency_ms']
+        print(f"p50 {latency['p50']:.1f}ms  p95 {latency['p95']:.1f}ms  "
+              f"{summary['throughput_rps']:.1f} req/s  errors {summary['errors']}")
+
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    output = args.output or os.path.join(RESULTS_DIR, f"{stamp}-{results['meta']['commit'] or 'local'}.json")
+    write_json(output, results)
+    print(f"\nResults written to {output}")
+
+    if args.save_baseline:
+        write_json(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        regressions = compare_results(results, load_json(args.baseline), args.threshold)
+        return 1 if regressions else 0
+
+    print(f"{Fore.YELLOW}No baseline at {args.baseline}; run with --save-baseline to create one{Style.RESET_ALL}")
+    return 0
+
+
+def command_compare(args):
+    regressions = compare_results(load_json(args.current), load_json(args.baseline), args.threshold)
+    return 1 if regressions else 0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Taakra backend benchmark runner')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help='Run the benchmark scenarios')
+    run.add_argument('--base-url', default='http://localhost:5000', help='Backend base URL')
+    run.add_argument('--manifest', default=DEFAULT_MANIFEST, help='Dataset manifest written by bench:seed')
+    run.add_argument('--scenarios', default=','.join(SCENARIOS),
+                     help=f"Comma-separated scenarios ({', '.join(SCENARIOS)})")
+    run.add_argument('--requests', type=int, default=500, help='Timed requests per scenario')
+    run.add_argument('--concurrency', type=int, default=10, help='Concurrent requests per scenario')
+    run.add_argument('--warmup', type=int, default=20, help='Untimed requests before each scenario')
+    run.add_argument('--pool-users', type=int, default=50, help='Benchmark users to log in')
+    run.add_argument('--seed', type=int, default=42, help='Seed for request choices')
+    run.add_argument('--output', help='Results file (default: benchmarks/results/<time>-<commit>.json)')
+    run.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline to compare against')
+    run.add_argument('--save-baseline', action='store_true', help='Store this run as the baseline')
+    run.add_argument('--threshold', type=float, default=10.0,
+                     help='Allowed p95/throughput change in percent before flagging a regression')
+
+    compare = subparsers.add_parser('compare', help='Compare two result files')
+    compare.add_argument('current', help='Results to check')
+    compare.add_argument('baseline', help='Baseline results')
+    compare.add_argument('--threshold', type=float, default=10.0,
+                         help='Allowed p95/throughput change in percent before flagging a regression')
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.command == 'run':
+        sys.exit(command_run(args))
+    sys.exit(command_compare(args))
+
+
+if __name__ == '__main__':
+    main()
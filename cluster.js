@@ -0,0 +1,141 @@
+import dotenv from 'dotenv';
+import cluster from 'cluster';
+import os from 'os';
+import { fileURLToPath } from 'url';
+import logger from './src/config/logger.js';
+import { attachWorker, startRateLimitSweep } from './src/config/cluster.js';
+
+// Load environment variables
+dotenv.config();
+
+// Multi-core entry point (`npm run start:cluster`). The primary forks
+// WEB_CONCURRENCY workers (default: one per core), each running server.js
+// on the shared port, and holds the state they share: rate limit counters
+// and cache/user/calendar invalidations (see src/config/cluster.js).
+//
+//   SIGUSR2         rolling restart, one worker at a time - a replacement
+//                   must be listening before the worker it replaces stops
+//   SIGTERM/SIGINT  graceful shutdown of every worker
+//
+// Workers that exit unexpectedly are replaced.
+
+const WORKERS = parseInt(process.env.WEB_CONCURRENCY) || os.availableParallelism();
+const RESPAWN_DELAY_MS = 1000;
+
+// Socket.IO's cluster adapter relays room emits through the primary.
+// Workers use it unless SOCKET_ADAPTER picks another adapter.
+if ((process.env.SOCKET_ADAPTER || 'cluster') === 'cluster') {
+  try {
+    const { setupPrimary } = await import('@socket.io/cluster-adapter');
+    setupPrimary();
+  } catch (error) {
+    logger.error(`Socket.IO cluster adapter unavailable in primary: ${error.message}`);
+  }
+}
+
+cluster.setupPrimary({ exec: fileURLToPath(new URL('./server.js', import.meta.url)) });
+
+// worker.id -> slot. Slot 0 runs the scheduled jobs (stats reconciliation),
+// and its replacement inherits them.
+const slots = new Map();
+let stopping = false;
+let restarting = false;
+
+const fork = (slot) => {
+  const worker = cluster.fork({
+    WORKER_SLOT: String(slot),
+    RUN_SCHEDULED_JOBS: slot === 0 ? 'true' : 'false',
+  });
+  slots.set(worker.id, slot);
+  attachWorker(worker);
+  return worker;
+};
+
+// SIGTERM runs the worker's graceful shutdown (see server.js)
+const retire = (worker) =>
+  new Promise((resolve) => {
+    worker.retiring = true;
+    if (worker.isDead()) {
+      resolve();
+      return;
+    }
+    worker.once('exit', resolve);
+    worker.process.kill('SIGTERM');
+  });
+
+const waitUntilListening = (worker) =>
+  new Promise((resolve, reject) => {
+    // A replacement that dies on startup isn't respawned; the worker it
+    // was meant to replace keeps serving
+    const onExit = () => {
+      worker.retiring = true;
+      reject(new Error(`worker ${worker.process.pid} exited before listening`));
+    };
+    worker.once('exit', onExit);
+    worker.once('listening', () => {
+      worker.off('exit', onExit);
+      resolve();
+    });
+  });
+
+cluster.on('exit', (worker, code, signal) => {
+  const slot = slots.get(worker.id);
+  slots.delete(worker.id);
+
+  if (stopping || worker.retiring) {
+    return;
+  }
+
+  logger.error(`Worker ${worker.process.pid} exited (${signal || code}), starting a replacement`);
+  setTimeout(() => {
+    if (!stopping) {
+      fork(slot);
+    }
+  }, RESPAWN_DELAY_MS);
+});
+
+const rollingRestart = async () => {
+  if (restarting || stopping) {
+    return;
+  }
+  restarting = true;
+  logger.info('Rolling restart started');
+
+  try {
+    const current = Object.values(cluster.workers).filter((worker) => !worker.retiring);
+    for (const worker of current) {
+      const replacement = fork(slots.get(worker.id));
+      await waitUntilListening(replacement);
+      await retire(worker);
+      logger.info(`Worker ${worker.process.pid} replaced by ${replacement.process.pid}`);
+    }
+    logger.info('Rolling restart finished');
+  } catch (error) {
+    logger.error(`Rolling restart aborted: ${error.message}`);
+  } finally {
+    restarting = false;
+  }
+};
+
+const shutdown = async (signal) => {
+  if (stopping) {
+    return;
+  }
+  stopping = true;
+  logger.info(`${signal} signal received: stopping ${Object.keys(cluster.workers).length} workers`);
+
+  await Promise.all(Object.values(cluster.workers).map(retire));
+  logger.info('All workers stopped');
+  process.exit(0);
+};
+
+process.on('SIGUSR2', rollingRestart);
+process.on('SIGTERM', () => shutdown('SIGTERM'));
+process.on('SIGINT', () => shutdown('SIGINT'));
+
+startRateLimitSweep();
+
+logger.info(`Primary ${process.pid} starting ${WORKERS} workers`);
+for (let slot = 0; slot < WORKERS; slot += 1) {
+  fork(slot);
+}
@@ -2,29 +2,55 @@ import dotenv from 'dotenv';
 import { createServer } from 'http';
 import { Server } from 'socket.io';
 import app from './src/app.js';
-import connectDB from './src/config/database.js';
+import connectDB, { warmPool } from './src/config/database.js';
+import connectCache from './src/config/cache.js';
 import logger from './src/config/logger.js';
 import initializeChatSocket from './src/sockets/chatSocket.js';
+import initializeChatbotSocket from './src/sockets/chatbotSocket.js';
+import configureSocketAdapter from './src/sockets/adapter.js';
+import messageQueue from './src/services/messageQueue.js';
+import { isClusterWorker } from './src/config/cluster.js';
+import { startStatsReconciliation } from './src/services/statsService.js';
 
 // Load environment variables
 dotenv.config();
 
-// Connect to database
-connectDB();
+// Connect to database and open the pool's connections before listening,
+// so no request waits on connection setup
+await connectDB();
+await warmPool();
+
+// Connect response cache backend
+await connectCache();
+
+// Keep the materialized admin stats in line with the source collections.
+// Under cluster.js only one worker runs the job.
+if (process.env.RUN_SCHEDULED_JOBS !== 'false') {
+  startStatsReconciliation();
+}
 
 // Create HTTP server
 const httpServer = createServer(app);
 
 // Initialize Socket.io
+// Under cluster.js connections are spread over workers without sticky
+// sessions, so a long-polling client's requests would land on workers that
+// don't know its session. Only WebSocket transport is offered there.
 const io = new Server(httpServer, {
   cors: {
     origin: process.env.CLIENT_URL || 'http://localhost:3000',
     credentials: true,
   },
+  ...(isClusterWorker && { transports: ['websocket'] }),
 });
 
-// Initialize chat socket
+// Share rooms across processes before any socket connects
+await configureSocketAdapter(io);
+
+// Initialize chat and chatbot sockets
 initializeChatSocket(io);
+initializeChatbotSocket(io);
+messageQueue.start();
 
 // Start server
 const PORT = process.env.PORT || 5000;
@@ -47,10 +73,31 @@ process.on('uncaughtException', (err) => {
   httpServer.close(() => process.exit(1));
 });
 
-// Graceful shutdown
-process.on('SIGTERM', () => {
-  logger.info('SIGTERM signal received: closing HTTP server');
-  httpServer.close(() => {
+// Graceful shutdown: stop accepting connections, let in-flight requests
+// finish and flush queued chat messages. cluster.js retires workers this
+// way during a rolling restart; their sockets reconnect to the others.
+let shuttingDown = false;
+
+const shutdown = (signal) => {
+  if (shuttingDown) {
+    return;
+  }
+  shuttingDown = true;
+  logger.info(`${signal} signal received: closing HTTP server`);
+
+  setTimeout(() => {
+    logger.warn('Graceful shutdown timed out, exiting');
+    process.exit(1);
+  }, parseInt(process.env.SHUTDOWN_TIMEOUT_MS) || 10000).unref();
+
+  // Disconnects every socket, then closes the HTTP server
+  io.close(async () => {
     logger.info('HTTP server closed');
+    await messageQueue.stop();
+    process.exit(0);
   });
-});
+  httpServer.closeIdleConnections();
+};
+
+process.on('SIGTERM', () => shutdown('SIGTERM'));
+process.on('SIGINT', () => shutdown('SIGINT'));
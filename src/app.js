@@ -1,9 +1,11 @@
 import express from 'express';
+import mongoose from 'mongoose';
 import cors from 'cors';
 import helmet from 'helmet';
 import morgan from 'morgan';
-import rateLimit from 'express-rate-limit';
 import errorHandler from './middleware/errorHandler.js';
+import { requestMetrics, metricsEndpoint } from './middleware/metrics.js';
+import { apiLimiter } from './middleware/rateLimit.js';
 
 // Import routes
 import authRoutes from './routes/authRoutes.js';
@@ -12,11 +14,13 @@ import competitionRoutes from './routes/competitionRoutes.js';
 import registrationRoutes from './routes/registrationRoutes.js';
 import adminRoutes from './routes/adminRoutes.js';
 import chatRoutes from './routes/chatRoutes.js';
-// CHATBOT DISABLED: Uncomment the line below to enable chatbot routes
 import chatbotRoutes from './routes/chatbotRoutes.js';
 
 const app = express();
 
+// Latency histograms and Server-Timing for every request
+app.use(requestMetrics);
+
 // Security middleware
 app.use(helmet());
 
@@ -37,17 +41,9 @@ app.use(
   })
 );
 
-// Rate limiting - more lenient in development
-const limiter = rateLimit({
-  windowMs: parseInt(process.env.RATE_LIMIT_WINDOW_MS) || 15 * 60 * 1000, // 15 minutes
-  max: parseInt(process.env.RATE_LIMIT_MAX_REQUESTS) || (process.env.NODE_ENV === 'development' ? 1000 : 100),
-  message: 'Too many requests from this IP, please try again later.',
-  standardHeaders: true,
-  legacyHeaders: false,
-  skip: (req) => process.env.NODE_ENV === 'development' && process.env.DISABLE_RATE_LIMIT === 'true',
-});
-
-app.use('/api/', limiter);
+// Rate limiting - more lenient in development, shared between cluster
+// workers (see middleware/rateLimit.js)
+app.use('/api/', apiLimiter);
 
 // Body parser
 app.use(express.json());
@@ -67,6 +63,18 @@ app.get('/health', (req, res) => {
   });
 });
 
+// Readiness check for load balancers: 503 while MongoDB is unreachable
+app.get('/ready', (req, res) => {
+  const ready = mongoose.connection.readyState === 1;
+  res.status(ready ? 200 : 503).json({
+    success: ready,
+    database: ready ? 'connected' : 'unavailable',
+  });
+});
+
+// Prometheus metrics
+app.get('/metrics', metricsEndpoint);
+
 // API routes
 app.use('/api/auth', authRoutes);
 app.use('/api/categories', categoryRoutes);
@@ -74,7 +82,6 @@ app.use('/api/competitions', competitionRoutes);
 app.use('/api/registrations', registrationRoutes);
 app.use('/api/admin', adminRoutes);
 app.use('/api/chat', chatRoutes);
-// CHATBOT DISABLED: Uncomment the line below to enable chatbot endpoint
 app.use('/api/chatbot', chatbotRoutes);
 
 // 404 handler
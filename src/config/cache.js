@@ -0,0 +1,145 @@
+import LRUCache from '../utils/lruCache.js';
+import logger from './logger.js';
+import { broadcast, onBroadcast } from './cluster.js';
+
+// Read lazily - modules load before server.js runs dotenv.config()
+const defaultTtl = () => (parseInt(process.env.CACHE_TTL_SECONDS) || 60) * 1000;
+
+// In-process store (default)
+const createMemoryStore = () => {
+  const lru = new LRUCache({
+    max: parseInt(process.env.CACHE_MAX_ENTRIES) || 500,
+    ttl: defaultTtl(),
+  });
+
+  return {
+    name: 'memory',
+    get: async (key) => lru.get(key),
+    set: async (key, value, ttl = defaultTtl()) => lru.set(key, value, ttl),
+    deletePrefix: async (prefix) => lru.deletePrefix(prefix),
+  };
+};
+
+// Redis-compatible store, shared between processes. Needs the optional
+// `redis` package (npm install redis).
+const createRedisStore = async (url) => {
+  const { createClient } = await import('redis');
+  const client = createClient({ url });
+
+  client.on('error', (err) => logger.error(`Cache Redis error: ${err.message}`));
+  await client.connect();
+
+  return {
+    name: 'redis',
+    client,
+    get: async (key) => {
+      const raw = await client.get(key);
+      return raw ? JSON.parse(raw) : undefined;
+    },
+    set: async (key, value, ttl = defaultTtl()) => {
+      await client.set(key, JSON.stringify(value), { PX: ttl });
+    },
+    deletePrefix: async (prefix) => {
+      const keys = [];
+      for await (const key of client.scanIterator({ MATCH: `${prefix}*`, COUNT: 100 })) {
+        keys.push(...[].concat(key));
+      }
+      if (keys.length > 0) {
+        await client.del(keys);
+      }
+      return keys.length;
+    },
+  };
+};
+
+let store = null;
+
+const getStore = () => {
+  if (!store) {
+    store = createMemoryStore();
+  }
+  return store;
+};
+
+const stats = { hits: 0, misses: 0 };
+
+// Bumped on every invalidation so a response computed before a write
+// is never stored after it
+const generations = new Map();
+
+const invalidateLocal = (namespaces) =>
+  Promise.all(
+    namespaces.map(async (namespace) => {
+      generations.set(namespace, cache.generation(namespace) + 1);
+      try {
+        await getStore().deletePrefix(`cache:${namespace}:`);
+      } catch (error) {
+        logger.warn(`Cache invalidation failed for ${namespace}: ${error.message}`);
+      }
+    })
+  );
+
+// Other cluster workers' writes. A Redis store was already cleared by the
+// writer, but the generation still has to move so in-flight responses
+// aren't stored.
+onBroadcast('cache:invalidate', (namespaces) => invalidateLocal(namespaces));
+
+export const cache = {
+  get backend() {
+    return getStore().name;
+  },
+
+  async get(key) {
+    try {
+      const value = await getStore().get(key);
+      if (value === undefined) {
+        stats.misses += 1;
+      } else {
+        stats.hits += 1;
+      }
+      return value;
+    } catch (error) {
+      logger.warn(`Cache read failed: ${error.message}`);
+      stats.misses += 1;
+      return undefined;
+    }
+  },
+
+  async set(key, value, ttl) {
+    try {
+      await getStore().set(key, value, ttl);
+    } catch (error) {
+      logger.warn(`Cache write failed: ${error.message}`);
+    }
+  },
+
+  generation(namespace) {
+    return generations.get(namespace) || 0;
+  },
+
+  async invalidate(...namespaces) {
+    await invalidateLocal(namespaces);
+    broadcast('cache:invalidate', namespaces);
+  },
+
+  stats() {
+    return { backend: getStore().name, ...stats };
+  },
+};
+
+// Switch to the Redis backend when CACHE_DRIVER=redis
+const connectCache = async () => {
+  if (process.env.CACHE_DRIVER !== 'redis') {
+    logger.info('Response cache: in-process LRU');
+    return;
+  }
+
+  try {
+    store = await createRedisStore(process.env.REDIS_URL || 'redis://localhost:6379');
+    logger.info('Response cache: Redis');
+  } catch (error) {
+    logger.warn(`Response cache: Redis unavailable (${error.message}), using in-process LRU`);
+  }
+};
+
+export default connectCache;
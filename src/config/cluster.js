@@ -0,0 +1,136 @@
+import cluster from 'cluster';
+import logger from './logger.js';
+
+// IPC between the cluster primary (cluster.js) and its workers. Outside
+// cluster mode broadcasts are no-ops, so callers never need to check.
+
+export const isClusterWorker = cluster.isWorker;
+
+const REQUEST_TIMEOUT_MS = 2000;
+
+// ---------------------------------------------------------------------------
+// Worker side
+// ---------------------------------------------------------------------------
+
+const pending = new Map(); // request id -> { resolve, reject, timer }
+const handlers = new Map(); // channel -> [handler]
+let nextRequestId = 0;
+
+if (isClusterWorker) {
+  process.on('message', (message) => {
+    if (message?.type === 'ipc:reply') {
+      const request = pending.get(message.id);
+      if (!request) {
+        return;
+      }
+      pending.delete(message.id);
+      clearTimeout(request.timer);
+      if (message.error) {
+        request.reject(new Error(message.error));
+      } else {
+        request.resolve(message.result);
+      }
+    } else if (message?.type === 'ipc:broadcast') {
+      (handlers.get(message.channel) || []).forEach((handler) => {
+        try {
+          handler(message.payload);
+        } catch (error) {
+          logger.error(`Cluster broadcast handler for ${message.channel} failed: ${error.message}`);
+        }
+      });
+    }
+  });
+}
+
+// Run `op` on the primary and resolve with its result
+export const requestPrimary = (op, payload) =>
+  new Promise((resolve, reject) => {
+    if (!isClusterWorker || !process.connected) {
+      reject(new Error('Not connected to a cluster primary'));
+      return;
+    }
+
+    nextRequestId += 1;
+    const id = nextRequestId;
+    const timer = setTimeout(() => {
+      pending.delete(id);
+      reject(new Error(`Cluster request ${op} timed out`));
+    }, REQUEST_TIMEOUT_MS);
+
+    pending.set(id, { resolve, reject, timer });
+    process.send({ type: 'ipc:request', id, op, payload });
+  });
+
+// Deliver `payload` to every other worker's `channel` handlers
+export const broadcast = (channel, payload) => {
+  if (isClusterWorker && process.connected) {
+    process.send({ type: 'ipc:broadcast', channel, payload });
+  }
+};
+
+export const onBroadcast = (channel, handler) => {
+  handlers.set(channel, [...(handlers.get(channel) || []), handler]);
+};
+
+// ---------------------------------------------------------------------------
+// Primary side
+// ---------------------------------------------------------------------------
+
+// Fixed-window rate limit counters shared by every worker
+const rateLimitWindows = new Map(); // key -> { hits, resetTime }
+
+const primaryOps = {
+  'rate-limit:increment': ({ key, windowMs }) => {
+    const now = Date.now();
+    let entry = rateLimitWindows.get(key);
+    if (!entry || entry.resetTime <= now) {
+      entry = { hits: 0, resetTime: now + windowMs };
+      rateLimitWindows.set(key, entry);
+    }
+    entry.hits += 1;
+    return { totalHits: entry.hits, resetTime: entry.resetTime };
+  },
+
+  'rate-limit:decrement': ({ key }) => {
+    const entry = rateLimitWindows.get(key);
+    if (entry && entry.hits > 0) {
+      entry.hits -= 1;
+    }
+  },
+
+  'rate-limit:reset': ({ key }) => {
+    rateLimitWindows.delete(key);
+  },
+};
+
+// Answer a worker's requests and relay its broadcasts to the others
+export const attachWorker = (worker) => {
+  worker.on('message', (message) => {
+    if (message?.type === 'ipc:request') {
+      const op = primaryOps[message.op];
+      const reply = op
+        ? { type: 'ipc:reply', id: message.id, result: op(message.payload) }
+        : { type: 'ipc:reply', id: message.id, error: `Unknown cluster op ${message.op}` };
+      if (worker.isConnected()) {
+        worker.send(reply);
+      }
+    } else if (message?.type === 'ipc:broadcast') {
+      Object.values(cluster.workers).forEach((other) => {
+        if (other && other !== worker && other.isConnected()) {
+          other.send(message);
+        }
+      });
+    }
+  });
+};
+
+// Drop expired rate limit windows once a minute
+export const startRateLimitSweep = () =>
+  setInterval(() => {
+    const now = Date.now();
+    rateLimitWindows.forEach((entry, key) => {
+      if (entry.resetTime <= now) {
+        rateLimitWindows.delete(key);
+      }
+    });
+  }, 60 * 1000).unref();
@@ -1,29 +1,235 @@
 import mongoose from 'mongoose';
 import logger from './logger.js';
+import {
+  mongoPoolCheckoutWait,
+  mongoPoolConnections,
+  mongoPoolWaitQueue,
+  mongoPoolCheckoutFailures,
+} from './metrics.js';
 
-const connectDB = async () => {
-  try {
-    const conn = await mongoose.connect(process.env.MONGODB_URI, {
-      serverSelectionTimeoutMS: 5000,
-    });
+// Pool sizing per workload; MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE and
+// MONGO_MAX_CONNECTING override the preset
+const POOL_PRESETS = {
+  // API server: many short queries, with a warm floor of connections
+  api: { maxPoolSize: 50, minPoolSize: 5, maxConnecting: 4 },
+  // Seed and benchmark scripts: a few long-running bulk writes
+  batch: { maxPoolSize: 10, minPoolSize: 0, maxConnecting: 2 },
+};
 
-    logger.info(`MongoDB Connected: ${conn.connection.host}`);
+let poolSettings = null;
 
-    mongoose.connection.on('error', (err) => {
-      logger.error(`MongoDB connection error: ${err}`);
-    });
+const buildOptions = (workload) => {
+  const preset = POOL_PRESETS[workload] || POOL_PRESETS.api;
+  const envInt = (name, fallback) => {
+    const value = parseInt(process.env[name]);
+    return Number.isNaN(value) ? fallback : value;
+  };
 
-    mongoose.connection.on('disconnected', () => {
-      logger.warn('MongoDB disconnected. Attempting to reconnect...');
-    });
+  poolSettings = {
+    maxPoolSize: envInt('MONGO_MAX_POOL_SIZE', preset.maxPoolSize),
+    minPoolSize: envInt('MONGO_MIN_POOL_SIZE', preset.minPoolSize),
+    maxConnecting: envInt('MONGO_MAX_CONNECTING', preset.maxConnecting),
+  };
 
-    mongoose.connection.on('reconnected', () => {
-      logger.info('MongoDB reconnected');
-    });
+  return {
+    ...poolSettings,
+    // How long an operation may wait for a free connection (0 = no limit)
+    waitQueueTimeoutMS: envInt('MONGO_WAIT_QUEUE_TIMEOUT_MS', 0),
+    serverSelectionTimeoutMS: envInt('MONGO_SERVER_SELECTION_TIMEOUT_MS', 5000),
+  };
+};
+
+// Pool events -> /metrics. Connection ids are tracked in sets, so events
+// from before the listeners were attached can't push a gauge below zero.
+const instrumentPool = (client) => {
+  const open = new Map(); // address -> Set(connectionId)
+  const checkedOut = new Map(); // address -> Set(connectionId)
+  const waiting = new Map(); // address -> count
+
+  const members = (map, address) => {
+    if (!map.has(address)) {
+      map.set(address, new Set());
+    }
+    return map.get(address);
+  };
+
+  const publish = (address) => {
+    mongoPoolConnections.set({ server: address, state: 'open' }, members(open, address).size);
+    mongoPoolConnections.set({ server: address, state: 'checked_out' }, members(checkedOut, address).size);
+    mongoPoolWaitQueue.set({ server: address }, waiting.get(address) || 0);
+  };
+
+  const stopWaiting = (address) => {
+    waiting.set(address, Math.max(0, (waiting.get(address) || 0) - 1));
+  };
+
+  client.on('connectionCreated', ({ address, connectionId }) => {
+    members(open, address).add(connectionId);
+    publish(address);
+  });
+
+  client.on('connectionClosed', ({ address, connectionId }) => {
+    members(open, address).delete(connectionId);
+    members(checkedOut, address).delete(connectionId);
+    publish(address);
+  });
+
+  client.on('connectionCheckOutStarted', ({ address }) => {
+    waiting.set(address, (waiting.get(address) || 0) + 1);
+    publish(address);
+  });
+
+  client.on('connectionCheckedOut', ({ address, connectionId, durationMS }) => {
+    stopWaiting(address);
+    members(open, address).add(connectionId);
+    members(checkedOut, address).add(connectionId);
+    // durationMS is reported by driver 6.9 and later
+    if (durationMS !== undefined) {
+      mongoPoolCheckoutWait.observe({ server: address }, durationMS / 1000);
+    }
+    publish(address);
+  });
+
+  client.on('connectionCheckOutFailed', ({ address, reason }) => {
+    stopWaiting(address);
+    mongoPoolCheckoutFailures.inc({ server: address, reason });
+    publish(address);
+  });
+
+  client.on('connectionCheckedIn', ({ address, connectionId }) => {
+    members(checkedOut, address).delete(connectionId);
+    publish(address);
+  });
+
+  client.on('connectionPoolCleared', ({ address }) => {
+    logger.warn(`MongoDB connection pool for ${address} cleared`);
+  });
+};
+
+// workload: 'api' for the server, 'batch' for seed scripts. The first
+// connection is retried with backoff (MONGO_CONNECT_RETRIES, default 5)
+// before giving up.
+const connectDB = async ({ workload = 'api' } = {}) => {
+  const options = buildOptions(workload);
+  const retries = parseInt(process.env.MONGO_CONNECT_RETRIES) || 5;
+
+  for (let attempt = 1; ; attempt += 1) {
+    try {
+      const conn = await mongoose.connect(process.env.MONGODB_URI, options);
+      logger.info(
+        `MongoDB Connected: ${conn.connection.host} (${workload} pool ${options.minPoolSize}-${options.maxPoolSize})`
+      );
+      break;
+    } catch (error) {
+      if (attempt >= retries) {
+        logger.error(`Error: ${error.message}`);
+        process.exit(1);
+      }
+      const delay = Math.min(1000 * 2 ** (attempt - 1), 10000);
+      logger.warn(
+        `MongoDB connection failed (attempt ${attempt}/${retries}): ${error.message} - retrying in ${delay}ms`
+      );
+      await new Promise((resolve) => setTimeout(resolve, delay));
+    }
+  }
+
+  instrumentPool(mongoose.connection.getClient());
+
+  mongoose.connection.on('error', (err) => {
+    logger.error(`MongoDB connection error: ${err}`);
+  });
 
-  } catch (error) {
-    logger.error(`Error: ${error.message}`);
-    process.exit(1);
+  mongoose.connection.on('disconnected', () => {
+    logger.warn('MongoDB disconnected. Attempting to reconnect...');
+  });
+
+  mongoose.connection.on('reconnected', () => {
+    logger.info('MongoDB reconnected');
+  });
+
+  return mongoose.connection;
+};
+
+let catalogPreference;
+
+// Where read-heavy, staleness-tolerant queries (public catalog, admin
+// stats) go. CATALOG_READ_PREFERENCE=secondaryPreferred (or secondary,
+// nearest) sends them to secondaries that lag the primary by at most
+// CATALOG_MAX_STALENESS_SECONDS (90 minimum, the driver's floor).
+export const catalogReadPreference = () => {
+  if (catalogPreference === undefined) {
+    const mode = process.env.CATALOG_READ_PREFERENCE || 'primary';
+    catalogPreference =
+      mode === 'primary'
+        ? null
+        : new mongoose.mongo.ReadPreference(mode, undefined, {
+            maxStalenessSeconds: Math.max(90, parseInt(process.env.CATALOG_MAX_STALENESS_SECONDS) || 90),
+          });
+  }
+  return catalogPreference;
+};
+
+// Route a query or aggregate through catalogReadPreference()
+export const withCatalogReads = (query) => {
+  const preference = catalogReadPreference();
+  return preference ? query.read(preference) : query;
+};
+
+// Check out minPoolSize connections (and reach a secondary, if catalog
+// reads go there) so the first requests don't pay for connection setup
+export const warmPool = async () => {
+  const started = Date.now();
+  const { db } = mongoose.connection;
+  const size = Math.max(1, poolSettings?.minPoolSize || 0);
+
+  await Promise.all(Array.from({ length: size }, () => db.command({ ping: 1 })));
+
+  const preference = catalogReadPreference();
+  if (preference) {
+    try {
+      await db.command({ ping: 1 }, { readPreference: preference });
+    } catch (error) {
+      logger.warn(`No server matches the catalog read preference yet: ${error.message}`);
+    }
+  }
+
+  logger.info(`MongoDB pool warmed (${size} connections) in ${Date.now() - started}ms`);
+};
+
+let transactionSupport;
+
+// Transactions need a replica set or sharded cluster; standalone servers
+// (typical local development) reject them
+export const supportsTransactions = async () => {
+  if (transactionSupport === undefined) {
+    try {
+      const hello = await mongoose.connection.db.admin().command({ hello: 1 });
+      transactionSupport = Boolean(hello.setName || hello.msg === 'isdbgrid');
+    } catch (error) {
+      logger.warn(`Could not detect transaction support: ${error.message}`);
+      return false;
+    }
+    logger.info(`MongoDB transactions ${transactionSupport ? 'enabled' : 'unavailable (standalone server)'}`);
+  }
+  return transactionSupport;
+};
+
+// Run fn(session) inside a transaction when the deployment supports it,
+// otherwise run fn(null) directly
+export const withTransaction = async (fn) => {
+  if (!(await supportsTransactions())) {
+    return fn(null);
+  }
+
+  const session = await mongoose.startSession();
+  try {
+    let result;
+    await session.withTransaction(async () => {
+      result = await fn(session);
+    });
+    return result;
+  } finally {
+    await session.endSession();
   }
 };
 
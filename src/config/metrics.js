@@ -0,0 +1,64 @@
+import { AsyncLocalStorage } from 'async_hooks';
+import { Registry } from '../utils/metrics.js';
+
+// Process-wide metrics registry, scraped at GET /metrics
+export const registry = new Registry();
+
+// Per-request timing context, so database time can be attributed to the
+// request that caused it (see the Server-Timing header)
+export const requestContext = new AsyncLocalStorage();
+
+export const httpRequestDuration = registry.histogram(
+  'http_request_duration_seconds',
+  'HTTP request latency by route',
+  [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+);
+
+export const mongoQueryDuration = registry.histogram(
+  'mongodb_query_duration_seconds',
+  'MongoDB operation latency by model and operation',
+  [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5]
+);
+
+export const mongoPoolCheckoutWait = registry.histogram(
+  'mongodb_pool_checkout_wait_seconds',
+  'Time an operation waited for a pooled connection, by server',
+  [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1]
+);
+
+export const mongoPoolConnections = registry.gauge(
+  'mongodb_pool_connections',
+  'Pooled connections by server and state (open, checked_out)'
+);
+
+export const mongoPoolWaitQueue = registry.gauge(
+  'mongodb_pool_wait_queue',
+  'Operations waiting for a pooled connection, by server'
+);
+
+export const mongoPoolCheckoutFailures = registry.counter(
+  'mongodb_pool_checkout_failures_total',
+  'Connection checkouts that failed, by server and reason'
+);
+
+export const socketConnections = registry.gauge(
+  'socketio_connections',
+  'Open Socket.IO connections (state="authenticated" once a user joined their room)'
+);
+
+export const chatMessagesSent = registry.counter(
+  'chat_messages_sent_total',
+  'Chat messages accepted by sendMessage'
+);
+
+// Record one MongoDB operation against the histogram and, if it ran inside
+// a request, against that request's database time
+export const recordQuery = (model, operation, seconds) => {
+  mongoQueryDuration.observe({ model, operation }, seconds);
+
+  const context = requestContext.getStore();
+  if (context) {
+    context.dbTime += seconds;
+    context.dbQueries += 1;
+  }
+};
@@ -1,60 +1,22 @@
 import asyncHandler from 'express-async-handler';
 import User from '../models/User.js';
-import Competition from '../models/Competition.js';
-import Registration from '../models/Registration.js';
 import ErrorResponse from '../utils/errorResponse.js';
+import Conversation from '../models/Conversation.js';
+import { getDashboardStats, recordUserDeleted } from '../services/statsService.js';
+import { unregisterAll } from '../services/registrationService.js';
+import { invalidateUser } from '../services/userCache.js';
+import { USER_COLUMNS } from '../services/exportService.js';
+import { streamExport } from '../utils/exportStream.js';
 
 // @desc    Get admin statistics
 // @route   GET /api/admin/stats
 // @access  Private/Admin
 export const getStats = asyncHandler(async (req, res) => {
-  const totalUsers = await User.countDocuments();
-  const totalCompetitions = await Competition.countDocuments();
-  const totalRegistrations = await Registration.countDocuments();
-
-  // Get registrations by competition
-  const registrationsByCompetition = await Registration.aggregate([
-    {
-      $group: {
-        _id: '$competition',
-        count: { $sum: 1 },
-      },
-    },
-    {
-      $lookup: {
-        from: 'competitions',
-        localField: '_id',
-        foreignField: '_id',
-        as: 'competition',
-      },
-    },
-    {
-      $unwind: '$competition',
-    },
-    {
-      $project: {
-        count: 1,
-        competition: {
-          title: '$competition.title',
-        },
-      },
-    },
-    {
-      $sort: { count: -1 },
-    },
-    {
-      $limit: 10,
-    },
-  ]);
+  const stats = await getDashboardStats();
 
   res.json({
     success: true,
-    data: {
-      totalUsers,
-      totalCompetitions,
-      totalRegistrations,
-      registrationsByCompetition,
-    },
+    data: stats,
   });
 });
 
@@ -76,6 +38,7 @@ export const addSupportMember = asyncHandler(async (req, res, next) => {
 
   user.role = 'support';
   await user.save();
+  invalidateUser(user._id);
 
   res.json({
     success: true,
@@ -95,3 +58,53 @@ export const getAllUsers = asyncHandler(async (req, res) => {
     data: users,
   });
 });
+
+// @desc    Delete a user with their registrations and inbox
+// @route   DELETE /api/admin/users/:id
+// @access  Private/Admin
+export const deleteUser = asyncHandler(async (req, res, next) => {
+  const user = await User.findById(req.params.id);
+
+  if (!user) {
+    return next(new ErrorResponse('User not found', 404));
+  }
+
+  if (user.role === 'admin') {
+    return next(new ErrorResponse('Admin accounts cannot be deleted', 400));
+  }
+
+  const registrations = await unregisterAll(user._id);
+
+  // Messages stay in the peers' history; the deleted user drops out of
+  // their inboxes like any missing profile
+  await Conversation.deleteMany({ owner: user._id });
+
+  await user.deleteOne();
+  recordUserDeleted();
+  invalidateUser(user._id);
+
+  res.json({
+    success: true,
+    data: { registrations },
+  });
+});
+
+// @desc    Export all users as NDJSON or CSV
+// @route   GET /api/admin/users/export?format=
+// @access  Private/Admin
+export const exportUsers = asyncHandler(async (req, res) => {
+  const cursor = User.find()
+    .select('-__v')
+    .sort({ createdAt: -1 })
+    .lean()
+    .cursor({ batchSize: 500 });
+
+  await streamExport(res, {
+    cursor,
+    format: req.query.format || 'ndjson',
+    filename: 'users',
+    columns: USER_COLUMNS,
+    // Password and refresh token are never selected
+    resolve: async (users) => users,
+  });
+});
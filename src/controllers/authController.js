@@ -1,4 +1,5 @@
 import asyncHandler from 'express-async-handler';
+import mongoose from 'mongoose';
 import User from '../models/User.js';
 import {
   generateAccessToken,
@@ -6,6 +7,9 @@ import {
   verifyRefreshToken,
 } from '../utils/generateToken.js';
 import ErrorResponse from '../utils/errorResponse.js';
+import { recordUserCreated } from '../services/statsService.js';
+import { invalidateUser } from '../services/userCache.js';
+import { verifyPassword } from '../services/passwordPool.js';
 
 // @desc    Register user
 // @route   POST /api/auth/signup
@@ -13,18 +17,19 @@ import ErrorResponse from '../utils/errorResponse.js';
 export const signup = asyncHandler(async (req, res, next) => {
   const { name, email, password } = req.body;
 
-  const userExists = await User.findOne({ email });
+  const userExists = await User.exists({ email });
   if (userExists) {
     return next(new ErrorResponse('User already exists', 400));
   }
 
-  const user = await User.create({ name, email, password, role: 'user' });
+  // The id is chosen up front so the refresh token is stored by the same
+  // insert instead of a second save
+  const _id = new mongoose.Types.ObjectId();
+  const accessToken = generateAccessToken(_id, 'user');
+  const refreshToken = generateRefreshToken(_id);
 
-  const accessToken = generateAccessToken(user._id);
-  const refreshToken = generateRefreshToken(user._id);
-
-  user.refreshToken = refreshToken;
-  await user.save();
+  const user = await User.create({ _id, name, email, password, role: 'user', refreshToken });
+  recordUserCreated();
 
   res.status(201).json({
     success: true,
@@ -38,27 +43,27 @@ export const signup = asyncHandler(async (req, res, next) => {
 export const login = asyncHandler(async (req, res, next) => {
   const { email, password } = req.body;
 
-  const user = await User.findOne({ email }).select('+password');
+  const user = await User.findOne({ email }).select('+password -__v').lean();
   if (!user) {
     return next(new ErrorResponse('Invalid credentials', 401));
   }
 
-  const isMatch = await user.comparePassword(password);
+  // bcrypt runs on the password worker pool, not the event loop
+  const { password: passwordHash, ...profile } = user;
+  const isMatch = await verifyPassword(password, passwordHash);
   if (!isMatch) {
     return next(new ErrorResponse('Invalid credentials', 401));
   }
 
-  const accessToken = generateAccessToken(user._id);
+  const accessToken = generateAccessToken(user._id, user.role);
   const refreshToken = generateRefreshToken(user._id);
 
-  user.refreshToken = refreshToken;
-  await user.save();
-
-  user.password = undefined;
+  // Only the token changes - no full document validate-and-save
+  await User.updateOne({ _id: user._id }, { $set: { refreshToken } });
 
   res.json({
     success: true,
-    data: { user, accessToken, refreshToken },
+    data: { user: profile, accessToken, refreshToken },
   });
 });
 
@@ -82,7 +87,7 @@ export const refreshToken = asyncHandler(async (req, res, next) => {
     return next(new ErrorResponse('Invalid refresh token', 401));
   }
 
-  const newAccessToken = generateAccessToken(user._id);
+  const newAccessToken = generateAccessToken(user._id, user.role);
 
   res.json({
     success: true,
@@ -109,6 +114,7 @@ export const updateProfile = asyncHandler(async (req, res) => {
   if (name) user.name = name;
   if (phone !== undefined) user.phone = phone;
   await user.save();
+  invalidateUser(user._id);
   res.json({
     success: true,
     data: user,
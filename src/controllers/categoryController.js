@@ -1,12 +1,16 @@
 import asyncHandler from 'express-async-handler';
 import Category from '../models/Category.js';
+import Competition from '../models/Competition.js';
 import ErrorResponse from '../utils/errorResponse.js';
+import { invalidateCache } from '../middleware/cache.js';
+import { withCatalogReads } from '../config/database.js';
+import { refreshCalendar } from '../services/calendarService.js';
 
 // @desc    Get all categories
 // @route   GET /api/categories
 // @access  Public
 export const getCategories = asyncHandler(async (req, res) => {
-  const categories = await Category.find().sort({ name: 1 });
+  const categories = await withCatalogReads(Category.find().sort({ name: 1 }));
 
   res.json({
     success: true,
@@ -19,7 +23,7 @@ export const getCategories = asyncHandler(async (req, res) => {
 // @route   GET /api/categories/:id
 // @access  Public
 export const getCategory = asyncHandler(async (req, res, next) => {
-  const category = await Category.findById(req.params.id);
+  const category = await withCatalogReads(Category.findById(req.params.id));
 
   if (!category) {
     return next(new ErrorResponse('Category not found', 404));
@@ -37,6 +41,8 @@ export const getCategory = asyncHandler(async (req, res, next) => {
 export const createCategory = asyncHandler(async (req, res) => {
   const category = await Category.create(req.body);
 
+  await invalidateCache('categories');
+
   res.status(201).json({
     success: true,
     data: category,
@@ -53,11 +59,24 @@ export const updateCategory = asyncHandler(async (req, res, next) => {
     return next(new ErrorResponse('Category not found', 404));
   }
 
+  const previousName = category.name;
+
   category = await Category.findByIdAndUpdate(req.params.id, req.body, {
     returnDocument: 'after',
     runValidators: true,
   });
 
+  // Keep the denormalized name used by competition search in sync
+  if (category.name !== previousName) {
+    await Competition.updateMany(
+      { category: category._id },
+      { categoryName: category.name, catalogUpdatedAt: new Date() }
+    );
+  }
+
+  await invalidateCache('categories', 'competitions');
+  refreshCalendar();
+
   res.json({
     success: true,
     data: category,
@@ -76,6 +95,9 @@ export const deleteCategory = asyncHandler(async (req, res, next) => {
 
   await category.deleteOne();
 
+  await invalidateCache('categories', 'competitions');
+  refreshCalendar();
+
   res.json({
     success: true,
     data: {},
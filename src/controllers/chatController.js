@@ -1,27 +1,82 @@
 import asyncHandler from 'express-async-handler';
+import mongoose from 'mongoose';
 import ChatMessage from '../models/ChatMessage.js';
+import { getUserProfiles } from '../services/userCache.js';
+import {
+  listConversations,
+  markConversationRead,
+} from '../services/conversationService.js';
+import {
+  parseLimit,
+  encodeCursor,
+  decodeCursor,
+  keysetFilter,
+} from '../utils/pagination.js';
 
 // @desc    Get chat history between two users
-// @route   GET /api/chat/:userId
+// @route   GET /api/chat/:userId?before=&after=&limit=
 // @access  Private
 export const getChatHistory = asyncHandler(async (req, res) => {
   const { userId } = req.params;
+  const { before, after } = req.query;
   const currentUserId = req.user._id;
+  const peerId = new mongoose.Types.ObjectId(userId);
+  const limit = parseLimit(req.query.limit, 50, 100);
 
-  const messages = await ChatMessage.find({
-    $or: [
-      { sender: currentUserId, receiver: userId },
-      { sender: userId, receiver: currentUserId },
-    ],
-  })
-    .populate('sender', 'name email role')
-    .populate('receiver', 'name email role')
-    .sort({ timestamp: 1 })
-    .limit(100);
+  // Newest page by default; `before` pages back in time, `after` forward
+  const direction = after ? 1 : -1;
+  const cursor = after || before;
+
+  // One clause per direction of the conversation so each is bounded by the
+  // { sender, receiver, timestamp, _id } index and merge-sorted
+  const participants = [
+    { sender: currentUserId, receiver: peerId },
+    { sender: peerId, receiver: currentUserId },
+  ];
+  const bounds = cursor ? keysetFilter('timestamp', direction, decodeCursor(cursor)).$or : [{}];
+  const clauses = participants.flatMap((pair) => bounds.map((bound) => ({ ...pair, ...bound })));
+
+  const messages = await ChatMessage.find({ $or: clauses })
+    .select('-__v')
+    .sort({ timestamp: direction, _id: direction })
+    .limit(limit + 1)
+    .lean();
+
+  const hasMore = messages.length > limit;
+  if (hasMore) {
+    messages.pop();
+  }
+
+  // Always return oldest first
+  if (direction === -1) {
+    messages.reverse();
+  }
+
+  // Only two users are involved, so attach profiles instead of populating
+  const [me, peer] = await getUserProfiles([currentUserId, peerId]);
+  const profiles = { [currentUserId.toString()]: me, [userId]: peer };
+  messages.forEach((message) => {
+    message.sender = profiles[message.sender.toString()] || message.sender;
+    message.receiver = profiles[message.receiver.toString()] || message.receiver;
+  });
+
+  // Viewing the latest messages clears the unread badge
+  if (!before) {
+    markConversationRead(currentUserId, peerId);
+  }
+
+  const oldest = messages[0];
+  const newest = messages[messages.length - 1];
 
   res.json({
     success: true,
     count: messages.length,
+    pagination: {
+      limit,
+      hasMore,
+      before: oldest ? encodeCursor(oldest, 'timestamp') : null,
+      after: newest ? encodeCursor(newest, 'timestamp') : null,
+    },
     data: messages,
   });
 });
@@ -30,60 +85,15 @@ export const getChatHistory = asyncHandler(async (req, res) => {
 // @route   GET /api/chat/conversations
 // @access  Private/Support/Admin
 export const getConversations = asyncHandler(async (req, res) => {
-  const userId = req.user._id;
-
-  // Get unique users who have chatted with current user
-  const conversations = await ChatMessage.aggregate([
-    {
-      $match: {
-        $or: [{ sender: userId }, { receiver: userId }],
-      },
-    },
-    {
-      $sort: { timestamp: -1 },
-    },
-    {
-      $group: {
-        _id: {
-          $cond: [
-            { $eq: ['$sender', userId] },
-            '$receiver',
-            '$sender',
-          ],
-        },
-        lastMessage: { $first: '$$ROOT' },
-      },
-    },
-    {
-      $lookup: {
-        from: 'users',
-        localField: '_id',
-        foreignField: '_id',
-        as: 'user',
-      },
-    },
-    {
-      $unwind: '$user',
-    },
-    {
-      $project: {
-        user: {
-          _id: 1,
-          name: 1,
-          email: 1,
-          role: 1,
-        },
-        lastMessage: {
-          message: 1,
-          timestamp: 1,
-        },
-      },
-    },
-  ]);
+  const { conversations, pagination } = await listConversations(req.user._id, {
+    limit: parseLimit(req.query.limit, 50, 100),
+    cursor: req.query.cursor,
+  });
 
   res.json({
     success: true,
     count: conversations.length,
+    pagination,
     data: conversations,
   });
 });
@@ -1,24 +1,62 @@
 import asyncHandler from 'express-async-handler';
+import mongoose from 'mongoose';
 import Competition from '../models/Competition.js';
 import ErrorResponse from '../utils/errorResponse.js';
+import { invalidateCache } from '../middleware/cache.js';
+import { withCatalogReads } from '../config/database.js';
+import {
+  recordCompetitionCreated,
+  recordCompetitionDeleted,
+} from '../services/statsService.js';
+import {
+  parseLimit,
+  encodeCursor,
+  decodeCursor,
+  keysetFilter,
+  buildProjection,
+} from '../utils/pagination.js';
+import { escapeRegex, normalizeSearchKey } from '../utils/search.js';
+import {
+  getCalendar,
+  getCalendarDays,
+  getCalendarDay,
+  upsertCalendarEntry,
+  removeCalendarEntry,
+  findVenueConflict,
+} from '../services/calendarService.js';
 
-// @desc    Get all competitions with filters and sorting
-// @route   GET /api/competitions
-// @access  Public
-export const getCompetitions = asyncHandler(async (req, res) => {
-  const { category, search, sort, startDate, endDate } = req.query;
+// Sort modes for the listing. Each one is paired with a compound
+// `{ field, _id }` index on Competition so keyset pages are index walks.
+const SORT_MODES = {
+  'most-registrations': { field: 'registrationsCount', direction: -1 },
+  // Trending = recent registrations (competitions with recent activity)
+  trending: { field: 'lastRegisteredAt', direction: -1 },
+  new: { field: 'createdAt', direction: -1 },
+  default: { field: 'startDate', direction: 1 },
+};
 
-  // Build query
-  let query = {};
+const LISTABLE_FIELDS = [
+  'title',
+  'description',
+  'category',
+  'venue',
+  'building',
+  'startDate',
+  'endDate',
+  'dayNumber',
+  'registrationsCount',
+  'lastRegisteredAt',
+  'createdAt',
+  'updatedAt',
+];
+
+// Build the shared category/date filter for listing and search
+const buildListFilter = ({ category, startDate, endDate }) => {
+  const query = {};
 
   // Filter by category
   if (category) {
-    query.category = category;
-  }
-
-  // Search by title
-  if (search) {
-    query.title = { $regex: search, $options: 'i' };
+    query.category = new mongoose.Types.ObjectId(category);
   }
 
   // Filter by date range
@@ -32,26 +70,149 @@ export const getCompetitions = asyncHandler(async (req, res) => {
     }
   }
 
-  // Build sort
-  let sortOption = {};
-  switch (sort) {
-    case 'most-registrations':
-      sortOption = { registrationsCount: -1 };
-      break;
-    case 'trending':
-      // Trending = recent registrations (competitions with recent activity)
-      sortOption = { updatedAt: -1 };
-      break;
-    case 'new':
-      sortOption = { createdAt: -1 };
-      break;
-    default:
-      sortOption = { startDate: 1 };
+  return query;
+};
+
+// Trim the extra row fetched to detect a next page and build the cursor
+const paginate = (docs, limit, field) => {
+  const hasMore = docs.length > limit;
+  if (hasMore) {
+    docs.pop();
+  }
+
+  const now = new Date();
+  docs.forEach((doc) => {
+    if (doc.startDate) {
+      doc.isUpcoming = doc.startDate > now;
+    }
+  });
+
+  return {
+    limit,
+    hasMore,
+    nextCursor: hasMore ? encodeCursor(docs[docs.length - 1], field) : null,
+  };
+};
+
+// Relevance-ranked text search, keyset-paginated on (score desc, _id asc)
+const searchCompetitions = async (query, search, { cursor, limit, projection }) => {
+  const pipeline = [
+    { $match: { ...query, $text: { $search: search } } },
+    { $addFields: { score: { $meta: 'textScore' } } },
+  ];
+
+  if (cursor) {
+    pipeline.push({ $match: keysetFilter('score', -1, decodeCursor(cursor), 1) });
+  }
+
+  pipeline.push({ $sort: { score: -1, _id: 1 } }, { $limit: limit + 1 });
+
+  if (projection) {
+    const fields = Object.fromEntries(projection.split(' ').map((f) => [f, 1]));
+    pipeline.push({ $project: { ...fields, score: 1, categoryName: 1 } });
+  } else {
+    pipeline.push({ $project: { __v: 0, titleKey: 0 } });
   }
 
-  const competitions = await Competition.find(query)
-    .populate('category', 'name')
-    .sort(sortOption);
+  const competitions = await withCatalogReads(Competition.aggregate(pipeline));
+
+  // Same category shape as the populated listing, without the lookup
+  competitions.forEach((competition) => {
+    if (competition.category) {
+      competition.category = {
+        _id: competition.category,
+        name: competition.categoryName,
+      };
+    }
+  });
+
+  return competitions;
+};
+
+// @desc    Get all competitions with filters, sorting and keyset pagination
+// @route   GET /api/competitions
+// @access  Public
+export const getCompetitions = asyncHandler(async (req, res) => {
+  const { search, sort, cursor, page, fields } = req.query;
+
+  let query = buildListFilter(req.query);
+  const limit = parseLimit(req.query.limit);
+  const projection = buildProjection(fields, LISTABLE_FIELDS, ['startDate']);
+
+  // Search without an explicit sort is ranked by text relevance
+  if (search && !sort) {
+    const competitions = await searchCompetitions(query, search, {
+      cursor,
+      limit,
+      projection,
+    });
+    const pagination = paginate(competitions, limit, 'score');
+
+    return res.json({
+      success: true,
+      count: competitions.length,
+      pagination,
+      data: competitions,
+    });
+  }
+
+  if (search) {
+    query.$text = { $search: search };
+  }
+
+  // Build sort (_id breaks ties so the cursor position is unique)
+  const { field, direction } = SORT_MODES[sort] || SORT_MODES.default;
+
+  if (cursor) {
+    query = { ...query, ...keysetFilter(field, direction, decodeCursor(cursor)) };
+  }
+
+  const competitionsQuery = withCatalogReads(
+    Competition.find(query)
+      .select(projection ? `${projection} ${field}` : '-__v')
+      .sort({ [field]: direction, _id: direction })
+      .limit(limit + 1)
+      .lean()
+  );
+
+  // Offset paging is kept for older clients that still send `page`
+  const pageNumber = parseInt(page, 10);
+  if (!cursor && pageNumber > 1) {
+    competitionsQuery.skip((pageNumber - 1) * limit);
+  }
+
+  if (!projection || projection.includes('category')) {
+    competitionsQuery.populate('category', 'name');
+  }
+
+  const competitions = await competitionsQuery;
+  const pagination = paginate(competitions, limit, field);
+
+  res.json({
+    success: true,
+    count: competitions.length,
+    pagination,
+    data: competitions,
+  });
+});
+
+// @desc    Autocomplete competition titles by prefix
+// @route   GET /api/competitions/autocomplete
+// @access  Public
+export const autocompleteCompetitions = asyncHandler(async (req, res) => {
+  const prefix = normalizeSearchKey(req.query.q);
+  const limit = parseLimit(req.query.limit, 8, 20);
+
+  // Anchored on the lowercased titleKey so the { titleKey: 1 } index bounds the scan
+  const competitions = prefix
+    ? await withCatalogReads(
+        Competition.find({ titleKey: { $regex: `^${escapeRegex(prefix)}` } })
+          .select('title categoryName startDate')
+          .sort({ titleKey: 1 })
+          .limit(limit)
+          .lean()
+      )
+    : [];
 
   res.json({
     success: true,
@@ -64,9 +225,8 @@ export const getCompetitions = asyncHandler(async (req, res) => {
 // @route   GET /api/competitions/:id
 // @access  Public
 export const getCompetition = asyncHandler(async (req, res, next) => {
-  const competition = await Competition.findById(req.params.id).populate(
-    'category',
-    'name description'
+  const competition = await withCatalogReads(
+    Competition.findById(req.params.id).populate('category', 'name description')
   );
 
   if (!competition) {
@@ -80,26 +240,57 @@ export const getCompetition = asyncHandler(async (req, res, next) => {
 });
 
 // @desc    Get competitions in calendar format
-// @route   GET /api/competitions/calendar
+// @route   GET /api/competitions/calendar?group=day&day=
 // @access  Public
 export const getCompetitionsCalendar = asyncHandler(async (req, res) => {
-  const competitions = await Competition.find()
-    .select('title startDate endDate venue dayNumber')
-    .populate('category', 'name')
-    .sort({ startDate: 1 });
+  const { day, group } = req.query;
+
+  let view;
+  if (day) {
+    view = await getCalendarDay(parseInt(day));
+  } else if (group === 'day') {
+    view = await getCalendarDays();
+  } else {
+    view = await getCalendar();
+  }
+
+  res.set('ETag', view.etag);
+  res.set('Cache-Control', 'public, max-age=0, must-revalidate');
+
+  // req.fresh compares If-None-Match against the ETag set above
+  if (req.fresh) {
+    return res.status(304).end();
+  }
 
   res.json({
     success: true,
-    count: competitions.length,
-    data: competitions,
+    count: day ? view.data.count : view.data.length,
+    data: view.data,
   });
 });
 
+// Reject a booking that overlaps another one in the same venue
+const checkVenueConflict = async (booking, excludeId) => {
+  const conflict = await findVenueConflict(booking, excludeId);
+  if (conflict) {
+    throw new ErrorResponse(
+      `${booking.venue} is already booked for '${conflict.title}' from ${conflict.startDate.toISOString()} to ${conflict.endDate.toISOString()}`,
+      409
+    );
+  }
+};
+
 // @desc    Create competition
 // @route   POST /api/competitions
 // @access  Private/Admin
 export const createCompetition = asyncHandler(async (req, res) => {
+  await checkVenueConflict(req.body);
+
   const competition = await Competition.create(req.body);
+  recordCompetitionCreated();
+  upsertCalendarEntry(competition);
+
+  await invalidateCache('competitions');
 
   res.status(201).json({
     success: true,
@@ -117,10 +308,28 @@ export const updateCompetition = asyncHandler(async (req, res, next) => {
     return next(new ErrorResponse('Competition not found', 404));
   }
 
+  const rescheduled = ['venue', 'building', 'startDate', 'endDate'].some(
+    (field) => req.body[field] !== undefined
+  );
+  if (rescheduled) {
+    await checkVenueConflict(
+      {
+        venue: req.body.venue ?? competition.venue,
+        building: req.body.building ?? competition.building,
+        startDate: req.body.startDate ?? competition.startDate,
+        endDate: req.body.endDate ?? competition.endDate,
+      },
+      competition._id
+    );
+  }
+
   competition = await Competition.findByIdAndUpdate(req.params.id, req.body, {
     returnDocument: 'after',
     runValidators: true,
   });
+  upsertCalendarEntry(competition);
+
+  await invalidateCache('competitions');
 
   res.json({
     success: true,
@@ -139,6 +348,10 @@ export const deleteCompetition = asyncHandler(async (req, res, next) => {
   }
 
   await competition.deleteOne();
+  recordCompetitionDeleted();
+  removeCalendarEntry(competition._id);
+
+  await invalidateCache('competitions');
 
   res.json({
     success: true,
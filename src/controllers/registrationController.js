@@ -1,46 +1,58 @@
 import asyncHandler from 'express-async-handler';
 import Registration from '../models/Registration.js';
-import Competition from '../models/Competition.js';
 import ErrorResponse from '../utils/errorResponse.js';
+import { recordStatusChange } from '../services/statsService.js';
+import {
+  registerUser,
+  registerMany,
+  unregister,
+} from '../services/registrationService.js';
+import {
+  buildRegistrationFilter,
+  createRegistrationResolver,
+  REGISTRATION_COLUMNS,
+} from '../services/exportService.js';
+import { streamExport } from '../utils/exportStream.js';
+
+const EXPORT_BATCH_SIZE = 500;
 
 // @desc    Register for a competition
 // @route   POST /api/registrations
 // @access  Private
-export const createRegistration = asyncHandler(async (req, res, next) => {
-  const { competition } = req.body;
+export const createRegistration = asyncHandler(async (req, res) => {
+  const registration = await registerUser(req.user._id, req.body.competition);
 
-  // Check if competition exists
-  const competitionExists = await Competition.findById(competition);
+  res.status(201).json({
+    success: true,
+    data: registration,
+  });
+});
 
-  if (!competitionExists) {
-    return next(new ErrorResponse('Competition not found', 404));
-  }
+// @desc    Register users for several competitions in one request
+// @route   POST /api/registrations/bulk
+// @access  Private (registering other users requires admin)
+export const createBulkRegistrations = asyncHandler(async (req, res, next) => {
+  const competitions = [...new Set(req.body.competitions)];
+  const users = req.body.users ? [...new Set(req.body.users)] : [req.user._id.toString()];
 
-  // Check if already registered
-  const existingRegistration = await Registration.findOne({
-    user: req.user._id,
-    competition,
-  });
+  const registeringOthers = users.some((user) => user !== req.user._id.toString());
+  if (registeringOthers && req.user.role !== 'admin') {
+    return next(new ErrorResponse('Only admins can register other users', 403));
+  }
 
-  if (existingRegistration) {
+  const maxPairs = parseInt(process.env.BULK_REGISTRATION_LIMIT) || 500;
+  if (users.length * competitions.length > maxPairs) {
     return next(
-      new ErrorResponse('You are already registered for this competition', 400)
+      new ErrorResponse(`A bulk request can create at most ${maxPairs} registrations`, 400)
     );
   }
 
-  // Create registration
-  const registration = await Registration.create({
-    user: req.user._id,
-    competition,
-  });
-
-  // Increment registrations count
-  competitionExists.registrationsCount += 1;
-  await competitionExists.save();
+  const { created, skipped } = await registerMany(users, competitions);
 
-  res.status(201).json({
+  res.status(created.length > 0 ? 201 : 200).json({
     success: true,
-    data: registration,
+    count: created.length,
+    data: { created, skipped },
   });
 });
 
@@ -69,19 +81,7 @@ export const getMyRegistrations = asyncHandler(async (req, res) => {
 // @route   GET /api/registrations
 // @access  Private/Admin
 export const getAllRegistrations = asyncHandler(async (req, res) => {
-  const { competition, status } = req.query;
-
-  let query = {};
-
-  if (competition) {
-    query.competition = competition;
-  }
-
-  if (status) {
-    query.status = status;
-  }
-
-  const registrations = await Registration.find(query)
+  const registrations = await Registration.find(buildRegistrationFilter(req.query))
     .populate('user', 'name email')
     .populate({
       path: 'competition',
@@ -99,22 +99,48 @@ export const getAllRegistrations = asyncHandler(async (req, res) => {
   });
 });
 
+// @desc    Export registrations as NDJSON or CSV
+// @route   GET /api/registrations/export?format=&competition=&status=
+// @access  Private/Admin/Support
+export const exportRegistrations = asyncHandler(async (req, res) => {
+  const cursor = Registration.find(buildRegistrationFilter(req.query))
+    .select('-__v')
+    .sort({ createdAt: -1 })
+    .lean()
+    .cursor({ batchSize: EXPORT_BATCH_SIZE });
+
+  await streamExport(res, {
+    cursor,
+    format: req.query.format || 'ndjson',
+    filename: 'registrations',
+    columns: REGISTRATION_COLUMNS,
+    resolve: createRegistrationResolver(),
+    batchSize: EXPORT_BATCH_SIZE,
+  });
+});
+
 // @desc    Approve registration
 // @route   PUT /api/registrations/:id/approve
 // @access  Private/Admin
 export const approveRegistration = asyncHandler(async (req, res, next) => {
-  const registration = await Registration.findById(req.params.id);
+  // Conditional update so concurrent approvals can't both succeed
+  const registration = await Registration.findOneAndUpdate(
+    { _id: req.params.id, status: { $ne: 'approved' } },
+    { status: 'approved' },
+    { returnDocument: 'after' }
+  );
 
   if (!registration) {
-    return next(new ErrorResponse('Registration not found', 404));
-  }
-
-  if (registration.status === 'approved') {
-    return next(new ErrorResponse('Registration already approved', 400));
+    const exists = await Registration.exists({ _id: req.params.id });
+    return next(
+      exists
+        ? new ErrorResponse('Registration already approved', 400)
+        : new ErrorResponse('Registration not found', 404)
+    );
   }
 
-  registration.status = 'approved';
-  await registration.save();
+  // 'pending' is the only other status
+  recordStatusChange('pending', 'approved');
 
   res.json({
     success: true,
@@ -125,31 +151,8 @@ export const approveRegistration = asyncHandler(async (req, res, next) => {
 // @desc    Delete registration
 // @route   DELETE /api/registrations/:id
 // @access  Private
-export const deleteRegistration = asyncHandler(async (req, res, next) => {
-  const registration = await Registration.findById(req.params.id);
-
-  if (!registration) {
-    return next(new ErrorResponse('Registration not found', 404));
-  }
-
-  // Check if user owns this registration or is admin
-  if (
-    registration.user.toString() !== req.user._id.toString() &&
-    req.user.role !== 'admin'
-  ) {
-    return next(
-      new ErrorResponse('Not authorized to delete this registration', 403)
-    );
-  }
-
-  // Decrement registrations count
-  const competition = await Competition.findById(registration.competition);
-  if (competition && competition.registrationsCount > 0) {
-    competition.registrationsCount -= 1;
-    await competition.save();
-  }
-
-  await registration.deleteOne();
+export const deleteRegistration = asyncHandler(async (req, res) => {
+  await unregister(req.params.id, req.user);
 
   res.json({
     success: true,
@@ -1,7 +1,7 @@
 import asyncHandler from 'express-async-handler';
-import User from '../models/User.js';
 import { verifyAccessToken } from '../utils/generateToken.js';
 import ErrorResponse from '../utils/errorResponse.js';
+import { getAuthenticatedUser } from '../services/userCache.js';
 
 // Protect routes - verify JWT token
 export const protect = asyncHandler(async (req, res, next) => {
@@ -24,7 +24,8 @@ export const protect = asyncHandler(async (req, res, next) => {
     return next(new ErrorResponse('Not authorized, token failed', 401));
   }
 
-  const user = await User.findById(decoded.id);
+  // Served from the principal cache unless AUTH_STRICT=true
+  const user = await getAuthenticatedUser(decoded);
 
   if (!user) {
     return next(new ErrorResponse('User not found', 404));
@@ -34,7 +35,7 @@ export const protect = asyncHandler(async (req, res, next) => {
   next();
 });
 
-// Authorize specific roles
+// Authorize specific roles - req.user is already loaded, so no I/O here
 export const authorize = (...roles) => {
   return (req, res, next) => {
     if (!roles.includes(req.user.role)) {
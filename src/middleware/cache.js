@@ -0,0 +1,64 @@
+import crypto from 'crypto';
+import { cache } from '../config/cache.js';
+
+// Stable key for a request: path plus query params in sorted order,
+// so `?a=1&b=2` and `?b=2&a=1` share an entry
+const buildCacheKey = (namespace, req) => {
+  const query = Object.keys(req.query)
+    .sort()
+    .map((key) => `${key}=${[].concat(req.query[key]).join(',')}`)
+    .join('&');
+
+  return `cache:${namespace}:${req.baseUrl}${req.path}?${query}`;
+};
+
+const sendCached = (req, res, entry, status) => {
+  res.set('ETag', entry.etag);
+  res.set('Cache-Control', 'public, max-age=0, must-revalidate');
+  res.set('X-Cache', status);
+
+  // req.fresh compares If-None-Match against the ETag set above
+  if (req.fresh) {
+    return res.status(304).end();
+  }
+
+  res.type('json').send(entry.body);
+};
+
+// Read-through cache for public GET endpoints. Successful JSON responses
+// are stored under `namespace` until TTL expiry or invalidateCache().
+export const cacheResponse = (namespace) => async (req, res, next) => {
+  const key = buildCacheKey(namespace, req);
+  const entry = await cache.get(key);
+
+  if (entry) {
+    return sendCached(req, res, entry, 'HIT');
+  }
+
+  const generation = cache.generation(namespace);
+  const json = res.json.bind(res);
+
+  res.json = (payload) => {
+    if (res.statusCode !== 200 || !payload || payload.success !== true) {
+      return json(payload);
+    }
+
+    const body = JSON.stringify(payload);
+    const fresh = {
+      body,
+      etag: `"${crypto.createHash('sha1').update(body).digest('base64url')}"`,
+    };
+
+    // Skip the store if a write invalidated the namespace mid-request
+    if (cache.generation(namespace) === generation) {
+      cache.set(key, fresh);
+    }
+
+    return sendCached(req, res, fresh, 'MISS');
+  };
+
+  next();
+};
+
+// Drop every cached response in the given namespaces after a write
+export const invalidateCache = (...namespaces) => cache.invalidate(...namespaces);
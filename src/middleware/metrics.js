@@ -0,0 +1,58 @@
+import { performance } from 'perf_hooks';
+import { httpRequestDuration, requestContext } from '../config/metrics.js';
+import { CONTENT_TYPE } from '../utils/metrics.js';
+import { renderMetrics } from '../services/metricsService.js';
+
+// Times every request into http_request_duration_seconds and adds a
+// Server-Timing header with total and database time. Routes are labelled
+// by their pattern (/api/competitions/:id), never the raw URL.
+export const requestMetrics = (req, res, next) => {
+  const startedAt = performance.now();
+  const context = { dbTime: 0, dbQueries: 0 };
+
+  const writeHead = res.writeHead;
+  res.writeHead = function (...args) {
+    if (!res.headersSent) {
+      const total = performance.now() - startedAt;
+      res.setHeader(
+        'Server-Timing',
+        `db;dur=${(context.dbTime * 1000).toFixed(1)};desc="${context.dbQueries} queries", total;dur=${total.toFixed(1)}`
+      );
+    }
+    return writeHead.apply(this, args);
+  };
+
+  res.on('finish', () => {
+    const route = req.route ? `${req.baseUrl}${req.route.path}` : 'unmatched';
+    httpRequestDuration.observe(
+      { method: req.method, route, status: res.statusCode },
+      (performance.now() - startedAt) / 1000
+    );
+  });
+
+  requestContext.run(context, next);
+};
+
+// Prometheus scrape endpoint. Scrapers must send METRICS_TOKEN as a Bearer
+// token. Without one configured, metrics are only served in development:
+// route names and latencies aren't for anonymous callers.
+export const metricsEndpoint = (req, res) => {
+  const token = process.env.METRICS_TOKEN;
+  if (!token && process.env.NODE_ENV !== 'development') {
+    return res.status(403).json({
+      success: false,
+      error: 'Metrics are disabled until METRICS_TOKEN is set',
+    });
+  }
+
+  if (token && req.headers.authorization !== `Bearer ${token}`) {
+    return res.status(401).json({
+      success: false,
+      error: 'Not authorized to access metrics',
+    });
+  }
+
+  res.set('Content-Type', CONTENT_TYPE);
+  res.set('Cache-Control', 'no-store');
+  res.send(renderMetrics());
+};
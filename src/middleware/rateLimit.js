@@ -0,0 +1,211 @@
+import rateLimit, { MemoryStore } from 'express-rate-limit';
+import logger from '../config/logger.js';
+import { isClusterWorker, requestPrimary } from '../config/cluster.js';
+
+// Where rate limit counters live (RATE_LIMIT_STORE):
+//   memory  - per process (default for `node server.js`)
+//   cluster - held by the cluster primary, shared over IPC (default under cluster.js)
+//   redis   - shared through Redis; needs `npm install redis`
+// A per-process store under cluster.js would multiply every limit by the
+// number of workers.
+
+// Counters kept by the cluster primary (see config/cluster.js)
+class ClusterStore {
+  constructor(prefix) {
+    this.prefix = `${prefix}:`;
+    this.localKeys = false;
+  }
+
+  init(options) {
+    this.windowMs = options.windowMs;
+  }
+
+  async increment(key) {
+    const { totalHits, resetTime } = await requestPrimary('rate-limit:increment', {
+      key: this.prefix + key,
+      windowMs: this.windowMs,
+    });
+    return { totalHits, resetTime: new Date(resetTime) };
+  }
+
+  async decrement(key) {
+    await requestPrimary('rate-limit:decrement', { key: this.prefix + key });
+  }
+
+  async resetKey(key) {
+    await requestPrimary('rate-limit:reset', { key: this.prefix + key });
+  }
+}
+
+// One Redis connection shared by every limiter, opened on first use
+let redisClient = null;
+
+const getRedisClient = () => {
+  if (!redisClient) {
+    redisClient = (async () => {
+      const { createClient } = await import('redis');
+      const client = createClient({ url: process.env.REDIS_URL || 'redis://localhost:6379' });
+      client.on('error', (err) => logger.error(`Rate limit Redis error: ${err.message}`));
+      await client.connect();
+      return client;
+    })();
+    // Retry the connection on the next request rather than failing forever
+    redisClient.catch(() => {
+      redisClient = null;
+    });
+  }
+  return redisClient;
+};
+
+// Fixed window: INCR, and start the window's expiry on its first hit
+class RedisStore {
+  constructor(prefix) {
+    this.prefix = `rl:${prefix}:`;
+    this.localKeys = false;
+  }
+
+  init(options) {
+    this.windowMs = options.windowMs;
+  }
+
+  async increment(key) {
+    const client = await getRedisClient();
+    const redisKey = this.prefix + key;
+
+    const [totalHits, ttl] = await client.multi().incr(redisKey).pTTL(redisKey).exec();
+    let remaining = Number(ttl);
+    if (remaining < 0) {
+      await client.pExpire(redisKey, this.windowMs);
+      remaining = this.windowMs;
+    }
+
+    return { totalHits: Number(totalHits), resetTime: new Date(Date.now() + remaining) };
+  }
+
+  async decrement(key) {
+    const client = await getRedisClient();
+    await client.decr(this.prefix + key);
+  }
+
+  async resetKey(key) {
+    const client = await getRedisClient();
+    await client.del(this.prefix + key);
+  }
+}
+
+const createStore = (prefix) => {
+  const driver = process.env.RATE_LIMIT_STORE || (isClusterWorker ? 'cluster' : 'memory');
+
+  if (driver === 'redis') {
+    return new RedisStore(prefix);
+  }
+  if (driver === 'cluster' && isClusterWorker) {
+    return new ClusterStore(prefix);
+  }
+  if (driver !== 'memory') {
+    logger.warn(`Rate limit store "${driver}" unavailable, using per-process memory`);
+  }
+  return new MemoryStore();
+};
+
+const skip = () =>
+  process.env.NODE_ENV === 'development' && process.env.DISABLE_RATE_LIMIT === 'true';
+
+// Limiters are built on first request - modules load before server.js
+// runs dotenv.config()
+const lazyLimiter = (build) => {
+  let limiter = null;
+  return (req, res, next) => {
+    if (!limiter) {
+      limiter = build();
+    }
+    return limiter(req, res, next);
+  };
+};
+
+// "user:20,support:100" -> { user: 20, support: 100 }
+const parseTiers = (value, defaults) => {
+  const tiers = { ...defaults };
+  (value || '').split(',').forEach((pair) => {
+    const [role, limit] = pair.split(':').map((part) => part.trim());
+    if (role && parseInt(limit) > 0) {
+      tiers[role] = parseInt(limit);
+    }
+  });
+  return tiers;
+};
+
+const tooManyRequests = (error) => ({ success: false, error });
+
+// Every /api request, per IP
+export const apiLimiter = lazyLimiter(() =>
+  rateLimit({
+    windowMs: parseInt(process.env.RATE_LIMIT_WINDOW_MS) || 15 * 60 * 1000, // 15 minutes
+    max:
+      parseInt(process.env.RATE_LIMIT_MAX_REQUESTS) ||
+      (process.env.NODE_ENV === 'development' ? 1000 : 100),
+    message: 'Too many requests from this IP, please try again later.',
+    standardHeaders: true,
+    legacyHeaders: false,
+    store: createStore('api'),
+    passOnStoreError: true,
+    skip,
+  })
+);
+
+// Failed login attempts per IP and account. Keying on both means nobody
+// can lock another user out from elsewhere, and successful logins don't
+// count. One limit for every account: the caller isn't authenticated, and
+// a per-role limit would show in RateLimit-Limit which emails are admins.
+// Guessing across many accounts from one IP is still capped by apiLimiter.
+export const loginLimiter = lazyLimiter(() =>
+  rateLimit({
+    windowMs: parseInt(process.env.LOGIN_RATE_LIMIT_WINDOW_MS) || 15 * 60 * 1000,
+    max: parseInt(process.env.LOGIN_RATE_LIMIT_MAX) || 10,
+    keyGenerator: (req) => `${req.ip}:${String(req.body?.email || '').trim().toLowerCase()}`,
+    skipSuccessfulRequests: true,
+    message: tooManyRequests('Too many failed login attempts, please try again later.'),
+    standardHeaders: true,
+    legacyHeaders: false,
+    store: createStore('login'),
+    passOnStoreError: true,
+    skip,
+  })
+);
+
+// Registration writes per authenticated user, tiered by role. Runs after
+// protect().
+export const registrationLimiter = lazyLimiter(() => {
+  const tiers = parseTiers(process.env.REGISTRATION_RATE_LIMITS, {
+    user: 20,
+    support: 100,
+    admin: 500,
+  });
+
+  return rateLimit({
+    windowMs: parseInt(process.env.REGISTRATION_RATE_LIMIT_WINDOW_MS) || 60 * 1000,
+    max: (req) => tiers[req.user.role] ?? tiers.user,
+    keyGenerator: (req) => req.user._id.toString(),
+    message: tooManyRequests('Too many registration requests, please slow down.'),
+    standardHeaders: true,
+    legacyHeaders: false,
+    store: createStore('registrations'),
+    passOnStoreError: true,
+    skip,
+  });
+});
+
+// Chatbot questions per authenticated user. Runs after protect().
+export const chatbotLimiter = lazyLimiter(() =>
+  rateLimit({
+    windowMs: parseInt(process.env.CHATBOT_RATE_LIMIT_WINDOW_MS) || 60 * 1000,
+    max: parseInt(process.env.CHATBOT_RATE_LIMIT_MAX) || 20,
+    keyGenerator: (req) => req.user._id.toString(),
+    message: tooManyRequests('Too many chatbot questions, please slow down.'),
+    standardHeaders: true,
+    legacyHeaders: false,
+    store: createStore('chatbot'),
+    passOnStoreError: true,
+    skip,
+  })
+);
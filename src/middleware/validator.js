@@ -1,4 +1,4 @@
-import { body, param, query, validationResult } from 'express-validator';
+import { body, checkExact, param, query, validationResult } from 'express-validator';
 
 // Validation result handler
 export const validate = (req, res, next) => {
@@ -101,6 +101,49 @@ export const competitionValidator = [
   },
 ];
 
+// Competition listing query validator
+export const competitionQueryValidator = [
+  query('limit')
+    .optional()
+    .isInt({ min: 1 })
+    .withMessage('Limit must be a positive integer'),
+  query('page')
+    .optional()
+    .isInt({ min: 1 })
+    .withMessage('Page must be a positive integer'),
+  query('category')
+    .optional()
+    .isMongoId()
+    .withMessage('Valid category ID is required'),
+  query('search').optional().isString(),
+  query('cursor').optional().isString(),
+  query('fields').optional().isString(),
+  validate,
+];
+
+// Competition autocomplete validator
+export const autocompleteValidator = [
+  query('q').optional().isString().withMessage('Query must be a string'),
+  query('limit')
+    .optional()
+    .isInt({ min: 1 })
+    .withMessage('Limit must be a positive integer'),
+  validate,
+];
+
+// Competition calendar validator
+export const calendarQueryValidator = [
+  query('day')
+    .optional()
+    .isInt({ min: 1, max: 5 })
+    .withMessage('Day must be between 1 and 5'),
+  query('group')
+    .optional()
+    .isIn(['day'])
+    .withMessage('Group must be day'),
+  validate,
+];
+
 // Registration validators
 export const registrationValidator = [
   body('competition')
@@ -121,6 +164,56 @@ export const registrationValidator = [
   },
 ];
 
+export const bulkRegistrationValidator = [
+  body('competitions')
+    .isArray({ min: 1 })
+    .withMessage('competitions must be a non-empty array'),
+  body('competitions.*')
+    .isMongoId()
+    .withMessage('Valid competition IDs are required'),
+  body('users')
+    .optional()
+    .isArray({ min: 1 })
+    .withMessage('users must be a non-empty array'),
+  body('users.*').isMongoId().withMessage('Valid user IDs are required'),
+  validate,
+];
+
+// Export query validator (registrations)
+export const exportQueryValidator = [
+  query('format')
+    .optional()
+    .isIn(['ndjson', 'csv'])
+    .withMessage('Format must be ndjson or csv'),
+  query('competition')
+    .optional()
+    .isMongoId()
+    .withMessage('Valid competition ID is required'),
+  query('status')
+    .optional()
+    .isIn(['pending', 'approved'])
+    .withMessage('Status must be pending or approved'),
+  validate,
+];
+
+// Users export query validator. Only `format` is accepted, so a filter the
+// users export doesn't support fails instead of being ignored.
+export const userExportQueryValidator = [
+  checkExact(
+    [
+      query('format')
+        .optional()
+        .isIn(['ndjson', 'csv'])
+        .withMessage('Format must be ndjson or csv'),
+    ],
+    {
+      locations: ['query'],
+      message: (fields) => `Unknown query parameters: ${fields.map(({ path }) => path).join(', ')}`,
+    }
+  ),
+  validate,
+];
+
 // ID parameter validator
 export const idValidator = [
   param('id').isMongoId().withMessage('Valid ID is required'),
@@ -157,9 +250,24 @@ export const userIdValidator = [
   },
 ];
 
+// Chat pagination query validator
+export const chatQueryValidator = [
+  query('limit')
+    .optional()
+    .isInt({ min: 1 })
+    .withMessage('Limit must be a positive integer'),
+  query('before').optional().isString(),
+  query('after').optional().isString(),
+  query('cursor').optional().isString(),
+  validate,
+];
+
 // Chatbot validator
 export const chatbotValidator = [
   body('message').trim().notEmpty().withMessage('Message is required'),
+  body('message')
+    .isLength({ max: 1000 })
+    .withMessage('Message cannot be more than 1000 characters'),
   (req, res, next) => {
     const errors = validationResult(req);
     if (!errors.isEmpty()) {
@@ -0,0 +1,63 @@
+import mongoose from 'mongoose';
+import queryTimings from '../utils/queryTimings.js';
+
+// Materialized dashboard counters, kept in a single document and updated
+// incrementally by the controllers (see services/statsService.js)
+const adminStatsSchema = new mongoose.Schema(
+  {
+    _id: {
+      type: String,
+      default: 'global',
+    },
+    totalUsers: {
+      type: Number,
+      default: 0,
+    },
+    totalCompetitions: {
+      type: Number,
+      default: 0,
+    },
+    totalRegistrations: {
+      type: Number,
+      default: 0,
+    },
+    // Registrations by status
+    byStatus: {
+      type: Map,
+      of: Number,
+      default: {},
+    },
+    // Registrations by competition category id
+    byCategory: {
+      type: Map,
+      of: Number,
+      default: {},
+    },
+    // Registrations by UTC creation day (YYYY-MM-DD)
+    byDay: {
+      type: Map,
+      of: Number,
+      default: {},
+    },
+    reconciledAt: {
+      type: Date,
+    },
+  },
+  {
+    timestamps: true,
+  }
+);
+
+// Remove __v from JSON response
+adminStatsSchema.methods.toJSON = function () {
+  const stats = this.toObject();
+  delete stats.__v;
+  return stats;
+};
+
+// Query latency for /metrics
+adminStatsSchema.plugin(queryTimings);
+
+const AdminStats = mongoose.model('AdminStats', adminStatsSchema);
+
+export default AdminStats;
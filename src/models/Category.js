@@ -1,4 +1,5 @@
 import mongoose from 'mongoose';
+import queryTimings from '../utils/queryTimings.js';
 
 const categorySchema = new mongoose.Schema(
   {
@@ -26,6 +27,9 @@ categorySchema.methods.toJSON = function () {
   return category;
 };
 
+// Query latency for /metrics
+categorySchema.plugin(queryTimings);
+
 const Category = mongoose.model('Category', categorySchema);
 
 export default Category;
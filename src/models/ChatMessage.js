@@ -1,4 +1,5 @@
 import mongoose from 'mongoose';
+import queryTimings from '../utils/queryTimings.js';
 
 const chatMessageSchema = new mongoose.Schema(
   {
@@ -27,8 +28,10 @@ const chatMessageSchema = new mongoose.Schema(
   }
 );
 
-// Index for better query performance
-chatMessageSchema.index({ sender: 1, receiver: 1, timestamp: -1 });
+// Index for better query performance. _id is the keyset tiebreaker for
+// history pagination, so it is part of the conversation index.
+chatMessageSchema.index({ sender: 1, receiver: 1, timestamp: -1, _id: -1 });
+chatMessageSchema.index({ receiver: 1, timestamp: -1 });
 chatMessageSchema.index({ timestamp: -1 });
 
 // Remove __v from JSON response
@@ -38,6 +41,9 @@ chatMessageSchema.methods.toJSON = function () {
   return message;
 };
 
+// Query latency for /metrics
+chatMessageSchema.plugin(queryTimings);
+
 const ChatMessage = mongoose.model('ChatMessage', chatMessageSchema);
 
 export default ChatMessage;
@@ -1,4 +1,6 @@
 import mongoose from 'mongoose';
+import { normalizeSearchKey } from '../utils/search.js';
+import queryTimings from '../utils/queryTimings.js';
 
 const competitionSchema = new mongoose.Schema(
   {
@@ -46,6 +48,30 @@ const competitionSchema = new mongoose.Schema(
       default: 0,
       min: 0,
     },
+    // Time of the latest registration, what `sort=trending` orders by.
+    // The epoch until the first one, so the keyset sort never sees null.
+    lastRegisteredAt: {
+      type: Date,
+      default: () => new Date(0),
+    },
+    // Time of the latest catalog edit. Unlike updatedAt it ignores
+    // registration activity, so the calendar and chatbot index fingerprints
+    // only change when the catalog does.
+    catalogUpdatedAt: {
+      type: Date,
+      default: Date.now,
+    },
+    // Denormalized for the text index and search results
+    categoryName: {
+      type: String,
+      trim: true,
+      default: '',
+    },
+    // Normalized title for anchored prefix (autocomplete) lookups
+    titleKey: {
+      type: String,
+      select: false,
+    },
   },
   {
     timestamps: true,
@@ -53,10 +79,81 @@ const competitionSchema = new mongoose.Schema(
 );
 
 // Index for better query performance
-competitionSchema.index({ category: 1 });
-competitionSchema.index({ startDate: 1 });
 competitionSchema.index({ dayNumber: 1 });
-competitionSchema.index({ registrationsCount: -1 });
+
+// Keyset pagination indexes - one per listing sort mode, `_id` as tiebreaker
+competitionSchema.index({ startDate: 1, _id: 1 });
+competitionSchema.index({ registrationsCount: -1, _id: -1 });
+competitionSchema.index({ createdAt: -1, _id: -1 });
+competitionSchema.index({ lastRegisteredAt: -1, _id: -1 });
+competitionSchema.index({ category: 1, startDate: 1, _id: 1 });
+
+// Venue conflict lookups - latest booking in a venue before a given time
+competitionSchema.index({ building: 1, venue: 1, startDate: -1 });
+
+// Search indexes
+competitionSchema.index(
+  { title: 'text', categoryName: 'text', venue: 'text', building: 'text', description: 'text' },
+  {
+    name: 'competition_text',
+    weights: { title: 10, categoryName: 5, venue: 3, building: 3, description: 1 },
+  }
+);
+competitionSchema.index({ titleKey: 1 });
+
+// Catalog fingerprint: newest edit
+competitionSchema.index({ catalogUpdatedAt: -1 });
+
+// Paths written by registrations rather than catalog edits
+const ACTIVITY_PATHS = new Set(['registrationsCount', 'lastRegisteredAt', 'updatedAt', 'createdAt']);
+
+const editsCatalog = (paths) => paths.some((path) => !ACTIVITY_PATHS.has(path));
+
+// Keep search fields and catalogUpdatedAt in sync on create/save
+competitionSchema.pre('validate', async function () {
+  if (!this.isNew && editsCatalog(this.modifiedPaths())) {
+    this.catalogUpdatedAt = new Date();
+  }
+
+  if (this.isModified('title')) {
+    this.titleKey = normalizeSearchKey(this.title);
+  }
+
+  if (this.isModified('category') && !this.isModified('categoryName') && this.category) {
+    const category = await mongoose
+      .model('Category')
+      .findById(this.category)
+      .select('name')
+      .lean();
+    this.categoryName = category ? category.name : '';
+  }
+});
+
+// ...and on findByIdAndUpdate
+competitionSchema.pre('findOneAndUpdate', async function () {
+  const update = this.getUpdate();
+  const fields = update.$set || update;
+
+  const paths = Object.entries(update).flatMap(([key, value]) =>
+    key.startsWith('$') ? Object.keys(value) : [key]
+  );
+  if (editsCatalog(paths)) {
+    fields.catalogUpdatedAt = new Date();
+  }
+
+  if (fields.title) {
+    fields.titleKey = normalizeSearchKey(fields.title);
+  }
+
+  if (fields.category) {
+    const category = await mongoose
+      .model('Category')
+      .findById(fields.category)
+      .select('name')
+      .lean();
+    fields.categoryName = category ? category.name : '';
+  }
+});
 
 // Virtual for checking if competition is upcoming
 competitionSchema.virtual('isUpcoming').get(function () {
@@ -67,10 +164,14 @@ competitionSchema.virtual('isUpcoming').get(function () {
 competitionSchema.methods.toJSON = function () {
   const competition = this.toObject({ virtuals: true });
   delete competition.__v;
+  delete competition.titleKey;
   delete competition.id;
   return competition;
 };
 
+// Query latency for /metrics
+competitionSchema.plugin(queryTimings);
+
 const Competition = mongoose.model('Competition', competitionSchema);
 
 export default Competition;
@@ -0,0 +1,51 @@
+import mongoose from 'mongoose';
+import queryTimings from '../utils/queryTimings.js';
+
+// Per-user conversation summary, one document per (owner, peer) pair.
+// Maintained on every sent message so the inbox never re-aggregates
+// message history (see services/conversationService.js).
+const conversationSchema = new mongoose.Schema(
+  {
+    owner: {
+      type: mongoose.Schema.Types.ObjectId,
+      ref: 'User',
+      required: [true, 'Owner is required'],
+    },
+    peer: {
+      type: mongoose.Schema.Types.ObjectId,
+      ref: 'User',
+      required: [true, 'Peer is required'],
+    },
+    lastMessage: {
+      _id: mongoose.Schema.Types.ObjectId,
+      sender: mongoose.Schema.Types.ObjectId,
+      message: String,
+      timestamp: Date,
+    },
+    unreadCount: {
+      type: Number,
+      default: 0,
+      min: 0,
+    },
+  },
+  {
+    timestamps: true,
+  }
+);
+
+conversationSchema.index({ owner: 1, peer: 1 }, { unique: true });
+conversationSchema.index({ owner: 1, 'lastMessage.timestamp': -1, _id: -1 });
+
+// Remove __v from JSON response
+conversationSchema.methods.toJSON = function () {
+  const conversation = this.toObject();
+  delete conversation.__v;
+  return conversation;
+};
+
+// Query latency for /metrics
+conversationSchema.plugin(queryTimings);
+
+const Conversation = mongoose.model('Conversation', conversationSchema);
+
+export default Conversation;
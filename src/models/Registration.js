@@ -1,4 +1,5 @@
 import mongoose from 'mongoose';
+import queryTimings from '../utils/queryTimings.js';
 
 const registrationSchema = new mongoose.Schema(
   {
@@ -27,9 +28,12 @@ const registrationSchema = new mongoose.Schema(
 registrationSchema.index({ user: 1, competition: 1 }, { unique: true });
 
 // Index for better query performance
-registrationSchema.index({ status: 1 });
 registrationSchema.index({ createdAt: -1 });
 
+// Filtered, newest-first listings and exports walk these without sorting
+registrationSchema.index({ status: 1, createdAt: -1 });
+registrationSchema.index({ competition: 1, createdAt: -1 });
+
 // Remove __v from JSON response
 registrationSchema.methods.toJSON = function () {
   const registration = this.toObject();
@@ -37,6 +41,9 @@ registrationSchema.methods.toJSON = function () {
   return registration;
 };
 
+// Query latency for /metrics
+registrationSchema.plugin(queryTimings);
+
 const Registration = mongoose.model('Registration', registrationSchema);
 
 export default Registration;
@@ -1,5 +1,6 @@
 import mongoose from 'mongoose';
-import bcrypt from 'bcryptjs';
+import { hashPassword, verifyPassword } from '../services/passwordPool.js';
+import queryTimings from '../utils/queryTimings.js';
 
 const userSchema = new mongoose.Schema(
   {
@@ -37,19 +38,18 @@ const userSchema = new mongoose.Schema(
   }
 );
 
-// Hash password before saving
+// Hash password before saving (on the password worker pool)
 userSchema.pre('save', async function () {
   if (!this.isModified('password') || !this.password) {
     return;
   }
 
-  const salt = await bcrypt.genSalt(10);
-  this.password = await bcrypt.hash(this.password, salt);
+  this.password = await hashPassword(this.password, 10);
 });
 
 // Compare password method
 userSchema.methods.comparePassword = async function (candidatePassword) {
-  return await bcrypt.compare(candidatePassword, this.password);
+  return await verifyPassword(candidatePassword, this.password);
 };
 
 // Remove sensitive data from JSON response
@@ -61,6 +61,12 @@ userSchema.methods.toJSON = function () {
   return user;
 };
 
+// Newest-first user listings and exports
+userSchema.index({ createdAt: -1 });
+
+// Query latency for /metrics
+userSchema.plugin(queryTimings);
+
 const User = mongoose.model('User', userSchema);
 
 export default User;
@@ -1,8 +1,14 @@
 import express from 'express';
-import { getStats, addSupportMember, getAllUsers } from '../controllers/adminController.js';
+import {
+  getStats,
+  addSupportMember,
+  getAllUsers,
+  exportUsers,
+  deleteUser,
+} from '../controllers/adminController.js';
 import { protect, authorize } from '../middleware/auth.js';
 import { body } from 'express-validator';
-import { validate } from '../middleware/validator.js';
+import { validate, userExportQueryValidator, idValidator } from '../middleware/validator.js';
 
 const router = express.Router();
 
@@ -10,6 +16,8 @@ router.use(protect, authorize('admin'));
 
 router.get('/stats', getStats);
 router.get('/users', getAllUsers);
+router.get('/users/export', userExportQueryValidator, exportUsers);
+router.delete('/users/:id', idValidator, deleteUser);
 router.post(
   '/support',
   [body('email').isEmail().withMessage('Valid email is required'), validate],
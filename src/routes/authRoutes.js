@@ -8,11 +8,12 @@ import {
 } from '../controllers/authController.js';
 import { signupValidator, loginValidator } from '../middleware/validator.js';
 import { protect } from '../middleware/auth.js';
+import { loginLimiter } from '../middleware/rateLimit.js';
 
 const router = express.Router();
 
 router.post('/signup', signupValidator, signup);
-router.post('/login', loginValidator, login);
+router.post('/login', loginLimiter, loginValidator, login);
 router.post('/refresh', refreshToken);
 router.get('/me', protect, getMe);
 router.put('/profile', protect, updateProfile);
@@ -7,13 +7,14 @@ import {
   deleteCategory,
 } from '../controllers/categoryController.js';
 import { protect, authorize } from '../middleware/auth.js';
+import { cacheResponse } from '../middleware/cache.js';
 import { categoryValidator, idValidator } from '../middleware/validator.js';
 
 const router = express.Router();
 
 router
   .route('/')
-  .get(getCategories)
+  .get(cacheResponse('categories'), getCategories)
   .post(protect, authorize('admin'), categoryValidator, createCategory);
 
 router
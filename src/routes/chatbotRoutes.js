@@ -1,14 +1,12 @@
-// CHATBOT ROUTES - CURRENTLY DISABLED
-// Uncomment this code when you want to enable AI chatbot functionality
-
 import express from 'express';
 import { getChatbotResponse } from '../controllers/chatbotController.js';
 import { protect } from '../middleware/auth.js';
 import { chatbotValidator } from '../middleware/validator.js';
+import { chatbotLimiter } from '../middleware/rateLimit.js';
 
 const router = express.Router();
 
-// Chatbot endpoint - returns 503 while disabled
-router.post('/', protect, chatbotValidator, getChatbotResponse);
+// Streamed answers are available over Socket.IO (`chatbot:ask`)
+router.post('/', protect, chatbotLimiter, chatbotValidator, getChatbotResponse);
 
 export default router;
@@ -3,20 +3,35 @@ import {
   getCompetitions,
   getCompetition,
   getCompetitionsCalendar,
+  autocompleteCompetitions,
   createCompetition,
   updateCompetition,
   deleteCompetition,
 } from '../controllers/competitionController.js';
 import { protect, authorize } from '../middleware/auth.js';
-import { competitionValidator, idValidator } from '../middleware/validator.js';
+import { cacheResponse } from '../middleware/cache.js';
+import {
+  competitionValidator,
+  competitionQueryValidator,
+  autocompleteValidator,
+  calendarQueryValidator,
+  idValidator,
+} from '../middleware/validator.js';
 
 const router = express.Router();
 
-router.get('/calendar', getCompetitionsCalendar);
+// Served from the materialized calendar with its own ETags
+router.get('/calendar', calendarQueryValidator, getCompetitionsCalendar);
+router.get(
+  '/autocomplete',
+  autocompleteValidator,
+  cacheResponse('competitions'),
+  autocompleteCompetitions
+);
 
 router
   .route('/')
-  .get(getCompetitions)
+  .get(competitionQueryValidator, cacheResponse('competitions'), getCompetitions)
   .post(protect, authorize('admin'), competitionValidator, createCompetition);
 
 router
@@ -1,23 +1,47 @@
 import express from 'express';
 import {
   createRegistration,
+  createBulkRegistrations,
   getMyRegistrations,
   getAllRegistrations,
+  exportRegistrations,
   approveRegistration,
   deleteRegistration,
 } from '../controllers/registrationController.js';
 import { protect, authorize } from '../middleware/auth.js';
-import { registrationValidator, idValidator } from '../middleware/validator.js';
+import { registrationLimiter } from '../middleware/rateLimit.js';
+import {
+  registrationValidator,
+  bulkRegistrationValidator,
+  idValidator,
+  exportQueryValidator,
+} from '../middleware/validator.js';
 
 const router = express.Router();
 
 router
   .route('/')
-  .post(protect, registrationValidator, createRegistration)
+  .post(protect, registrationLimiter, registrationValidator, createRegistration)
   .get(protect, authorize('admin', 'support'), getAllRegistrations);
 
+router.post(
+  '/bulk',
+  protect,
+  registrationLimiter,
+  bulkRegistrationValidator,
+  createBulkRegistrations
+);
+
 router.get('/my', protect, getMyRegistrations);
 
+router.get(
+  '/export',
+  protect,
+  authorize('admin', 'support'),
+  exportQueryValidator,
+  exportRegistrations
+);
+
 router.put('/:id/approve', protect, authorize('admin'), idValidator, approveRegistration);
 
 router.delete('/:id', protect, idValidator, deleteRegistration);
@@ -0,0 +1,86 @@
+import Category from '../models/Category.js';
+import Competition from '../models/Competition.js';
+import Registration from '../models/Registration.js';
+import logger from '../config/logger.js';
+import { normalizeSearchKey } from '../utils/search.js';
+
+const BATCH_SIZE = 1000;
+
+// Latest registration per competition, only read when some competition
+// predates lastRegisteredAt
+const readLastRegistrations = async () => {
+  if (!(await Competition.exists({ lastRegisteredAt: { $exists: false } }))) {
+    return new Map();
+  }
+  const latest = await Registration.aggregate([
+    { $group: { _id: '$competition', lastRegisteredAt: { $max: '$createdAt' } } },
+  ]);
+  return new Map(latest.map(({ _id, lastRegisteredAt }) => [_id.toString(), lastRegisteredAt]));
+};
+
+// Derive the fields the Competition schema maintains on write for every
+// competition created before they existed:
+//   titleKey, categoryName - prefix autocomplete and the text index
+//   lastRegisteredAt       - `sort=trending`, from the latest registration
+//   catalogUpdatedAt       - calendar and chatbot fingerprints, from updatedAt
+// Only documents whose stored values differ are written, and updatedAt is
+// left alone, so re-running is cheap.
+export const backfillCompetitionFields = async () => {
+  const started = Date.now();
+  const [categories, lastRegistrations] = await Promise.all([
+    Category.find().select('name').lean(),
+    readLastRegistrations(),
+  ]);
+  const categoryNames = new Map(categories.map(({ _id, name }) => [_id.toString(), name]));
+
+  const cursor = Competition.find()
+    .select('title category titleKey categoryName lastRegisteredAt catalogUpdatedAt updatedAt')
+    .lean()
+    .cursor({ batchSize: BATCH_SIZE });
+
+  let scanned = 0;
+  let updated = 0;
+  let batch = [];
+
+  const flush = async () => {
+    if (batch.length > 0) {
+      const result = await Competition.bulkWrite(batch, { ordered: false });
+      updated += result.modifiedCount;
+      batch = [];
+    }
+  };
+
+  for await (const competition of cursor) {
+    scanned += 1;
+    const titleKey = normalizeSearchKey(competition.title);
+    const categoryName = (competition.category && categoryNames.get(competition.category.toString())) || '';
+
+    const fields = {};
+    if (competition.titleKey !== titleKey || competition.categoryName !== categoryName) {
+      // categoryName feeds the chatbot index, so running servers should
+      // see a catalog change
+      Object.assign(fields, { titleKey, categoryName, catalogUpdatedAt: new Date() });
+    } else if (!competition.catalogUpdatedAt) {
+      fields.catalogUpdatedAt = competition.updatedAt || new Date();
+    }
+    if (!competition.lastRegisteredAt) {
+      fields.lastRegisteredAt = lastRegistrations.get(competition._id.toString()) || new Date(0);
+    }
+
+    if (Object.keys(fields).length > 0) {
+      batch.push({
+        updateOne: {
+          filter: { _id: competition._id },
+          update: { $set: fields },
+          timestamps: false,
+        },
+      });
+    }
+    if (batch.length >= BATCH_SIZE) {
+      await flush();
+    }
+  }
+  await flush();
+
+  logger.info(`Derived fields: ${updated} of ${scanned} competitions backfilled in ${Date.now() - started}ms`);
+};
@@ -0,0 +1,307 @@
+import dotenv from 'dotenv';
+import fs from 'fs';
+import path from 'path';
+import { parseArgs } from 'util';
+import mongoose from 'mongoose';
+import bcrypt from 'bcryptjs';
+import connectDB from '../config/database.js';
+import Category from '../models/Category.js';
+import Competition from '../models/Competition.js';
+import Registration from '../models/Registration.js';
+import ChatMessage from '../models/ChatMessage.js';
+import User from '../models/User.js';
+import logger from '../config/logger.js';
+import { reconcileStats } from '../services/statsService.js';
+import { normalizeSearchKey } from '../utils/search.js';
+import { buildIndexes } from './indexes.js';
+
+dotenv.config();
+
+// Bulk-load a large, reproducible dataset for benchmark.py:
+//
+//   npm run bench:seed -- --competitions 10000 --registrations 1000000 --messages 5000000
+//
+// Every document is a pure function of (seed, index), so two runs with the
+// same arguments produce identical data regardless of batch order. Ids are
+// derived from the index too (see benchId), which lets the benchmark runner
+// address users and competitions without listing them.
+//
+// The target database is dropped first. Point MONGODB_URI at a dedicated
+// database; names without "bench" in them require --force.
+
+const BENCH_PASSWORD = 'benchmark';
+
+const { values: options } = parseArgs({
+  options: {
+    users: { type: 'string', default: '100000' },
+    categories: { type: 'string', default: '12' },
+    competitions: { type: 'string', default: '10000' },
+    registrations: { type: 'string', default: '1000000' },
+    messages: { type: 'string', default: '5000000' },
+    'chat-users': { type: 'string', default: '2000' },
+    'chat-peers': { type: 'string', default: '20' },
+    'batch-size': { type: 'string', default: '10000' },
+    concurrency: { type: 'string', default: '4' },
+    seed: { type: 'string', default: '42' },
+    manifest: { type: 'string', default: 'benchmarks/dataset.json' },
+    force: { type: 'boolean', default: false },
+  },
+});
+
+const config = {
+  users: parseInt(options.users),
+  categories: parseInt(options.categories),
+  competitions: parseInt(options.competitions),
+  registrations: parseInt(options.registrations),
+  messages: parseInt(options.messages),
+  chatUsers: Math.min(parseInt(options['chat-users']), parseInt(options.users)),
+  chatPeers: parseInt(options['chat-peers']),
+  batchSize: parseInt(options['batch-size']),
+  concurrency: parseInt(options.concurrency),
+  seed: parseInt(options.seed),
+};
+config.chatPeers = Math.max(1, Math.min(config.chatPeers, config.chatUsers - 1));
+
+// Deterministic ObjectId: "be" + 2-hex kind + 20-hex index
+const ID_KINDS = { user: 1, competition: 2, category: 3, registration: 4, message: 5 };
+const benchId = (kind, index) =>
+  new mongoose.Types.ObjectId(
+    `be${ID_KINDS[kind].toString(16).padStart(2, '0')}${index.toString(16).padStart(20, '0')}`
+  );
+
+// Stateless hash -> [0, 1), so document i never depends on documents < i
+const random = (index, salt) => {
+  let x = (config.seed + Math.imul(index, 0x9e3779b1) + Math.imul(salt, 0x85ebca6b)) | 0;
+  x ^= x >>> 16;
+  x = Math.imul(x, 0x7feb352d);
+  x ^= x >>> 15;
+  x = Math.imul(x, 0x846ca68b);
+  x ^= x >>> 16;
+  return (x >>> 0) / 4294967296;
+};
+const randomInt = (index, salt, max) => Math.floor(random(index, salt) * max);
+
+const gcd = (a, b) => (b === 0 ? a : gcd(b, a % b));
+
+const FESTIVAL_START = Date.UTC(2026, 1, 11, 8);
+const HOUR = 60 * 60 * 1000;
+const DAY = 24 * HOUR;
+const WORDS = ['hello', 'when', 'does', 'the', 'round', 'start', 'see', 'you', 'at', 'venue', 'thanks', 'team', 'ready', 'submit', 'code'];
+
+const userEmail = (index) =>
+  index === 0 ? 'bench_admin@bench.taakra.com' : `bench_user_${index}@bench.taakra.com`;
+
+const buildUser = (passwordHash) => (index) => {
+  const createdAt = new Date(FESTIVAL_START - 90 * DAY + randomInt(index, 1, 60 * DAY));
+  return {
+    _id: benchId('user', index),
+    name: index === 0 ? 'Bench Admin' : `Bench User ${index}`,
+    email: userEmail(index),
+    password: passwordHash,
+    role: index === 0 ? 'admin' : 'user',
+    createdAt,
+    updatedAt: createdAt,
+    __v: 0,
+  };
+};
+
+const buildCompetition = (index) => {
+  const categoryIndex = index % config.categories;
+  const dayNumber = 1 + (index % 5);
+  const startDate = new Date(FESTIVAL_START + (dayNumber - 1) * DAY + randomInt(index, 2, 10) * HOUR);
+  const title = `Bench Competition ${index} ${WORDS[index % WORDS.length]}`;
+  const createdAt = new Date(FESTIVAL_START - 60 * DAY + randomInt(index, 3, 50 * DAY));
+  return {
+    _id: benchId('competition', index),
+    title,
+    titleKey: normalizeSearchKey(title),
+    description: `Generated competition ${index} for benchmarking`,
+    category: benchId('category', categoryIndex),
+    categoryName: `Bench Category ${categoryIndex + 1}`,
+    venue: `Hall ${index % 50}`,
+    building: `Block ${index % 8}`,
+    startDate,
+    endDate: new Date(startDate.getTime() + (1 + randomInt(index, 4, 3)) * HOUR),
+    dayNumber,
+    registrationsCount: 0,
+    lastRegisteredAt: new Date(0),
+    catalogUpdatedAt: createdAt,
+    createdAt,
+    updatedAt: createdAt,
+    __v: 0,
+  };
+};
+
+// Pair j is user (j mod U) with that user's k-th competition, stepping by a
+// stride coprime to C so a user's competitions never repeat
+const buildRegistration = (counts, lastRegistered) => {
+  let stride = 1009;
+  while (gcd(stride, config.competitions) !== 1) {
+    stride += 1;
+  }
+
+  return (index) => {
+    const user = index % config.users;
+    const k = Math.floor(index / config.users);
+    const competition = (user * 131 + k * stride) % config.competitions;
+    counts[competition] += 1;
+    const createdAt = new Date(FESTIVAL_START - 30 * DAY + randomInt(index, 5, 29 * DAY));
+    lastRegistered[competition] = Math.max(lastRegistered[competition], createdAt.getTime());
+    return {
+      _id: benchId('registration', index),
+      user: benchId('user', user),
+      competition: benchId('competition', competition),
+      status: random(index, 6) < 0.3 ? 'approved' : 'pending',
+      createdAt,
+      updatedAt: createdAt,
+      __v: 0,
+    };
+  };
+};
+
+// Chat between the first `chatUsers` users; each talks to `chatPeers`
+// neighbours, so user i has history with user i + 1
+const buildMessage = (index) => {
+  const sender = randomInt(index, 7, config.chatUsers);
+  const receiver = (sender + 1 + randomInt(index, 8, config.chatPeers)) % config.chatUsers;
+  const timestamp = new Date(FESTIVAL_START - 30 * DAY + randomInt(index, 9, 30 * DAY));
+  const length = 2 + randomInt(index, 10, 8);
+  const words = Array.from({ length }, (_, w) => WORDS[randomInt(index, 11 + w, WORDS.length)]);
+  return {
+    _id: benchId('message', index),
+    sender: benchId('user', sender),
+    receiver: benchId('user', receiver),
+    message: words.join(' '),
+    timestamp,
+    createdAt: timestamp,
+    updatedAt: timestamp,
+    __v: 0,
+  };
+};
+
+// insertMany in fixed-size batches with a few batches in flight. Uses the
+// driver collection directly: documents are already in their stored shape.
+const bulkInsert = async (label, Model, total, buildDoc) => {
+  if (total === 0) {
+    return;
+  }
+
+  const started = Date.now();
+  let next = 0;
+  let inserted = 0;
+  let reported = 0;
+
+  const worker = async () => {
+    while (next < total) {
+      const from = next;
+      const to = Math.min(total, from + config.batchSize);
+      next = to;
+
+      const docs = [];
+      for (let i = from; i < to; i += 1) {
+        docs.push(buildDoc(i));
+      }
+      await Model.collection.insertMany(docs, { ordered: false });
+
+      inserted += docs.length;
+      if (inserted - reported >= total / 10 || inserted === total) {
+        reported = inserted;
+        const seconds = (Date.now() - started) / 1000;
+        logger.info(
+          `${label}: ${inserted}/${total} (${Math.round(inserted / seconds)} docs/s)`
+        );
+      }
+    }
+  };
+
+  await Promise.all(Array.from({ length: config.concurrency }, worker));
+};
+
+const generate = async () => {
+  try {
+    if (config.registrations > config.users * config.competitions) {
+      throw new Error('--registrations cannot exceed users x competitions');
+    }
+
+    // Indexes are built once after loading, which is much faster than
+    // maintaining them during millions of inserts
+    mongoose.set('autoIndex', false);
+    await connectDB({ workload: 'batch' });
+
+    const name = mongoose.connection.db.databaseName;
+    if (!name.includes('bench') && !options.force) {
+      throw new Error(`Refusing to drop database "${name}" - use a *bench* database or pass --force`);
+    }
+
+    logger.info(`Generating benchmark data in "${name}": ${JSON.stringify(config)}`);
+    const started = Date.now();
+
+    await mongoose.connection.db.dropDatabase();
+
+    // One hash shared by every generated user - bcrypt is the slow part
+    const passwordHash = await bcrypt.hash(BENCH_PASSWORD, 10);
+
+    await bulkInsert('categories', Category, config.categories, (index) => ({
+      _id: benchId('category', index),
+      name: `Bench Category ${index + 1}`,
+      description: `Generated category ${index + 1}`,
+      createdAt: new Date(FESTIVAL_START - 120 * DAY),
+      updatedAt: new Date(FESTIVAL_START - 120 * DAY),
+      __v: 0,
+    }));
+    await bulkInsert('users', User, config.users, buildUser(passwordHash));
+    await bulkInsert('competitions', Competition, config.competitions, buildCompetition);
+
+    const counts = new Int32Array(config.competitions);
+    const lastRegistered = new Float64Array(config.competitions);
+    await bulkInsert(
+      'registrations',
+      Registration,
+      config.registrations,
+      buildRegistration(counts, lastRegistered)
+    );
+    await bulkInsert('messages', ChatMessage, config.messages, buildMessage);
+
+    logger.info('Writing registration counts...');
+    const updates = [];
+    counts.forEach((count, index) => {
+      if (count > 0) {
+        updates.push({
+          updateOne: {
+            filter: { _id: benchId('competition', index) },
+            update: {
+              $set: { registrationsCount: count, lastRegisteredAt: new Date(lastRegistered[index]) },
+            },
+          },
+        });
+      }
+    });
+    for (let i = 0; i < updates.length; i += config.batchSize) {
+      await Competition.collection.bulkWrite(updates.slice(i, i + config.batchSize), { ordered: false });
+    }
+
+    await buildIndexes();
+    await reconcileStats();
+
+    const manifest = {
+      ...config,
+      password: BENCH_PASSWORD,
+      adminEmail: userEmail(0),
+      userEmailPattern: 'bench_user_{index}@bench.taakra.com',
+      idPrefix: 'be',
+      idKinds: ID_KINDS,
+      generatedAt: new Date().toISOString(),
+    };
+    fs.mkdirSync(path.dirname(options.manifest), { recursive: true });
+    fs.writeFileSync(options.manifest, `${JSON.stringify(manifest, null, 2)}\n`);
+
+    logger.info(`Benchmark data generated in ${((Date.now() - started) / 1000).toFixed(1)}s`);
+    logger.info(`Manifest written to ${options.manifest}`);
+    process.exit(0);
+  } catch (error) {
+    logger.error('Error generating benchmark data:', error);
+    process.exit(1);
+  }
+};
+
+generate();
@@ -0,0 +1,36 @@
+import Category from '../models/Category.js';
+import Competition from '../models/Competition.js';
+import Registration from '../models/Registration.js';
+import ChatMessage from '../models/ChatMessage.js';
+import Conversation from '../models/Conversation.js';
+import User from '../models/User.js';
+import AdminStats from '../models/AdminStats.js';
+import logger from '../config/logger.js';
+
+export const INDEXED_MODELS = [User, Category, Competition, Registration, ChatMessage, Conversation, AdminStats];
+
+// Create every schema index, one model at a time with progress. Indexes
+// that exist in the database but no longer in a schema are only reported,
+// unless `drop` is set.
+export const buildIndexes = async ({ drop = false } = {}) => {
+  const started = Date.now();
+
+  for (const [position, Model] of INDEXED_MODELS.entries()) {
+    const modelStarted = Date.now();
+    const { toCreate, toDrop } = await Model.diffIndexes();
+
+    if (drop && toDrop.length > 0) {
+      await Model.cleanIndexes();
+    } else if (toDrop.length > 0) {
+      logger.warn(`${Model.modelName}: indexes not in the schema (kept): ${toDrop.join(', ')}`);
+    }
+
+    await Model.createIndexes();
+    logger.info(
+      `Indexes [${position + 1}/${INDEXED_MODELS.length}] ${Model.modelName}: ` +
+        `${toCreate.length} built${drop ? `, ${toDrop.length} dropped` : ''} in ${Date.now() - modelStarted}ms`
+    );
+  }
+
+  logger.info(`All indexes ready in ${Date.now() - started}ms`);
+};
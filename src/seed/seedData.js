@@ -1,13 +1,42 @@
 import dotenv from 'dotenv';
+import { parseArgs } from 'util';
 import mongoose from 'mongoose';
 import connectDB from '../config/database.js';
 import Category from '../models/Category.js';
 import Competition from '../models/Competition.js';
 import User from '../models/User.js';
 import logger from '../config/logger.js';
+import { hashPassword } from '../services/passwordPool.js';
+import { reconcileStats } from '../services/statsService.js';
+import { normalizeSearchKey } from '../utils/search.js';
+import { buildIndexes } from './indexes.js';
+import { backfillCompetitionFields } from './backfill.js';
 
 dotenv.config();
 
+// Idempotent seed: safe to re-run against a database that already has data.
+//
+//   npm run seed                          indexes, then upsert the sample data
+//   npm run seed -- --indexes-only        only build indexes and backfill
+//                                         derived competition fields
+//   npm run seed -- --skip-indexes        only upsert the sample data
+//   npm run seed -- --reset-passwords     also reset sample users' passwords
+//   npm run seed -- --drop-stale-indexes  drop indexes no schema declares
+//
+// Categories are matched by name, competitions by normalized title and
+// users by email. Matches are updated in place and everything else is left
+// alone, so nothing is wiped or duplicated. Registration counts, user
+// passwords and refresh tokens of existing documents are kept.
+
+const { values: options } = parseArgs({
+  options: {
+    'indexes-only': { type: 'boolean', default: false },
+    'skip-indexes': { type: 'boolean', default: false },
+    'reset-passwords': { type: 'boolean', default: false },
+    'drop-stale-indexes': { type: 'boolean', default: false },
+  },
+});
+
 // Categories array
 const categories = [
   { name: 'Ceremony', description: 'Ceremonial events and activities' },
@@ -1097,43 +1126,132 @@ const getCompetitions = (categoryMap) => [
   }
 ];
 
+const summarize = (label, result, total) => {
+  const inserted = result.upsertedCount;
+  const updated = result.modifiedCount;
+  logger.info(`${label}: ${inserted} inserted, ${updated} updated, ${total - inserted - updated} unchanged`);
+};
+
+const upsertCategories = async () => {
+  const result = await Category.bulkWrite(
+    categories.map(({ name, description }) => ({
+      updateOne: {
+        filter: { name },
+        update: { $set: { description } },
+        upsert: true,
+      },
+    })),
+    { ordered: false }
+  );
+  summarize('Categories', result, categories.length);
+
+  const stored = await Category.find({ name: { $in: categories.map((c) => c.name) } })
+    .select('name')
+    .lean();
+  return Object.fromEntries(stored.map((category) => [category.name, category._id]));
+};
+
+// bulkWrite skips document middleware, so the search and catalog fields
+// the Competition schema derives on save are written here. Matching on the
+// exact title as well means a document seeded before titleKey existed is
+// updated, never inserted a second time.
+const upsertCompetitions = async (categoryMap) => {
+  const categoryNames = Object.fromEntries(
+    Object.entries(categoryMap).map(([name, id]) => [id.toString(), name])
+  );
+  const competitions = getCompetitions(categoryMap);
+
+  const result = await Competition.bulkWrite(
+    competitions.map((competition) => {
+      const titleKey = normalizeSearchKey(competition.title);
+      return {
+        updateOne: {
+          filter: { $or: [{ titleKey }, { title: competition.title }] },
+          update: {
+            $set: {
+              ...competition,
+              titleKey,
+              categoryName: categoryNames[competition.category.toString()],
+              catalogUpdatedAt: new Date(),
+            },
+            $setOnInsert: { lastRegisteredAt: new Date(0) },
+          },
+          upsert: true,
+        },
+      };
+    }),
+    { ordered: false }
+  );
+  summarize('Competitions', result, competitions.length);
+  return competitions.length;
+};
+
+// Only users that don't exist yet (or every user, with --reset-passwords)
+// need a hash; those run in parallel on the password worker pool
+const upsertUsers = async () => {
+  const existing = new Set(
+    (await User.find({ email: { $in: users.map((u) => u.email) } }).select('email').lean()).map(
+      (user) => user.email
+    )
+  );
+
+  const started = Date.now();
+  const hashes = await Promise.all(
+    users.map((user) =>
+      options['reset-passwords'] || !existing.has(user.email) ? hashPassword(user.password, 10) : null
+    )
+  );
+  const hashed = hashes.filter(Boolean).length;
+  if (hashed > 0) {
+    logger.info(`Hashed ${hashed} passwords in ${Date.now() - started}ms`);
+  }
+
+  const result = await User.bulkWrite(
+    users.map(({ name, email, role }, index) => ({
+      updateOne: {
+        filter: { email },
+        update: { $set: hashes[index] ? { name, role, password: hashes[index] } : { name, role } },
+        upsert: true,
+      },
+    })),
+    { ordered: false }
+  );
+  summarize('Users', result, users.length);
+  return users.length;
+};
+
 // Main seed function
 const seedDatabase = async () => {
   try {
     logger.info('Starting database seed process...');
+    const started = Date.now();
+
+    // Indexes are built explicitly below, before any data is written
+    mongoose.set('autoIndex', false);
 
     // Connect to database
-    await connectDB();
+    await connectDB({ workload: 'batch' });
     logger.info('Database connected successfully');
 
-    // Clear existing data
-    logger.info('Clearing existing data...');
-    await Category.deleteMany({});
-    await Competition.deleteMany({});
-    await User.deleteMany({});
-    logger.info('Existing data cleared');
+    if (!options['skip-indexes']) {
+      await buildIndexes({ drop: options['drop-stale-indexes'] });
+    }
 
-    // Insert categories
-    logger.info('Inserting categories...');
-    const insertedCategories = await Category.insertMany(categories);
-    logger.info(`${insertedCategories.length} categories inserted successfully`);
+    // Competitions created before the derived fields existed
+    await backfillCompetitionFields();
 
-    // Create category mapping
-    const categoryMap = {};
-    insertedCategories.forEach(category => {
-      categoryMap[category.name] = category._id;
-    });
+    if (options['indexes-only']) {
+      process.exit(0);
+    }
 
-    // Insert competitions
-    logger.info('Inserting competitions...');
-    const competitions = getCompetitions(categoryMap);
-    const insertedCompetitions = await Competition.insertMany(competitions);
-    logger.info(`${insertedCompetitions.length} competitions inserted successfully`);
+    const categoryMap = await upsertCategories();
+    const [competitionCount, userCount] = await Promise.all([
+      upsertCompetitions(categoryMap),
+      upsertUsers(),
+    ]);
 
-    // Insert sample users
-    logger.info('Inserting sample users...');
-    const insertedUsers = await User.create(users);
-    logger.info(`${insertedUsers.length} users inserted successfully`);
+    // Totals may have changed; rebuild the admin dashboard counters
+    await reconcileStats();
 
     // Log success message with credentials
     logger.info('\n==============================================');
@@ -1154,9 +1272,10 @@ const seedDatabase = async () => {
     logger.info('  Password: 123456');
     logger.info('  Role: user');
     logger.info('\n==============================================');
-    logger.info(`Total Categories: ${insertedCategories.length}`);
-    logger.info(`Total Competitions: ${insertedCompetitions.length}`);
-    logger.info(`Total Users: ${insertedUsers.length}`);
+    logger.info(`Seeded Categories: ${categories.length}`);
+    logger.info(`Seeded Competitions: ${competitionCount}`);
+    logger.info(`Seeded Users: ${userCount}`);
+    logger.info(`Finished in ${((Date.now() - started) / 1000).toFixed(1)}s`);
     logger.info('==============================================\n');
 
     // Exit process
@@ -0,0 +1,280 @@
+import crypto from 'crypto';
+import Competition from '../models/Competition.js';
+import logger from '../config/logger.js';
+import { broadcast, onBroadcast } from '../config/cluster.js';
+
+const CALENDAR_FIELDS = 'title startDate endDate venue building dayNumber category categoryName';
+
+// In-process materialized calendar. Competitions are kept per festival day;
+// a write re-materializes only the days it touches. Other processes' writes
+// are picked up by comparing a cheap collection fingerprint at most every
+// CALENDAR_REVALIDATE_SECONDS, or on the next read when a cluster worker
+// announces them.
+const state = {
+  entries: new Map(), // dayNumber -> Map(competitionId -> entry)
+  views: new Map(), // dayNumber -> { data, etag }
+  all: null, // { data, etag } for the flat list, built on demand
+  grouped: null, // { data, etag } for every day, built on demand
+  fingerprint: null,
+  checkedAt: 0,
+  loading: null,
+};
+
+const etagFor = (value) =>
+  `"${crypto.createHash('sha1').update(JSON.stringify(value)).digest('base64url')}"`;
+
+const toEntry = ({ _id, title, startDate, endDate, venue, building, dayNumber, category, categoryName }) => ({
+  _id,
+  title,
+  startDate,
+  endDate,
+  venue,
+  building: building || '',
+  dayNumber,
+  category: category ? { _id: category._id || category, name: categoryName || category.name || '' } : null,
+});
+
+const byStart = (a, b) =>
+  a.startDate - b.startDate ||
+  a.building.localeCompare(b.building) ||
+  a.venue.localeCompare(b.venue) ||
+  a._id.toString().localeCompare(b._id.toString());
+
+// One day's bucket: competitions in time order, grouped into slots that
+// start together, plus a building -> venue index of competition ids
+const materializeDay = (dayNumber, dayEntries) => {
+  const competitions = [...dayEntries.values()].sort(byStart);
+
+  const slots = [];
+  const buildings = new Map();
+
+  competitions.forEach((competition) => {
+    const slot = slots[slots.length - 1];
+    if (slot && slot.startDate.getTime() === competition.startDate.getTime()) {
+      slot.competitions.push(competition);
+      if (competition.endDate > slot.endDate) {
+        slot.endDate = competition.endDate;
+      }
+    } else {
+      slots.push({
+        startDate: competition.startDate,
+        endDate: competition.endDate,
+        competitions: [competition],
+      });
+    }
+
+    if (!buildings.has(competition.building)) {
+      buildings.set(competition.building, new Map());
+    }
+    const venues = buildings.get(competition.building);
+    if (!venues.has(competition.venue)) {
+      venues.set(competition.venue, []);
+    }
+    venues.get(competition.venue).push(competition._id);
+  });
+
+  const data = {
+    dayNumber,
+    date: competitions.length > 0 ? competitions[0].startDate : null,
+    count: competitions.length,
+    slots,
+    buildings: [...buildings]
+      .sort(([a], [b]) => a.localeCompare(b))
+      .map(([building, venues]) => ({
+        building,
+        venues: [...venues]
+          .sort(([a], [b]) => a.localeCompare(b))
+          .map(([venue, competitionIds]) => ({ venue, competitionIds })),
+      })),
+  };
+
+  return { data, etag: etagFor(data) };
+};
+
+const rematerialize = (dayNumber) => {
+  const dayEntries = state.entries.get(dayNumber);
+  if (!dayEntries || dayEntries.size === 0) {
+    state.entries.delete(dayNumber);
+    state.views.delete(dayNumber);
+  } else {
+    state.views.set(dayNumber, materializeDay(dayNumber, dayEntries));
+  }
+  state.all = null;
+  state.grouped = null;
+};
+
+// Newest catalog edit plus document count - changes on any create, edit
+// or delete, but not on registrations
+const readFingerprint = async () => {
+  const [count, latest] = await Promise.all([
+    Competition.estimatedDocumentCount(),
+    Competition.findOne().sort({ catalogUpdatedAt: -1 }).select('catalogUpdatedAt').lean(),
+  ]);
+  return `${count}:${latest?.catalogUpdatedAt ? latest.catalogUpdatedAt.getTime() : 0}`;
+};
+
+const rebuild = async () => {
+  const started = Date.now();
+  const fingerprint = await readFingerprint();
+  const competitions = await Competition.find().select(CALENDAR_FIELDS).lean();
+
+  state.entries = new Map();
+  competitions.forEach((competition) => {
+    if (!state.entries.has(competition.dayNumber)) {
+      state.entries.set(competition.dayNumber, new Map());
+    }
+    state.entries.get(competition.dayNumber).set(competition._id.toString(), toEntry(competition));
+  });
+
+  state.views = new Map();
+  [...state.entries.keys()].forEach(rematerialize);
+  state.all = null;
+  state.grouped = null;
+  state.fingerprint = fingerprint;
+  state.checkedAt = Date.now();
+
+  logger.debug(`Calendar rebuilt: ${competitions.length} competitions in ${Date.now() - started}ms`);
+};
+
+// Build on first use and whenever the collection changed elsewhere
+const ensureFresh = async () => {
+  const interval = (parseInt(process.env.CALENDAR_REVALIDATE_SECONDS) || 15) * 1000;
+  const stale = !state.fingerprint || Date.now() - state.checkedAt >= interval;
+
+  if (!stale) {
+    return;
+  }
+
+  if (!state.loading) {
+    state.loading = (async () => {
+      if (state.fingerprint && (await readFingerprint()) === state.fingerprint) {
+        state.checkedAt = Date.now();
+        return;
+      }
+      await rebuild();
+    })().finally(() => {
+      state.loading = null;
+    });
+  }
+
+  await state.loading;
+};
+
+// Every competition in start order - the original /calendar response,
+// including its isUpcoming flag. The list is rebuilt when the next
+// competition starts, since that flips one entry's flag (and the ETag).
+export const getCalendar = async () => {
+  await ensureFresh();
+
+  const now = Date.now();
+  if (!state.all || now >= state.all.expiresAt) {
+    const data = [...state.entries.values()]
+      .flatMap((dayEntries) => [...dayEntries.values()])
+      .sort(byStart)
+      .map((entry) => ({ ...entry, isUpcoming: entry.startDate > now }));
+    const upcoming = data.filter((entry) => entry.isUpcoming);
+    state.all = {
+      data,
+      etag: etagFor([[...state.views.values()].map((view) => view.etag), upcoming.length]),
+      expiresAt: upcoming.length > 0 ? upcoming[0].startDate.getTime() : Infinity,
+    };
+  }
+
+  return state.all;
+};
+
+// Every day bucket, in day order
+export const getCalendarDays = async () => {
+  await ensureFresh();
+
+  if (!state.grouped) {
+    const days = [...state.views.keys()].sort((a, b) => a - b).map((day) => state.views.get(day));
+    state.grouped = {
+      data: days.map((view) => view.data),
+      etag: etagFor(days.map((view) => view.etag)),
+    };
+  }
+
+  return state.grouped;
+};
+
+// One day bucket, or an empty one for a day without competitions
+export const getCalendarDay = async (dayNumber) => {
+  await ensureFresh();
+  return state.views.get(dayNumber) || materializeDay(dayNumber, new Map());
+};
+
+// Apply a created or updated competition. Only its old and new day are
+// re-materialized.
+export const upsertCalendarEntry = (competition) => {
+  broadcast('calendar:changed', { rebuild: false });
+
+  if (!state.fingerprint) {
+    return;
+  }
+
+  const id = competition._id.toString();
+  const entry = toEntry(competition);
+  const touched = new Set([entry.dayNumber]);
+
+  state.entries.forEach((dayEntries, dayNumber) => {
+    if (dayNumber !== entry.dayNumber && dayEntries.delete(id)) {
+      touched.add(dayNumber);
+    }
+  });
+
+  if (!state.entries.has(entry.dayNumber)) {
+    state.entries.set(entry.dayNumber, new Map());
+  }
+  state.entries.get(entry.dayNumber).set(id, entry);
+
+  touched.forEach(rematerialize);
+};
+
+export const removeCalendarEntry = (competitionId) => {
+  const id = competitionId.toString();
+  state.entries.forEach((dayEntries, dayNumber) => {
+    if (dayEntries.delete(id)) {
+      rematerialize(dayNumber);
+    }
+  });
+  broadcast('calendar:changed', { rebuild: false });
+};
+
+// Force a full rebuild on next read, e.g. after a category rename
+export const refreshCalendar = () => {
+  state.fingerprint = null;
+  broadcast('calendar:changed', { rebuild: true });
+};
+
+// Another worker wrote: recheck the fingerprint (or rebuild) on next read
+onBroadcast('calendar:changed', ({ rebuild }) => {
+  if (rebuild) {
+    state.fingerprint = null;
+  }
+  state.checkedAt = 0;
+});
+
+// The competition already booked in the same venue and building whose time
+// range overlaps [startDate, endDate), or null.
+//
+// As long as bookings in one venue don't overlap each other, the only
+// candidate is the latest one starting before `endDate`, so this is a
+// single seek on { building, venue, startDate } rather than a range scan.
+export const findVenueConflict = async ({ building = '', venue, startDate, endDate }, excludeId) => {
+  const filter = {
+    building,
+    venue,
+    startDate: { $lt: new Date(endDate) },
+  };
+  if (excludeId) {
+    filter._id = { $ne: excludeId };
+  }
+
+  const candidate = await Competition.findOne(filter)
+    .sort({ startDate: -1 })
+    .select('title venue building startDate endDate')
+    .lean();
+
+  return candidate && candidate.endDate > new Date(startDate) ? candidate : null;
+};
@@ -0,0 +1,210 @@
+import logger from '../config/logger.js';
+
+// Model backends for chatbotService. A backend is
+//
+//   { name, stream({ message, sources, signal }) }
+//
+// where stream() is an async iterable of text chunks and `sources` are the
+// competitions and categories the retrieval index matched for the
+// question. CHATBOT_BACKEND picks one by name; registerBackend() adds
+// others (e.g. a canned stub in tests).
+
+const formatDate = (date) =>
+  new Date(date).toLocaleString('en-GB', {
+    weekday: 'short',
+    day: 'numeric',
+    month: 'short',
+    hour: '2-digit',
+    minute: '2-digit',
+  });
+
+// One line of prompt/answer text per retrieved document
+export const describeSource = (source) =>
+  source.type === 'category'
+    ? `${source.name} (category): ${source.description || 'no description'}`
+    : `${source.title} - ${source.categoryName || 'Uncategorized'}, day ${source.dayNumber}, ` +
+      `${formatDate(source.startDate)} at ${source.venue}` +
+      (source.building && source.building !== source.venue ? `, ${source.building}` : '');
+
+// Canned guidance by topic, the original rule-based replies
+const TOPICS = [
+  {
+    keywords: ['register', 'registration', 'sign up'],
+    reply: "To register for a competition:\n1. Browse competitions at /competitions\n2. Click on a competition you're interested in\n3. Click 'Register Now'\n4. Your registration will be pending admin approval\n\nYou need to be logged in to register.",
+  },
+  {
+    keywords: ['trending', 'popular', 'top'],
+    reply: "Check out the Competitions page sorted by 'Most Registrations' to see the most popular events. The LandingPage also shows featured and trending competitions.",
+  },
+  {
+    keywords: ['calendar', 'schedule', 'upcoming', 'date', 'when'],
+    reply: 'View the Event Calendar at /calendar to see all upcoming competitions on a monthly calendar. You can switch to Agenda view to see a chronological list of events.',
+  },
+  {
+    keywords: ['status', 'approved', 'pending'],
+    reply: "Check your registration status in your Dashboard under 'My Registrations'. Registrations can be Pending (waiting for approval), Approved, or Rejected.",
+  },
+  {
+    keywords: ['login', 'account', 'password', 'forgot'],
+    reply: "To login, visit /login. If you forgot your password, use the 'Forgot Password' link on the login page. For new accounts, register at /signup.",
+  },
+  {
+    keywords: ['contact', 'support', 'help', 'chat'],
+    reply: 'For live support, use the Chat feature at /chat to message our support team directly. We\'re available to help with any questions about competitions or registrations.',
+  },
+  {
+    keywords: ['find', 'search', 'competition', 'event', 'category'],
+    reply: 'You can browse all competitions at the Competitions page. Use the search bar to find competitions by name, or filter by category. You can also sort by trending, most registrations, or newest.',
+  },
+  {
+    keywords: ['hello', 'hi', 'hey', 'greet'],
+    reply: "Hello! I'm the Taakra AI Assistant. I can help you find competitions, understand the registration process, check schedules, and more. What would you like to know?",
+  },
+  {
+    keywords: ['thank'],
+    reply: "You're welcome! Feel free to ask if you need any more help with competitions or events at Taakra.",
+  },
+];
+
+const DEFAULT_REPLY =
+  "I can help you with:\n\n• Finding competitions and events\n• Registration process and status\n• Event calendar and schedules\n• Category information\n• Account and login help\n• Contacting support\n\nWhat would you like to know more about?";
+
+const matchesKeyword = (words, keyword) =>
+  keyword.includes(' ') ? words.join(' ').includes(keyword) : words.some((word) => word.startsWith(keyword));
+
+// Deterministic, dependency-free answers: the topic reply plus the
+// retrieved competitions. The default backend, and the stand-in for a
+// model in tests.
+export const localBackend = {
+  name: 'local',
+
+  async *stream({ message, sources }) {
+    const words = message.toLowerCase().split(/[^\p{L}\p{N}]+/u).filter(Boolean);
+    const topic = TOPICS.find(({ keywords }) => keywords.some((keyword) => matchesKeyword(words, keyword)));
+
+    let answer = topic ? topic.reply : sources.length > 0 ? '' : DEFAULT_REPLY;
+    if (sources.length > 0) {
+      answer += `${answer ? '\n\n' : ''}Related to your question:\n`;
+      answer += sources.map((source) => `• ${describeSource(source)}`).join('\n');
+    }
+
+    // Word-sized chunks, so clients exercise the same streaming path as
+    // with a real model
+    for (const token of answer.match(/\s*\S+/g) || []) {
+      yield token;
+    }
+  },
+};
+
+const SYSTEM_PROMPT =
+  'You are a helpful assistant for Taakra, a competition management platform. Help users with questions about competitions, registrations, and event details. Prefer the listed competitions and categories over general knowledge, and say so when they do not answer the question.';
+
+const MAX_RATE_LIMIT_RETRIES = 2;
+
+const sleep = (ms, signal) =>
+  new Promise((resolve, reject) => {
+    const timer = setTimeout(resolve, ms);
+    signal?.addEventListener(
+      'abort',
+      () => {
+        clearTimeout(timer);
+        reject(signal.reason);
+      },
+      { once: true }
+    );
+  });
+
+// OpenAI-compatible chat completions, streamed. Requests share fetch's
+// keep-alive connection pool, time out after CHATBOT_TIMEOUT_MS and retry
+// a 429 after the Retry-After the API asks for.
+export const openAIBackend = {
+  name: 'openai',
+
+  async *stream({ message, sources, signal }) {
+    const apiUrl = `${process.env.OPENAI_BASE_URL || 'https://api.openai.com/v1'}/chat/completions`;
+    const timeout = AbortSignal.timeout(parseInt(process.env.CHATBOT_TIMEOUT_MS) || 20000);
+    const requestSignal = signal ? AbortSignal.any([signal, timeout]) : timeout;
+
+    const context = sources.length > 0 ? `\n\nRelevant data:\n${sources.map(describeSource).join('\n')}` : '';
+
+    let response;
+    for (let attempt = 0; ; attempt += 1) {
+      response = await fetch(apiUrl, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          Authorization: `Bearer ${process.env.OPENAI_API_KEY}`,
+        },
+        body: JSON.stringify({
+          model: process.env.OPENAI_MODEL || 'gpt-4',
+          messages: [
+            { role: 'system', content: SYSTEM_PROMPT + context },
+            { role: 'user', content: message },
+          ],
+          max_tokens: 500,
+          temperature: 0.7,
+          stream: true,
+        }),
+        signal: requestSignal,
+      });
+
+      if (response.status !== 429 || attempt >= MAX_RATE_LIMIT_RETRIES) {
+        break;
+      }
+
+      const retryAfter = Math.min(parseFloat(response.headers.get('retry-after')) || 1, 10);
+      logger.warn(`Chatbot model rate limited, retrying in ${retryAfter}s`);
+      await response.body?.cancel();
+      await sleep(retryAfter * 1000, requestSignal);
+    }
+
+    if (!response.ok) {
+      await response.body?.cancel();
+      throw new Error(`Model API responded ${response.status}`);
+    }
+
+    // Server-sent events: `data: {json}` lines, terminated by `data: [DONE]`
+    const decoder = new TextDecoder();
+    let buffered = '';
+    for await (const bytes of response.body) {
+      buffered += decoder.decode(bytes, { stream: true });
+      const lines = buffered.split('\n');
+      buffered = lines.pop();
+
+      for (const line of lines) {
+        const data = line.startsWith('data:') ? line.slice(5).trim() : '';
+        if (data === '[DONE]') {
+          return;
+        }
+        if (data) {
+          const token = JSON.parse(data).choices?.[0]?.delta?.content;
+          if (token) {
+            yield token;
+          }
+        }
+      }
+    }
+  },
+};
+
+const backends = new Map([
+  [localBackend.name, localBackend],
+  [openAIBackend.name, openAIBackend],
+]);
+
+export const registerBackend = (backend) => {
+  backends.set(backend.name, backend);
+};
+
+// CHATBOT_BACKEND, or openai when an API key is configured
+export const getBackend = () => {
+  const configured = process.env.OPENAI_API_KEY && process.env.OPENAI_API_KEY !== 'your_openai_api_key_here';
+  const name = process.env.CHATBOT_BACKEND || (configured ? 'openai' : 'local');
+  const backend = backends.get(name);
+
+  if (!backend) {
+    logger.warn(`Unknown chatbot backend "${name}", using local`);
+    return localBackend;
+  }
+  return backend;
+};
@@ -0,0 +1,155 @@
+import Category from '../models/Category.js';
+import Competition from '../models/Competition.js';
+import logger from '../config/logger.js';
+import { withCatalogReads } from '../config/database.js';
+
+// In-process BM25 index over competitions and categories, used to ground
+// chatbot answers. Rebuilt when the catalog changes, which is detected the
+// same way as for the calendar: a cheap count + latest-update fingerprint,
+// read at most every CHATBOT_INDEX_REFRESH_SECONDS. Competitions are
+// compared by catalogUpdatedAt, which registrations don't touch, so they
+// neither rebuild the index nor retire cached answers.
+
+const COMPETITION_FIELDS = 'title description categoryName venue building startDate endDate dayNumber';
+
+// Field weights: a title match outranks one in the description
+const WEIGHTS = { title: 3, name: 3, categoryName: 2, venue: 1, building: 1, description: 1 };
+
+const K1 = 1.2;
+const B = 0.75;
+
+const STOPWORDS = new Set(
+  'a an and are at be can do does for from how i in is it me my of on or the there this to what when where which who will with you'.split(' ')
+);
+
+export const tokenize = (text = '') =>
+  text
+    .toLowerCase()
+    .split(/[^\p{L}\p{N}]+/u)
+    .filter((token) => token.length > 1 && !STOPWORDS.has(token));
+
+const state = {
+  documents: [], // source objects returned by search()
+  lengths: [],
+  averageLength: 0,
+  postings: new Map(), // token -> [[documentIndex, weightedFrequency], ...]
+  version: 0,
+  fingerprint: null,
+  checkedAt: 0,
+  loading: null,
+};
+
+const readFingerprint = async () => {
+  const latest = async (Model, field) => {
+    const doc = await Model.findOne().sort({ [field]: -1 }).select(field).lean();
+    return doc?.[field] ? doc[field].getTime() : 0;
+  };
+  const [competitions, categories, lastCompetition, lastCategory] = await Promise.all([
+    Competition.estimatedDocumentCount(),
+    Category.estimatedDocumentCount(),
+    latest(Competition, 'catalogUpdatedAt'),
+    latest(Category, 'updatedAt'),
+  ]);
+  return [competitions, categories, lastCompetition, lastCategory].join(':');
+};
+
+const rebuild = async (fingerprint) => {
+  const started = Date.now();
+  const [competitions, categories] = await Promise.all([
+    withCatalogReads(Competition.find().select(COMPETITION_FIELDS).lean()),
+    withCatalogReads(Category.find().select('name description').lean()),
+  ]);
+
+  const documents = [
+    ...categories.map(({ _id, name, description }) => ({ type: 'category', _id, name, description })),
+    ...competitions.map((competition) => ({ type: 'competition', ...competition })),
+  ];
+
+  const postings = new Map();
+  const lengths = documents.map((document, index) => {
+    const frequencies = new Map();
+    let length = 0;
+
+    Object.entries(WEIGHTS).forEach(([field, weight]) => {
+      tokenize(document[field]).forEach((token) => {
+        frequencies.set(token, (frequencies.get(token) || 0) + weight);
+        length += weight;
+      });
+    });
+
+    frequencies.forEach((frequency, token) => {
+      if (!postings.has(token)) {
+        postings.set(token, []);
+      }
+      postings.get(token).push([index, frequency]);
+    });
+
+    return length;
+  });
+
+  state.documents = documents;
+  state.lengths = lengths;
+  state.averageLength = lengths.reduce((sum, length) => sum + length, 0) / (lengths.length || 1);
+  state.postings = postings;
+  state.version += 1;
+  state.fingerprint = fingerprint;
+  state.checkedAt = Date.now();
+
+  logger.debug(`Chatbot index rebuilt: ${documents.length} documents in ${Date.now() - started}ms`);
+};
+
+// Build on first use and whenever the catalog changed. Resolves to the
+// index version, which changes with every rebuild.
+export const ensureIndex = async () => {
+  const interval = (parseInt(process.env.CHATBOT_INDEX_REFRESH_SECONDS) || 60) * 1000;
+
+  if (state.fingerprint && Date.now() - state.checkedAt < interval) {
+    return state.version;
+  }
+
+  if (!state.loading) {
+    state.loading = (async () => {
+      const fingerprint = await readFingerprint();
+      if (fingerprint === state.fingerprint) {
+        state.checkedAt = Date.now();
+        return;
+      }
+      await rebuild(fingerprint);
+    })().finally(() => {
+      state.loading = null;
+    });
+  }
+
+  await state.loading;
+  return state.version;
+};
+
+// Best `limit` documents for `query` by BM25 score
+export const searchIndex = (query, limit = 5) => {
+  const total = state.documents.length;
+  const scores = new Map();
+
+  new Set(tokenize(query)).forEach((token) => {
+    const matches = state.postings.get(token);
+    if (!matches) {
+      return;
+    }
+
+    const idf = Math.log(1 + (total - matches.length + 0.5) / (matches.length + 0.5));
+    matches.forEach(([index, frequency]) => {
+      const norm = K1 * (1 - B + (B * state.lengths[index]) / state.averageLength);
+      scores.set(index, (scores.get(index) || 0) + (idf * frequency * (K1 + 1)) / (frequency + norm));
+    });
+  });
+
+  return [...scores]
+    .sort((a, b) => b[1] - a[1])
+    .slice(0, limit)
+    .map(([index]) => state.documents[index]);
+};
+
+export const getIndexStats = () => ({
+  documents: state.documents.length,
+  terms: state.postings.size,
+  version: state.version,
+});
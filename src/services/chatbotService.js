@@ -1,92 +1,168 @@
-// CHATBOT SERVICE - CURRENTLY DISABLED
-// Uncomment this code when you want to enable AI chatbot functionality
-
-/*
-import axios from 'axios';
 import logger from '../config/logger.js';
+import ErrorResponse from '../utils/errorResponse.js';
+import LRUCache from '../utils/lruCache.js';
+import { normalizeSearchKey } from '../utils/search.js';
+import { getBackend, localBackend } from './chatbotBackends.js';
+import { ensureIndex, searchIndex } from './chatbotIndex.js';
+
+// Normalized form of a question, so "When is Squid Games?" and
+// "when is squid games" share a cache entry
+export const normalizeQuestion = (message) =>
+  normalizeSearchKey(message.replace(/[^\p{L}\p{N}\s]/gu, ' '));
 
+// Answers questions with the configured model backend (see
+// chatbotBackends.js), grounded in the competitions and categories the
+// retrieval index finds for the question.
+//
+// - Answers are cached per normalized question in an LRU; the key includes
+//   the index version, so a catalog change retires them.
+// - At most CHATBOT_CONCURRENCY answers are generated at once. Up to
+//   CHATBOT_QUEUE_MAX more wait their turn; beyond that callers get a 503.
+// - If a model backend fails before producing any text, the local backend
+//   answers instead. Those answers aren't cached.
 class ChatbotService {
   constructor() {
-    this.apiKey = process.env.OPENAI_API_KEY;
-    this.model = process.env.OPENAI_MODEL || 'gpt-4';
-    this.apiUrl = 'https://api.openai.com/v1/chat/completions';
+    this.cache = null;
+    this.active = 0;
+    this.queue = [];
+    this.metrics = {
+      answered: 0,
+      cached: 0,
+      fallback: 0,
+      rejected: 0,
+      failed: 0,
+    };
   }
 
-  async getResponse(message) {
-    try {
-      if (!this.apiKey || this.apiKey === 'your_openai_api_key_here') {
-        // Return placeholder response if API key not configured
-        return this.getPlaceholderResponse(message);
-      }
+  get concurrency() {
+    return parseInt(process.env.CHATBOT_CONCURRENCY) || 4;
+  }
 
-      const response = await axios.post(
-        this.apiUrl,
-        {
-          model: this.model,
-          messages: [
-            {
-              role: 'system',
-              content:
-                'You are a helpful assistant for Taakra, a competition management platform. Help users with questions about competitions, registrations, and event details.',
-            },
-            {
-              role: 'user',
-              content: message,
-            },
-          ],
-          max_tokens: 500,
-          temperature: 0.7,
-        },
-        {
-          headers: {
-            'Content-Type': 'application/json',
-            Authorization: `Bearer ${this.apiKey}`,
-          },
-        }
-      );
+  get maxQueue() {
+    return parseInt(process.env.CHATBOT_QUEUE_MAX) || 100;
+  }
 
-      return response.data.choices[0].message.content;
-    } catch (error) {
-      logger.error('Chatbot service error:', error.message);
-      return this.getPlaceholderResponse(message);
+  get depth() {
+    return this.queue.length;
+  }
+
+  getCache() {
+    if (!this.cache) {
+      this.cache = new LRUCache({
+        max: parseInt(process.env.CHATBOT_CACHE_MAX_ENTRIES) || 1000,
+        ttl: (parseInt(process.env.CHATBOT_CACHE_TTL_SECONDS) || 600) * 1000,
+      });
     }
+    return this.cache;
   }
 
-  getPlaceholderResponse(message) {
-    // Placeholder responses for common queries
-    const lowerMessage = message.toLowerCase();
+  // Resolves once a generation slot is free. A caller that aborts while
+  // queued gives up its place.
+  acquire(signal) {
+    signal?.throwIfAborted();
 
-    if (lowerMessage.includes('hello') || lowerMessage.includes('hi')) {
-      return 'Hello! Welcome to Taakra. How can I help you today? You can ask me about competitions, registrations, or any event-related questions.';
+    if (this.active < this.concurrency) {
+      this.active += 1;
+      return Promise.resolve();
     }
 
-    if (lowerMessage.includes('competition')) {
-      return 'Taakra hosts various competitions across different categories. You can browse all competitions, filter by category, and register for the ones that interest you. Would you like to know more about a specific competition?';
+    if (this.queue.length >= this.maxQueue) {
+      this.metrics.rejected += 1;
+      return Promise.reject(new ErrorResponse('Chatbot is busy, please try again shortly', 503));
     }
 
-    if (lowerMessage.includes('register')) {
-      return 'To register for a competition, simply browse the competitions page, find the event you want to participate in, and click the register button. You need to be logged in to register.';
+    return new Promise((resolve, reject) => {
+      const waiter = { resolve, reject };
+      this.queue.push(waiter);
+
+      signal?.addEventListener(
+        'abort',
+        () => {
+          const position = this.queue.indexOf(waiter);
+          if (position !== -1) {
+            this.queue.splice(position, 1);
+            reject(signal.reason);
+          }
+        },
+        { once: true }
+      );
+    });
+  }
+
+  // Hand the slot straight to the next waiter, if any
+  release() {
+    const next = this.queue.shift();
+    if (next) {
+      next.resolve();
+    } else {
+      this.active -= 1;
     }
+  }
 
-    if (lowerMessage.includes('schedule') || lowerMessage.includes('date')) {
-      return 'Taakra runs from February 11-15, 2026. You can view the complete schedule in the calendar view, which shows all competitions organized by day.';
+  // Answer `message`, passing each chunk of text to onToken as it is
+  // produced. Resolves to { message, sources, cached }.
+  async ask(message, { onToken = () => {}, signal } = {}) {
+    const version = await ensureIndex();
+    const key = `${version}:${normalizeQuestion(message)}`;
+
+    const hit = this.getCache().get(key);
+    if (hit) {
+      this.metrics.cached += 1;
+      onToken(hit.message);
+      return { ...hit, cached: true };
     }
 
-    if (lowerMessage.includes('category')) {
-      return 'We have competitions in various categories including Arts, Sports, Technology, Literary, and more. You can filter competitions by category to find events that match your interests.';
+    await this.acquire(signal);
+    try {
+      const sources = searchIndex(message, parseInt(process.env.CHATBOT_CONTEXT_SIZE) || 5);
+      const backend = getBackend();
+      let text = '';
+
+      const generate = async (model) => {
+        for await (const token of model.stream({ message, sources, signal })) {
+          text += token;
+          onToken(token);
+        }
+      };
+
+      let fallback = false;
+      try {
+        await generate(backend);
+      } catch (error) {
+        if (signal?.aborted || backend === localBackend || text) {
+          throw error;
+        }
+        logger.error(`Chatbot backend "${backend.name}" failed, answering locally: ${error.message}`);
+        fallback = true;
+        await generate(localBackend);
+      }
+
+      const answer = { message: text, sources };
+      if (fallback) {
+        this.metrics.fallback += 1;
+      } else {
+        this.metrics.answered += 1;
+        this.getCache().set(key, answer);
+      }
+      return { ...answer, cached: false };
+    } catch (error) {
+      if (!signal?.aborted) {
+        this.metrics.failed += 1;
+      }
+      throw error;
+    } finally {
+      this.release();
     }
+  }
 
-    // Default response
-    return 'Thank you for your message! I\'m here to help with questions about Taakra competitions, registrations, and events. Feel free to ask me anything about our platform. (Note: AI chatbot requires OpenAI API key configuration for advanced responses)';
+  getMetrics() {
+    return {
+      ...this.metrics,
+      active: this.active,
+      queueDepth: this.depth,
+      cacheEntries: this.cache ? this.cache.size : 0,
+    };
   }
 }
 
 export default new ChatbotService();
-*/
-
-// Temporary placeholder export while chatbot is disabled
-export default {
-  getResponse: async () => {
-    return 'Chatbot service is currently disabled. Please contact support for assistance.';
-  }
-};
@@ -0,0 +1,176 @@
+import mongoose from 'mongoose';
+import Conversation from '../models/Conversation.js';
+import ChatMessage from '../models/ChatMessage.js';
+import logger from '../config/logger.js';
+import { getUserProfiles } from './userCache.js';
+import { encodeCursor, decodeCursor, keysetFilter } from '../utils/pagination.js';
+
+const toObjectId = (id) => new mongoose.Types.ObjectId(id.toString());
+
+// Pipeline update that only replaces lastMessage with a newer one, so
+// out-of-order writes can't roll the summary back
+const summaryUpdate = (lastMessage, unreadIncrement) => [
+  {
+    $set: {
+      lastMessage: {
+        $cond: [
+          { $gte: [lastMessage.timestamp, { $ifNull: ['$lastMessage.timestamp', new Date(0)] }] },
+          { $literal: lastMessage },
+          '$lastMessage',
+        ],
+      },
+      unreadCount: { $add: [{ $ifNull: ['$unreadCount', 0] }, unreadIncrement] },
+      createdAt: { $ifNull: ['$createdAt', '$$NOW'] },
+      updatedAt: '$$NOW',
+    },
+  },
+];
+
+// Update both participants' summaries for a sent message. Never throws -
+// the message itself is already delivered.
+export const recordMessage = async ({ _id, sender, receiver, message, timestamp }) => {
+  const lastMessage = { _id, sender: toObjectId(sender), message, timestamp };
+
+  try {
+    await Conversation.bulkWrite(
+      [
+        {
+          updateOne: {
+            filter: { owner: toObjectId(sender), peer: toObjectId(receiver) },
+            update: summaryUpdate(lastMessage, 0),
+            upsert: true,
+            timestamps: false,
+          },
+        },
+        {
+          updateOne: {
+            filter: { owner: toObjectId(receiver), peer: toObjectId(sender) },
+            update: summaryUpdate(lastMessage, 1),
+            upsert: true,
+            timestamps: false,
+          },
+        },
+      ],
+      { ordered: false }
+    );
+  } catch (error) {
+    logger.error(`Conversation summary update failed: ${error.message}`);
+  }
+};
+
+export const markConversationRead = async (owner, peer) => {
+  try {
+    await Conversation.updateOne(
+      { owner, peer, unreadCount: { $gt: 0 } },
+      { $set: { unreadCount: 0 } }
+    );
+  } catch (error) {
+    logger.error(`Failed to mark conversation read: ${error.message}`);
+  }
+};
+
+// Users whose summaries were checked against history in this process
+const backfilled = new Set();
+
+// Build summaries from message history for peers a user chatted with
+// before summaries existed. Peers that already have one (e.g. from a
+// message sent since) are left alone. Runs at most once per user per process.
+const backfillConversations = async (owner) => {
+  const key = owner.toString();
+  if (backfilled.has(key)) {
+    return;
+  }
+
+  const [history, existingPeers] = await Promise.all([
+    ChatMessage.aggregate([
+      { $match: { $or: [{ sender: owner }, { receiver: owner }] } },
+      { $sort: { timestamp: -1 } },
+      {
+        $group: {
+          _id: { $cond: [{ $eq: ['$sender', owner] }, '$receiver', '$sender'] },
+          lastMessage: { $first: '$$ROOT' },
+        },
+      },
+    ]),
+    Conversation.distinct('peer', { owner }),
+  ]);
+
+  const existing = new Set(existingPeers.map((peer) => peer.toString()));
+  const missing = history.filter(({ _id: peer }) => !existing.has(peer.toString()));
+
+  if (missing.length > 0) {
+    // $setOnInsert, so a summary written by recordMessage in the meantime wins
+    await Conversation.bulkWrite(
+      missing.map(({ _id: peer, lastMessage }) => ({
+        updateOne: {
+          filter: { owner, peer },
+          update: {
+            $setOnInsert: {
+              lastMessage: {
+                _id: lastMessage._id,
+                sender: lastMessage.sender,
+                message: lastMessage.message,
+                timestamp: lastMessage.timestamp,
+              },
+              unreadCount: 0,
+            },
+          },
+          upsert: true,
+        },
+      })),
+      { ordered: false }
+    );
+    logger.info(`Backfilled ${missing.length} conversation summaries for ${key}`);
+  }
+
+  backfilled.add(key);
+};
+
+// Inbox for a user, newest conversation first
+export const listConversations = async (owner, { limit, cursor }) => {
+  await backfillConversations(owner);
+
+  const query = { owner };
+  if (cursor) {
+    Object.assign(query, keysetFilter('lastMessage.timestamp', -1, decodeCursor(cursor)));
+  }
+
+  const summaries = await Conversation.find(query)
+    .sort({ 'lastMessage.timestamp': -1, _id: -1 })
+    .limit(limit + 1)
+    .lean();
+
+  const hasMore = summaries.length > limit;
+  if (hasMore) {
+    summaries.pop();
+  }
+
+  const profiles = await getUserProfiles(summaries.map((s) => s.peer));
+
+  const conversations = summaries
+    .map((summary, index) => ({
+      _id: summary.peer,
+      user: profiles[index],
+      lastMessage: {
+        message: summary.lastMessage.message,
+        timestamp: summary.lastMessage.timestamp,
+        sender: summary.lastMessage.sender,
+      },
+      unreadCount: summary.unreadCount,
+    }))
+    // Deleted users drop out of the inbox, as with the old $lookup
+    .filter((conversation) => conversation.user);
+
+  const last = summaries[summaries.length - 1];
+
+  return {
+    conversations,
+    pagination: {
+      limit,
+      hasMore,
+      nextCursor: hasMore
+        ? encodeCursor({ _id: last._id, timestamp: last.lastMessage.timestamp }, 'timestamp')
+        : null,
+    },
+  };
+};
@@ -0,0 +1,92 @@
+import User from '../models/User.js';
+import Competition from '../models/Competition.js';
+import Category from '../models/Category.js';
+
+// Same filters as GET /api/registrations
+export const buildRegistrationFilter = ({ competition, status }) => {
+  const query = {};
+
+  if (competition) {
+    query.competition = competition;
+  }
+
+  if (status) {
+    query.status = status;
+  }
+
+  return query;
+};
+
+export const REGISTRATION_COLUMNS = [
+  ['id', (row) => row._id],
+  ['status', (row) => row.status],
+  ['registeredAt', (row) => row.createdAt],
+  ['userId', (row) => row.user && row.user._id],
+  ['userName', (row) => row.user && row.user.name],
+  ['userEmail', (row) => row.user && row.user.email],
+  ['competitionId', (row) => row.competition && row.competition._id],
+  ['competitionTitle', (row) => row.competition && row.competition.title],
+  ['category', (row) => row.competition && row.competition.category && row.competition.category.name],
+];
+
+export const USER_COLUMNS = [
+  ['id', (row) => row._id],
+  ['name', (row) => row.name],
+  ['email', (row) => row.email],
+  ['role', (row) => row.role],
+  ['createdAt', (row) => row.createdAt],
+];
+
+const uniqueIds = (ids) => [...new Set(ids.filter(Boolean).map((id) => id.toString()))];
+
+// Returns a resolver that fills in user and competition (with category)
+// for a batch of lean registrations using one query per collection.
+// Competitions are few and repeat across batches, so they are kept for the
+// whole export; users are looked up per batch.
+export const createRegistrationResolver = () => {
+  const competitions = new Map();
+
+  const loadCompetitions = async (ids) => {
+    const missing = ids.filter((id) => !competitions.has(id));
+    if (missing.length === 0) {
+      return;
+    }
+
+    const docs = await Competition.find({ _id: { $in: missing } })
+      .select('title startDate endDate venue category categoryName')
+      .lean();
+
+    // categoryName is denormalized; fall back to Category for older documents
+    const unnamed = uniqueIds(docs.filter((c) => !c.categoryName).map((c) => c.category));
+    const categoryNames = new Map();
+    if (unnamed.length > 0) {
+      const categories = await Category.find({ _id: { $in: unnamed } }).select('name').lean();
+      categories.forEach((c) => categoryNames.set(c._id.toString(), c.name));
+    }
+
+    docs.forEach(({ categoryName, category, ...competition }) => {
+      competitions.set(competition._id.toString(), {
+        ...competition,
+        category: category
+          ? { _id: category, name: categoryName || categoryNames.get(category.toString()) || null }
+          : null,
+      });
+    });
+  };
+
+  return async (registrations) => {
+    const userIds = uniqueIds(registrations.map((r) => r.user));
+    const [users] = await Promise.all([
+      User.find({ _id: { $in: userIds } }).select('name email').lean(),
+      loadCompetitions(uniqueIds(registrations.map((r) => r.competition))),
+    ]);
+
+    const userById = new Map(users.map((u) => [u._id.toString(), u]));
+
+    return registrations.map((registration) => ({
+      ...registration,
+      user: userById.get(registration.user.toString()) || null,
+      competition: competitions.get(registration.competition.toString()) || null,
+    }));
+  };
+};
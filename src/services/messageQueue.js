@@ -0,0 +1,155 @@
+import ChatMessage from '../models/ChatMessage.js';
+import logger from '../config/logger.js';
+
+const MAX_FLUSH_ATTEMPTS = 3;
+
+// Write-behind buffer for chat messages. Documents arrive fully built and
+// validated (with their _id), get emitted right away, and are persisted in
+// batches with insertMany. Enabled with CHAT_WRITE_BEHIND=true.
+class MessageWriteQueue {
+  constructor() {
+    this.buffer = [];
+    this.timer = null;
+    this.flushing = null;
+    this.metrics = {
+      enqueued: 0,
+      flushes: 0,
+      flushedMessages: 0,
+      failedFlushes: 0,
+      droppedMessages: 0,
+      lastFlushMs: 0,
+      totalFlushMs: 0,
+      maxFlushMs: 0,
+    };
+  }
+
+  get enabled() {
+    return process.env.CHAT_WRITE_BEHIND === 'true';
+  }
+
+  get batchSize() {
+    return parseInt(process.env.CHAT_QUEUE_BATCH_SIZE) || 200;
+  }
+
+  get maxDepth() {
+    return parseInt(process.env.CHAT_QUEUE_MAX_DEPTH) || 10000;
+  }
+
+  get depth() {
+    return this.buffer.length;
+  }
+
+  start() {
+    if (!this.enabled || this.timer) {
+      return;
+    }
+
+    const interval = parseInt(process.env.CHAT_QUEUE_FLUSH_MS) || 250;
+    this.timer = setInterval(() => this.flush(), interval);
+    this.timer.unref();
+    logger.info(`Chat write-behind queue enabled (flush every ${interval}ms)`);
+  }
+
+  // Persist a message. Returns once it is queued, or - when the queue is
+  // disabled or full - once it is written, so callers never lose a message
+  // to an unbounded backlog.
+  async persist(doc) {
+    if (!this.enabled || this.buffer.length >= this.maxDepth) {
+      await ChatMessage.create(doc);
+      return;
+    }
+
+    this.buffer.push({ doc, attempts: 0 });
+    this.metrics.enqueued += 1;
+
+    if (this.buffer.length >= this.batchSize) {
+      this.flush();
+    }
+  }
+
+  flush() {
+    // One flush at a time; callers awaiting flush() share it
+    if (this.flushing || this.buffer.length === 0) {
+      return this.flushing || Promise.resolve();
+    }
+
+    const batch = this.buffer.splice(0, this.batchSize);
+
+    this.flushing = this.write(batch).finally(() => {
+      this.flushing = null;
+    });
+    return this.flushing;
+  }
+
+  async write(batch) {
+    const started = Date.now();
+
+    try {
+      // Documents were validated when they were built
+      await ChatMessage.insertMany(
+        batch.map((entry) => entry.doc),
+        { ordered: false, lean: true }
+      );
+      this.metrics.flushedMessages += batch.length;
+    } catch (error) {
+      this.metrics.failedFlushes += 1;
+
+      // With ordered:false only the documents listed in writeErrors failed.
+      // A duplicate key means an earlier attempt already stored it.
+      const writeErrors = [].concat(error.writeErrors || []);
+      const failed = writeErrors.length > 0
+        ? writeErrors
+            .filter((e) => e.code !== 11000)
+            .map((e) => batch[e.index])
+        : batch;
+      this.metrics.flushedMessages += batch.length - failed.length;
+
+      const requeue = [];
+      failed.forEach((entry) => {
+        entry.attempts += 1;
+        if (entry.attempts >= MAX_FLUSH_ATTEMPTS) {
+          this.metrics.droppedMessages += 1;
+        } else {
+          requeue.push(entry);
+        }
+      });
+      this.buffer.unshift(...requeue);
+
+      logger.error(
+        `Chat queue flush failed (${failed.length} messages, ${requeue.length} requeued): ${error.message}`
+      );
+    }
+
+    const elapsed = Date.now() - started;
+    this.metrics.flushes += 1;
+    this.metrics.lastFlushMs = elapsed;
+    this.metrics.totalFlushMs += elapsed;
+    this.metrics.maxFlushMs = Math.max(this.metrics.maxFlushMs, elapsed);
+  }
+
+  // Drain everything, e.g. on shutdown
+  async stop() {
+    clearInterval(this.timer);
+    this.timer = null;
+
+    let attempts = 0;
+    while (this.buffer.length > 0 && attempts < MAX_FLUSH_ATTEMPTS * 2) {
+      await this.flush();
+      attempts += 1;
+    }
+  }
+
+  getMetrics() {
+    const { flushes, totalFlushMs } = this.metrics;
+    return {
+      enabled: this.enabled,
+      depth: this.buffer.length,
+      ...this.metrics,
+      avgFlushMs: flushes > 0 ? totalFlushMs / flushes : 0,
+    };
+  }
+}
+
+const messageQueue = new MessageWriteQueue();
+
+export default messageQueue;
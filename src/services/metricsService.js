@@ -0,0 +1,88 @@
+import { monitorEventLoopDelay } from 'perf_hooks';
+import { registry } from '../config/metrics.js';
+import { cache } from '../config/cache.js';
+import { getUserCacheStats } from './userCache.js';
+import messageQueue from './messageQueue.js';
+import passwordPool from './passwordPool.js';
+import chatbotService from './chatbotService.js';
+
+// Event-loop delay sampled every 10ms; percentiles are reset on each
+// scrape so they describe the interval since the previous one
+const loopDelay = monitorEventLoopDelay({ resolution: 10 });
+loopDelay.enable();
+
+const NS_PER_SECOND = 1e9;
+
+registry.gauge('nodejs_eventloop_lag_seconds', 'Event-loop delay since the last scrape', (gauge) => {
+  gauge.set({ quantile: '0.5' }, loopDelay.percentile(50) / NS_PER_SECOND);
+  gauge.set({ quantile: '0.99' }, loopDelay.percentile(99) / NS_PER_SECOND);
+  gauge.set({ quantile: '1' }, loopDelay.max / NS_PER_SECOND);
+  loopDelay.reset();
+});
+
+registry.gauge('process_resident_memory_bytes', 'Resident memory size', (gauge) => {
+  gauge.set({}, process.memoryUsage.rss());
+});
+
+registry.gauge('nodejs_heap_used_bytes', 'V8 heap in use', (gauge) => {
+  gauge.set({}, process.memoryUsage().heapUsed);
+});
+
+// Hit and miss totals from the response cache and the user cache
+const cacheCounter = (outcome) => (counter) => {
+  const response = cache.stats();
+  const users = getUserCacheStats();
+  counter.set({ cache: 'response', backend: response.backend }, response[outcome]);
+  counter.set({ cache: 'users', backend: 'memory' }, users[outcome]);
+};
+
+registry.counter('cache_hits_total', 'Cache lookups that found an entry', cacheCounter('hits'));
+registry.counter('cache_misses_total', 'Cache lookups that missed', cacheCounter('misses'));
+
+registry.gauge('user_cache_entries', 'Users held in the principal cache', (gauge) => {
+  gauge.set({}, getUserCacheStats().size);
+});
+
+registry.gauge('chat_queue_depth', 'Chat messages waiting in the write-behind queue', (gauge) => {
+  gauge.set({}, messageQueue.depth);
+});
+
+registry.counter('chat_queue_flushed_messages_total', 'Chat messages persisted by the write-behind queue', (counter) => {
+  counter.set({}, messageQueue.getMetrics().flushedMessages);
+});
+
+registry.counter('chat_queue_dropped_messages_total', 'Chat messages dropped after repeated flush failures', (counter) => {
+  counter.set({}, messageQueue.getMetrics().droppedMessages);
+});
+
+registry.gauge('password_pool_queue_depth', 'bcrypt jobs waiting for a password worker', (gauge) => {
+  gauge.set({}, passwordPool.depth);
+});
+
+registry.gauge('password_pool_busy_workers', 'Password workers running a bcrypt job', (gauge) => {
+  gauge.set({}, passwordPool.busy);
+});
+
+registry.counter('password_pool_jobs_total', 'bcrypt jobs by outcome', (counter) => {
+  const metrics = passwordPool.getMetrics();
+  counter.set({ outcome: 'completed' }, metrics.completed);
+  counter.set({ outcome: 'failed' }, metrics.failed);
+  counter.set({ outcome: 'rejected' }, metrics.rejected);
+});
+
+registry.gauge('chatbot_queue_depth', 'Chatbot questions waiting for a generation slot', (gauge) => {
+  gauge.set({}, chatbotService.depth);
+});
+
+registry.gauge('chatbot_active_requests', 'Chatbot answers being generated', (gauge) => {
+  gauge.set({}, chatbotService.active);
+});
+
+registry.counter('chatbot_requests_total', 'Chatbot questions by outcome', (counter) => {
+  const metrics = chatbotService.getMetrics();
+  ['answered', 'cached', 'fallback', 'rejected', 'failed'].forEach((outcome) => {
+    counter.set({ outcome }, metrics[outcome]);
+  });
+});
+
+export const renderMetrics = () => registry.render();
@@ -0,0 +1,155 @@
+import os from 'os';
+import { Worker } from 'worker_threads';
+import bcrypt from 'bcryptjs';
+import logger from '../config/logger.js';
+import ErrorResponse from '../utils/errorResponse.js';
+
+const WORKER_URL = new URL('./passwordWorker.js', import.meta.url);
+
+// Worker-thread pool for bcrypt. A hash or compare costs tens of
+// milliseconds of CPU; on the main thread a login burst would stall every
+// other request. Jobs beyond PASSWORD_QUEUE_MAX are rejected with a 503
+// instead of piling up. PASSWORD_POOL_SIZE=0 runs bcrypt in-process.
+class PasswordPool {
+  constructor() {
+    this.workers = []; // { worker, job }
+    this.queue = [];
+    this.jobs = 0;
+    this.metrics = {
+      completed: 0,
+      rejected: 0,
+      failed: 0,
+      totalWaitMs: 0,
+      maxQueueDepth: 0,
+    };
+  }
+
+  get size() {
+    const configured = parseInt(process.env.PASSWORD_POOL_SIZE);
+    if (configured >= 0) {
+      return configured;
+    }
+    return Math.max(1, Math.min(4, os.availableParallelism() - 1));
+  }
+
+  get maxQueue() {
+    return parseInt(process.env.PASSWORD_QUEUE_MAX) || 200;
+  }
+
+  get depth() {
+    return this.queue.length;
+  }
+
+  get busy() {
+    return this.workers.filter((slot) => slot.job).length;
+  }
+
+  hash(password, rounds = 10) {
+    if (this.size === 0) {
+      return bcrypt.hash(password, rounds);
+    }
+    return this.submit({ op: 'hash', password, rounds });
+  }
+
+  compare(password, hash) {
+    if (this.size === 0) {
+      return bcrypt.compare(password, hash);
+    }
+    return this.submit({ op: 'compare', password, hash });
+  }
+
+  submit(task) {
+    if (this.queue.length >= this.maxQueue) {
+      this.metrics.rejected += 1;
+      return Promise.reject(new ErrorResponse('Server is busy, please try again shortly', 503));
+    }
+
+    return new Promise((resolve, reject) => {
+      this.jobs += 1;
+      this.queue.push({ ...task, id: this.jobs, resolve, reject, queuedAt: Date.now() });
+      this.metrics.maxQueueDepth = Math.max(this.metrics.maxQueueDepth, this.queue.length);
+      this.dispatch();
+    });
+  }
+
+  // Hand queued jobs to idle workers, starting workers up to `size`
+  dispatch() {
+    while (this.queue.length > 0) {
+      let slot = this.workers.find((candidate) => !candidate.job);
+      if (!slot && this.workers.length < this.size) {
+        slot = this.spawn();
+      }
+      if (!slot) {
+        return;
+      }
+
+      const job = this.queue.shift();
+      this.metrics.totalWaitMs += Date.now() - job.queuedAt;
+      slot.job = job;
+      slot.worker.ref();
+      slot.worker.postMessage({
+        id: job.id,
+        op: job.op,
+        password: job.password,
+        hash: job.hash,
+        rounds: job.rounds,
+      });
+    }
+  }
+
+  spawn() {
+    const slot = { worker: new Worker(WORKER_URL), job: null };
+
+    slot.worker.on('message', ({ id, result, error }) => {
+      const { job } = slot;
+      slot.job = null;
+      slot.worker.unref();
+      if (job && job.id === id) {
+        if (error) {
+          this.metrics.failed += 1;
+          job.reject(new Error(error));
+        } else {
+          this.metrics.completed += 1;
+          job.resolve(result);
+        }
+      }
+      this.dispatch();
+    });
+
+    // A crashed worker fails its current job and is replaced on demand
+    slot.worker.on('error', (error) => {
+      logger.error(`Password worker crashed: ${error.message}`);
+    });
+    slot.worker.on('exit', () => {
+      this.workers = this.workers.filter((candidate) => candidate !== slot);
+      if (slot.job) {
+        this.metrics.failed += 1;
+        slot.job.reject(new Error('Password worker exited'));
+        slot.job = null;
+      }
+      this.dispatch();
+    });
+
+    // Only workers with a job keep the process alive
+    slot.worker.unref();
+    this.workers.push(slot);
+    return slot;
+  }
+
+  getMetrics() {
+    return {
+      ...this.metrics,
+      workers: this.workers.length,
+      busy: this.busy,
+      queueDepth: this.depth,
+    };
+  }
+}
+
+const passwordPool = new PasswordPool();
+
+export const hashPassword = (password, rounds) => passwordPool.hash(password, rounds);
+
+export const verifyPassword = (password, hash) => passwordPool.compare(password, hash);
+
+export default passwordPool;
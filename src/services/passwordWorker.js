@@ -0,0 +1,16 @@
+import { parentPort } from 'worker_threads';
+import bcrypt from 'bcryptjs';
+
+// Runs bcrypt off the main thread for passwordPool.js. The synchronous
+// calls only block this worker.
+parentPort.on('message', ({ id, op, password, hash, rounds }) => {
+  try {
+    const result =
+      op === 'hash'
+        ? bcrypt.hashSync(password, bcrypt.genSaltSync(rounds))
+        : bcrypt.compareSync(password, hash);
+    parentPort.postMessage({ id, result });
+  } catch (error) {
+    parentPort.postMessage({ id, error: error.message });
+  }
+});
@@ -0,0 +1,269 @@
+import Registration from '../models/Registration.js';
+import Competition from '../models/Competition.js';
+import User from '../models/User.js';
+import ErrorResponse from '../utils/errorResponse.js';
+import { withTransaction } from '../config/database.js';
+import { recordRegistration } from './statsService.js';
+
+const DUPLICATE_KEY = 11000;
+
+// Register one user: an atomic $inc of the competition counter, which
+// also proves the competition exists, then an upsert against the unique
+// { user, competition } index. Two round trips, no read-modify-write, and
+// no registration is ever written for a missing competition. The $inc
+// also stamps lastRegisteredAt, which `sort=trending` orders by.
+export const registerUser = async (userId, competitionId) => {
+  const { registration, category } = await withTransaction(async (session) => {
+    const competition = await Competition.findOneAndUpdate(
+      { _id: competitionId },
+      { $inc: { registrationsCount: 1 }, $set: { lastRegisteredAt: new Date() } },
+      { projection: { category: 1 }, session }
+    ).lean();
+
+    if (!competition) {
+      throw new ErrorResponse('Competition not found', 404);
+    }
+
+    // Give the count back when no registration was created. Without a
+    // transaction there is nothing to roll back for us.
+    const undoIncrement = async () => {
+      if (!session) {
+        await Competition.updateOne(
+          { _id: competitionId, registrationsCount: { $gt: 0 } },
+          { $inc: { registrationsCount: -1 } }
+        );
+      }
+    };
+
+    let result;
+    try {
+      result = await Registration.findOneAndUpdate(
+        { user: userId, competition: competitionId },
+        { $setOnInsert: { status: 'pending' } },
+        { upsert: true, returnDocument: 'after', includeResultMetadata: true, session }
+      );
+    } catch (error) {
+      await undoIncrement();
+      // Lost an upsert race against a concurrent request for the same pair
+      if (error.code === DUPLICATE_KEY) {
+        throw new ErrorResponse('You are already registered for this competition', 400);
+      }
+      throw error;
+    }
+
+    if (result.lastErrorObject.updatedExisting) {
+      await undoIncrement();
+      throw new ErrorResponse('You are already registered for this competition', 400);
+    }
+
+    return { registration: result.value, category: competition.category };
+  });
+
+  // Outside the transaction so a retried transaction can't count twice
+  recordRegistration({
+    category,
+    status: registration.status,
+    createdAt: registration.createdAt,
+  });
+
+  return registration;
+};
+
+// Remove a registration and decrement its competition counter.
+// Non-admins can only remove their own registrations.
+export const unregister = async (registrationId, user) => {
+  const filter = { _id: registrationId };
+  if (user.role !== 'admin') {
+    filter.user = user._id;
+  }
+
+  const { registration, category } = await withTransaction(async (session) => {
+    const registration = await Registration.findOneAndDelete(filter, { session }).lean();
+
+    if (!registration) {
+      const exists = await Registration.exists({ _id: registrationId }).session(session);
+      throw exists
+        ? new ErrorResponse('Not authorized to delete this registration', 403)
+        : new ErrorResponse('Registration not found', 404);
+    }
+
+    const competition = await Competition.findOneAndUpdate(
+      { _id: registration.competition, registrationsCount: { $gt: 0 } },
+      { $inc: { registrationsCount: -1 } },
+      { projection: { category: 1 }, session }
+    ).lean();
+
+    return { registration, category: competition && competition.category };
+  });
+
+  recordRegistration(
+    { category, status: registration.status, createdAt: registration.createdAt },
+    -1
+  );
+
+  return registration;
+};
+
+const deleteNext = (userId, session) =>
+  Registration.findOneAndDelete(
+    { user: userId },
+    { projection: { competition: 1, status: 1, createdAt: 1 }, session }
+  ).lean();
+
+// Remove every registration of a deleted user. Registrations are deleted
+// one findOneAndDelete at a time, so only documents this call actually
+// removed are counted - one that a concurrent unregister got first isn't
+// given back twice. Competition counters are then given back with one
+// bulk $inc, the stats counters per registration.
+export const unregisterAll = async (userId) => {
+  const { registrations, categoryById } = await withTransaction(async (session) => {
+    const registrations = [];
+    let registration = await deleteNext(userId, session);
+    while (registration) {
+      registrations.push(registration);
+      registration = await deleteNext(userId, session);
+    }
+
+    if (registrations.length === 0) {
+      return { registrations, categoryById: new Map() };
+    }
+
+    const decrements = new Map();
+    registrations.forEach(({ competition }) => {
+      const id = competition.toString();
+      decrements.set(id, (decrements.get(id) || 0) + 1);
+    });
+
+    // Guarded like unregister(), so a drifted counter never goes negative
+    await Competition.bulkWrite(
+      [...decrements].map(([competition, count]) => ({
+        updateOne: {
+          filter: { _id: competition, registrationsCount: { $gte: count } },
+          update: { $inc: { registrationsCount: -count } },
+        },
+      })),
+      { ordered: false, session }
+    );
+
+    const competitions = await Competition.find({ _id: { $in: [...decrements.keys()] } })
+      .select('category')
+      .session(session)
+      .lean();
+
+    return {
+      registrations,
+      categoryById: new Map(competitions.map((c) => [c._id.toString(), c.category])),
+    };
+  });
+
+  registrations.forEach(({ competition, status, createdAt }) =>
+    recordRegistration(
+      { category: categoryById.get(competition.toString()), status, createdAt },
+      -1
+    )
+  );
+
+  return registrations.length;
+};
+
+// Register every user in `userIds` for every competition in
+// `competitionIds` with a fixed number of round trips, whatever the batch
+// size: validate ids, one unordered bulk upsert, one bulk $inc.
+export const registerMany = async (userIds, competitionIds) => {
+  const { created, skipped, byCategory } = await withTransaction(async (session) => {
+    const [competitions, users] = await Promise.all([
+      Competition.find({ _id: { $in: competitionIds } })
+        .select('category')
+        .session(session)
+        .lean(),
+      User.find({ _id: { $in: userIds } })
+        .select('_id')
+        .session(session)
+        .lean(),
+    ]);
+
+    const competitionById = new Map(competitions.map((c) => [c._id.toString(), c]));
+    const knownUsers = new Set(users.map((u) => u._id.toString()));
+
+    const skipped = [];
+    const pairs = [];
+
+    userIds.forEach((user) => {
+      competitionIds.forEach((competition) => {
+        if (!knownUsers.has(user)) {
+          skipped.push({ user, competition, reason: 'User not found' });
+        } else if (!competitionById.has(competition)) {
+          skipped.push({ user, competition, reason: 'Competition not found' });
+        } else {
+          pairs.push({ user, competition });
+        }
+      });
+    });
+
+    if (pairs.length === 0) {
+      return { created: [], skipped, byCategory: new Map() };
+    }
+
+    let result;
+    try {
+      result = await Registration.bulkWrite(
+        pairs.map(({ user, competition }) => ({
+          updateOne: {
+            filter: { user, competition },
+            update: { $setOnInsert: { status: 'pending' } },
+            upsert: true,
+          },
+        })),
+        { ordered: false, session }
+      );
+    } catch (error) {
+      // Outside a transaction, duplicate-key races still leave the other
+      // upserts applied; inside one, any write error aborts the batch
+      const onlyDuplicates =
+        error.result && [].concat(error.writeErrors || []).every((e) => e.code === DUPLICATE_KEY);
+      if (!onlyDuplicates || session) {
+        throw error;
+      }
+      result = error.result;
+    }
+
+    const upsertedIds = result.upsertedIds || {};
+    const created = [];
+    const increments = new Map();
+    const byCategory = new Map();
+
+    pairs.forEach((pair, index) => {
+      const id = upsertedIds[index];
+      if (!id) {
+        skipped.push({ ...pair, reason: 'Already registered' });
+        return;
+      }
+      created.push({ _id: id, ...pair, status: 'pending' });
+      increments.set(pair.competition, (increments.get(pair.competition) || 0) + 1);
+    });
+
+    if (increments.size > 0) {
+      const registeredAt = new Date();
+      await Competition.bulkWrite(
+        [...increments].map(([competition, count]) => ({
+          updateOne: {
+            filter: { _id: competition },
+            update: { $inc: { registrationsCount: count }, $set: { lastRegisteredAt: registeredAt } },
+          },
+        })),
+        { ordered: false, session }
+      );
+
+      increments.forEach((count, competition) => {
+        const category = competitionById.get(competition).category.toString();
+        byCategory.set(category, (byCategory.get(category) || 0) + count);
+      });
+    }
+
+    return { created, skipped, byCategory };
+  });
+
+  byCategory.forEach((count, category) => recordRegistration({ category }, count));
+
+  return { created, skipped };
+};
@@ -0,0 +1,183 @@
+import AdminStats from '../models/AdminStats.js';
+import User from '../models/User.js';
+import Category from '../models/Category.js';
+import Competition from '../models/Competition.js';
+import Registration from '../models/Registration.js';
+import logger from '../config/logger.js';
+import { withCatalogReads } from '../config/database.js';
+
+const STATS_ID = 'global';
+const TOP_COMPETITIONS = 10;
+
+const dayKey = (date = new Date()) => new Date(date).toISOString().slice(0, 10);
+
+// Apply an $inc to the stats document. Never throws - a lost update is
+// corrected by the next reconciliation, it must not fail the request.
+// No upsert: until the first reconciliation creates the document there is
+// nothing meaningful to increment.
+const increment = async (inc) => {
+  try {
+    await AdminStats.updateOne({ _id: STATS_ID }, { $inc: inc });
+  } catch (error) {
+    logger.error(`Stats update failed: ${error.message}`);
+  }
+};
+
+export const recordUserCreated = () => increment({ totalUsers: 1 });
+
+export const recordUserDeleted = () => increment({ totalUsers: -1 });
+
+export const recordCompetitionCreated = () => increment({ totalCompetitions: 1 });
+
+export const recordCompetitionDeleted = () => increment({ totalCompetitions: -1 });
+
+// delta is +1 for a new registration, -1 for a removed one
+export const recordRegistration = ({ category, status = 'pending', createdAt }, delta = 1) =>
+  increment({
+    totalRegistrations: delta,
+    [`byStatus.${status}`]: delta,
+    ...(category && { [`byCategory.${category}`]: delta }),
+    [`byDay.${dayKey(createdAt)}`]: delta,
+  });
+
+export const recordStatusChange = (from, to) =>
+  increment({ [`byStatus.${from}`]: -1, [`byStatus.${to}`]: 1 });
+
+const toCountMap = (rows) =>
+  Object.fromEntries(rows.filter((row) => row._id != null).map((row) => [String(row._id), row.count]));
+
+// Recompute every counter from the source collections and re-sync the
+// per-competition registrationsCount the top-N table is read from
+export const reconcileStats = async () => {
+  const started = Date.now();
+
+  const [totalUsers, totalCompetitions, totalRegistrations, byStatus, byCategory, byDay, byCompetition] =
+    await Promise.all([
+      User.countDocuments(),
+      Competition.countDocuments(),
+      Registration.countDocuments(),
+      Registration.aggregate([{ $group: { _id: '$status', count: { $sum: 1 } } }]),
+      Registration.aggregate([
+        { $group: { _id: '$competition', count: { $sum: 1 } } },
+        {
+          $lookup: {
+            from: 'competitions',
+            localField: '_id',
+            foreignField: '_id',
+            as: 'competition',
+          },
+        },
+        { $unwind: '$competition' },
+        { $group: { _id: '$competition.category', count: { $sum: '$count' } } },
+      ]),
+      Registration.aggregate([
+        {
+          $group: {
+            _id: { $dateToString: { format: '%Y-%m-%d', date: '$createdAt' } },
+            count: { $sum: 1 },
+          },
+        },
+      ]),
+      Registration.aggregate([{ $group: { _id: '$competition', count: { $sum: 1 } } }]),
+    ]);
+
+  await AdminStats.replaceOne(
+    { _id: STATS_ID },
+    {
+      totalUsers,
+      totalCompetitions,
+      totalRegistrations,
+      byStatus: toCountMap(byStatus),
+      byCategory: toCountMap(byCategory),
+      byDay: toCountMap(byDay),
+      reconciledAt: new Date(),
+    },
+    { upsert: true }
+  );
+
+  // Fix drifted counters only: competitions whose stored count differs
+  const counts = new Map(byCompetition.map((row) => [String(row._id), row.count]));
+  const drifted = await Competition.find({
+    $or: [
+      { _id: { $in: byCompetition.map((row) => row._id) } },
+      { registrationsCount: { $gt: 0 } },
+    ],
+  })
+    .select('registrationsCount')
+    .lean();
+
+  const fixes = drifted
+    .filter((c) => (counts.get(String(c._id)) || 0) !== c.registrationsCount)
+    .map((c) => ({
+      updateOne: {
+        filter: { _id: c._id },
+        update: { $set: { registrationsCount: counts.get(String(c._id)) || 0 } },
+        timestamps: false,
+      },
+    }));
+
+  if (fixes.length > 0) {
+    await Competition.bulkWrite(fixes, { ordered: false });
+  }
+
+  logger.info(
+    `Stats reconciled in ${Date.now() - started}ms (${fixes.length} competition counters corrected)`
+  );
+};
+
+// Dashboard view: one document read plus an index-bounded top-N query
+// Dashboard reads may be served by a secondary (see withCatalogReads);
+// reconciliation itself always reads and writes the primary
+export const getDashboardStats = async () => {
+  let stats = await withCatalogReads(AdminStats.findById(STATS_ID).lean());
+
+  if (!stats) {
+    await reconcileStats();
+    stats = await AdminStats.findById(STATS_ID).lean();
+  }
+
+  const [topCompetitions, categories] = await Promise.all([
+    withCatalogReads(
+      Competition.find({ registrationsCount: { $gt: 0 } })
+        .select('title registrationsCount')
+        .sort({ registrationsCount: -1, _id: -1 })
+        .limit(TOP_COMPETITIONS)
+        .lean()
+    ),
+    withCatalogReads(Category.find().select('name').lean()),
+  ]);
+
+  const categoryNames = new Map(categories.map((c) => [String(c._id), c.name]));
+
+  return {
+    totalUsers: stats.totalUsers,
+    totalCompetitions: stats.totalCompetitions,
+    totalRegistrations: stats.totalRegistrations,
+    registrationsByCompetition: topCompetitions.map((c) => ({
+      _id: c._id,
+      count: c.registrationsCount,
+      competition: { title: c.title },
+    })),
+    registrationsByStatus: stats.byStatus || {},
+    registrationsByCategory: Object.entries(stats.byCategory || {})
+      .map(([id, count]) => ({ _id: id, name: categoryNames.get(id) || null, count }))
+      .sort((a, b) => b.count - a.count),
+    registrationsByDay: Object.entries(stats.byDay || {})
+      .map(([date, count]) => ({ date, count }))
+      .sort((a, b) => a.date.localeCompare(b.date)),
+    reconciledAt: stats.reconciledAt,
+  };
+};
+
+// Reconcile once at startup, then periodically
+export const startStatsReconciliation = (
+  intervalMs = (parseInt(process.env.STATS_RECONCILE_INTERVAL_MINUTES) || 15) * 60 * 1000
+) => {
+  const run = () =>
+    reconcileStats().catch((error) =>
+      logger.error(`Stats reconciliation failed: ${error.message}`)
+    );
+
+  run();
+  return setInterval(run, intervalMs).unref();
+};
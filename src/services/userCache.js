@@ -0,0 +1,102 @@
+import mongoose from 'mongoose';
+import User from '../models/User.js';
+import LRUCache from '../utils/lruCache.js';
+import { broadcast, onBroadcast } from '../config/cluster.js';
+
+let principals = null;
+
+// Loads in progress, so a burst of requests for one user shares a query
+const inflight = new Map();
+
+// Created on first use - modules load before server.js runs dotenv.config()
+const getCache = () => {
+  if (!principals) {
+    principals = new LRUCache({
+      max: parseInt(process.env.USER_CACHE_MAX_ENTRIES) || 10000,
+      ttl: (parseInt(process.env.USER_CACHE_TTL_SECONDS) || 30) * 1000,
+    });
+  }
+  return principals;
+};
+
+const loadUser = (key) => {
+  if (!inflight.has(key)) {
+    inflight.set(
+      key,
+      User.findById(key)
+        .select('-__v')
+        .lean()
+        .finally(() => inflight.delete(key))
+    );
+  }
+  return inflight.get(key);
+};
+
+// The authenticated user as a lean document (password and refresh token
+// are never selected), or null if it doesn't exist. Cached for
+// USER_CACHE_TTL_SECONDS and evicted by invalidateUser() on changes.
+//
+// `claimedRole` is the role in the caller's access token. If it disagrees
+// with the cached role the entry is re-read once, so a role change made
+// on another process is picked up without waiting for the TTL.
+export const getPrincipal = async (userId, claimedRole) => {
+  if (!mongoose.isValidObjectId(userId)) {
+    return null;
+  }
+
+  const key = userId.toString();
+  const cache = getCache();
+  let entry = cache.get(key);
+
+  const roleMismatch =
+    entry && claimedRole && entry.user.role !== claimedRole && entry.checkedRole !== claimedRole;
+
+  if (!entry || roleMismatch) {
+    const user = await loadUser(key);
+    if (!user) {
+      cache.delete(key);
+      return null;
+    }
+    entry = { user, checkedRole: claimedRole };
+    cache.set(key, entry);
+  }
+
+  return entry.user;
+};
+
+// The user behind a verified access token. AUTH_STRICT=true skips the
+// cache and reads the database on every call.
+export const getAuthenticatedUser = (decoded) => {
+  if (process.env.AUTH_STRICT === 'true') {
+    return mongoose.isValidObjectId(decoded.id)
+      ? User.findById(decoded.id).select('-__v').lean()
+      : null;
+  }
+  return getPrincipal(decoded.id, decoded.role);
+};
+
+// { _id, name, email, role } for a user, or null if it doesn't exist
+export const getUserProfile = async (userId) => {
+  const user = await getPrincipal(userId);
+  if (!user) {
+    return null;
+  }
+
+  const { _id, name, email, role } = user;
+  return { _id, name, email, role };
+};
+
+export const getUserProfiles = (userIds) => Promise.all(userIds.map((id) => getUserProfile(id)));
+
+export const invalidateUser = (userId) => {
+  getCache().delete(userId.toString());
+  broadcast('user:invalidate', userId.toString());
+};
+
+// Evictions made by other cluster workers
+onBroadcast('user:invalidate', (userId) => getCache().delete(userId));
+
+export const getUserCacheStats = () => {
+  const cache = getCache();
+  return { size: cache.size, hits: cache.hits, misses: cache.misses };
+};
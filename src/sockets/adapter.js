@@ -0,0 +1,41 @@
+import logger from '../config/logger.js';
+import { isClusterWorker } from '../config/cluster.js';
+
+// Pick the Socket.IO adapter that fans room emits out across processes.
+//   memory  - built-in in-process adapter (default for a single process and tests)
+//   redis   - pub/sub through Redis; needs `npm install redis @socket.io/redis-adapter`
+//   cluster - IPC through the cluster primary (default under cluster.js)
+export const configureSocketAdapter = async (io) => {
+  const driver = process.env.SOCKET_ADAPTER || (isClusterWorker ? 'cluster' : 'memory');
+
+  try {
+    if (driver === 'redis') {
+      const [{ createClient }, { createAdapter }] = await Promise.all([
+        import('redis'),
+        import('@socket.io/redis-adapter'),
+      ]);
+
+      const pubClient = createClient({ url: process.env.REDIS_URL || 'redis://localhost:6379' });
+      const subClient = pubClient.duplicate();
+
+      pubClient.on('error', (err) => logger.error(`Socket adapter Redis error: ${err.message}`));
+      subClient.on('error', (err) => logger.error(`Socket adapter Redis error: ${err.message}`));
+
+      await Promise.all([pubClient.connect(), subClient.connect()]);
+      io.adapter(createAdapter(pubClient, subClient));
+    } else if (driver === 'cluster') {
+      const { createAdapter } = await import('@socket.io/cluster-adapter');
+      io.adapter(createAdapter());
+    } else if (driver !== 'memory') {
+      throw new Error(`Unknown SOCKET_ADAPTER "${driver}"`);
+    }
+
+    logger.info(`Socket.IO adapter: ${driver}`);
+  } catch (error) {
+    logger.error(
+      `Socket.IO adapter "${driver}" unavailable (${error.message}), falling back to in-memory`
+    );
+  }
+};
+
+export default configureSocketAdapter;
@@ -1,14 +1,16 @@
 import ChatMessage from '../models/ChatMessage.js';
-import User from '../models/User.js';
 import { verifyAccessToken } from '../utils/generateToken.js';
 import logger from '../config/logger.js';
-
-// Store connected users
-const connectedUsers = new Map();
+import { getAuthenticatedUser, getUserProfiles } from '../services/userCache.js';
+import messageQueue from '../services/messageQueue.js';
+import { recordMessage } from '../services/conversationService.js';
+import { joinUserRoom, emitToUser, userRoom } from './presence.js';
+import { socketConnections, chatMessagesSent } from '../config/metrics.js';
 
 export const initializeChatSocket = (io) => {
   io.on('connection', (socket) => {
     logger.info(`Socket connected: ${socket.id}`);
+    socketConnections.inc({ state: 'connected' });
 
     // Authenticate socket connection
     socket.on('authenticate', async (token) => {
@@ -21,7 +23,7 @@ export const initializeChatSocket = (io) => {
           return;
         }
 
-        const user = await User.findById(decoded.id);
+        const user = await getAuthenticatedUser(decoded);
 
         if (!user) {
           socket.emit('error', { message: 'User not found' });
@@ -29,9 +31,12 @@ export const initializeChatSocket = (io) => {
           return;
         }
 
-        // Store user connection
-        socket.userId = user._id.toString();
-        connectedUsers.set(socket.userId, socket.id);
+        if (!socket.userId) {
+          socketConnections.inc({ state: 'authenticated' });
+        }
+
+        // Join the user's room (one per user, shared by all their sockets)
+        joinUserRoom(socket, user._id.toString());
 
         socket.emit('authenticated', {
           userId: user._id,
@@ -57,33 +62,48 @@ export const initializeChatSocket = (io) => {
           return;
         }
 
-        // Validate receiver
-        const receiver = await User.findById(receiverId);
+        // Validate receiver (profiles come from the user cache)
+        const [sender, receiver] = await getUserProfiles([socket.userId, receiverId]);
 
         if (!receiver) {
           socket.emit('error', { message: 'Receiver not found' });
           return;
         }
 
-        // Save message to database
-        const chatMessage = await ChatMessage.create({
+        // Build and validate the document up front so it can be
+        // emitted before (or while) it is written
+        const now = new Date();
+        const draft = new ChatMessage({
           sender: socket.userId,
           receiver: receiverId,
           message,
+          timestamp: now,
+          createdAt: now,
+          updatedAt: now,
         });
 
-        // Populate sender and receiver info
-        await chatMessage.populate('sender', 'name email role');
-        await chatMessage.populate('receiver', 'name email role');
-
-        // Send to receiver if online
-        const receiverSocketId = connectedUsers.get(receiverId);
-        if (receiverSocketId) {
-          io.to(receiverSocketId).emit('receiveMessage', chatMessage);
+        const validationError = draft.validateSync();
+        if (validationError) {
+          socket.emit('error', { message: 'Message is required' });
+          return;
         }
 
-        // Send confirmation to sender
-        socket.emit('messageSent', chatMessage);
+        const doc = draft.toObject();
+
+        // Save message to database (queued when write-behind is enabled)
+        await messageQueue.persist(doc);
+
+        // Update both inbox summaries (last message, receiver's unread count)
+        recordMessage(doc);
+
+        const chatMessage = { ...doc, sender, receiver };
+
+        // Deliver to every socket of the receiver, on any process
+        emitToUser(io, receiverId, 'receiveMessage', chatMessage);
+
+        // Confirm to all of the sender's sockets so other tabs stay in sync
+        emitToUser(io, socket.userId, 'messageSent', chatMessage);
+        chatMessagesSent.inc();
 
         logger.info(`Message sent from ${socket.userId} to ${receiverId}`);
       } catch (error) {
@@ -95,10 +115,9 @@ export const initializeChatSocket = (io) => {
     // Handle typing indicator
     socket.on('typing', (data) => {
       const { receiverId } = data;
-      const receiverSocketId = connectedUsers.get(receiverId);
 
-      if (receiverSocketId && socket.userId) {
-        io.to(receiverSocketId).emit('userTyping', {
+      if (receiverId && socket.userId) {
+        socket.to(userRoom(receiverId)).emit('userTyping', {
           userId: socket.userId,
         });
       }
@@ -107,19 +126,19 @@ export const initializeChatSocket = (io) => {
     // Handle stop typing
     socket.on('stopTyping', (data) => {
       const { receiverId } = data;
-      const receiverSocketId = connectedUsers.get(receiverId);
 
-      if (receiverSocketId && socket.userId) {
-        io.to(receiverSocketId).emit('userStopTyping', {
+      if (receiverId && socket.userId) {
+        socket.to(userRoom(receiverId)).emit('userStopTyping', {
           userId: socket.userId,
         });
       }
     });
 
-    // Handle disconnect
+    // Handle disconnect (Socket.IO removes the socket from its rooms)
     socket.on('disconnect', () => {
+      socketConnections.dec({ state: 'connected' });
       if (socket.userId) {
-        connectedUsers.delete(socket.userId);
+        socketConnections.dec({ state: 'authenticated' });
         logger.info(`User disconnected: ${socket.userId}`);
       }
       logger.info(`Socket disconnected: ${socket.id}`);
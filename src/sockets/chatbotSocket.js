@@ -0,0 +1,67 @@
+import logger from '../config/logger.js';
+import chatbotService from '../services/chatbotService.js';
+
+const MAX_MESSAGE_LENGTH = 1000;
+
+// Streamed chatbot answers on the chat connection. The socket must have
+// sent `authenticate` first (see chatSocket.js).
+//
+//   chatbot:ask    { requestId, message }             client -> server
+//   chatbot:token  { requestId, token }               one per chunk of text
+//   chatbot:done   { requestId, message, sources, cached }
+//   chatbot:error  { requestId, message }
+//
+// Answers go to the asking socket only, one question at a time;
+// disconnecting cancels the question in progress.
+export const initializeChatbotSocket = (io) => {
+  io.on('connection', (socket) => {
+    let pending = null;
+
+    socket.on('chatbot:ask', async (data = {}) => {
+      const requestId = data.requestId ?? null;
+      const message = typeof data.message === 'string' ? data.message.trim() : '';
+      const fail = (reason) => socket.emit('chatbot:error', { requestId, message: reason });
+
+      if (!socket.userId) {
+        fail('Not authenticated');
+        return;
+      }
+      if (!message || message.length > MAX_MESSAGE_LENGTH) {
+        fail(`Message is required (up to ${MAX_MESSAGE_LENGTH} characters)`);
+        return;
+      }
+      if (pending) {
+        fail('Another question is still being answered');
+        return;
+      }
+
+      const controller = new AbortController();
+      pending = controller;
+
+      try {
+        const answer = await chatbotService.ask(message, {
+          signal: controller.signal,
+          onToken: (token) => socket.emit('chatbot:token', { requestId, token }),
+        });
+        socket.emit('chatbot:done', { requestId, ...answer });
+      } catch (error) {
+        if (!controller.signal.aborted) {
+          if (error.statusCode === 503) {
+            fail(error.message);
+          } else {
+            logger.error(`Chatbot answer failed: ${error.message}`);
+            fail('Failed to answer, please try again');
+          }
+        }
+      } finally {
+        pending = null;
+      }
+    });
+
+    socket.on('disconnect', () => {
+      pending?.abort();
+    });
+  });
+};
+
+export default initializeChatbotSocket;
@@ -0,0 +1,17 @@
+// Every authenticated socket joins its user's room, so emitting to the
+// room reaches all of a user's tabs and devices. With a shared adapter
+// (see adapter.js) the room spans every server process.
+export const userRoom = (userId) => `user:${userId}`;
+
+export const joinUserRoom = (socket, userId) => {
+  if (socket.userId && socket.userId !== userId) {
+    socket.leave(userRoom(socket.userId));
+  }
+
+  socket.userId = userId;
+  socket.join(userRoom(userId));
+};
+
+export const emitToUser = (io, userId, event, payload) => {
+  io.to(userRoom(userId)).emit(event, payload);
+};
@@ -0,0 +1,112 @@
+import logger from '../config/logger.js';
+
+const CONTENT_TYPES = {
+  ndjson: 'application/x-ndjson; charset=utf-8',
+  csv: 'text/csv; charset=utf-8',
+};
+
+// Quote a CSV field when it contains a delimiter, quote or newline. Text
+// that a spreadsheet would run as a formula (=, +, -, @, tab or CR first)
+// is prefixed with ' and quoted, so a user-supplied name can't inject one.
+const csvField = (value) => {
+  if (value === null || value === undefined) {
+    return '';
+  }
+  if (typeof value === 'number') {
+    return String(value);
+  }
+  const text = value instanceof Date ? value.toISOString() : String(value);
+  if (/^[=+\-@\t\r]/.test(text)) {
+    return `"'${text.replace(/"/g, '""')}"`;
+  }
+  return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+};
+
+const csvLine = (values) => `${values.map(csvField).join(',')}\r\n`;
+
+// Resolves when the response can take more data, or the client went away.
+// A response destroyed earlier has already emitted 'close', so it resolves
+// straight away instead of waiting for an event that never comes.
+const waitForDrain = (res) =>
+  new Promise((resolve) => {
+    if (res.destroyed) {
+      resolve();
+      return;
+    }
+    const done = () => {
+      res.off('drain', done);
+      res.off('close', done);
+      resolve();
+    };
+    res.on('drain', done);
+    res.on('close', done);
+  });
+
+// Stream a Mongoose query cursor to the response as NDJSON or CSV.
+//
+// Documents are read `batchSize` at a time; `resolve(batch)` turns each
+// batch into output rows (so lookups happen once per batch, not per
+// document) and each serialized batch is written only once the socket has
+// drained, so memory stays flat whatever the collection size.
+//
+// `columns` is a list of [header, row => value] pairs used for CSV.
+export const streamExport = async (res, { cursor, format, filename, columns, resolve, batchSize = 500 }) => {
+  const clientGone = () => res.destroyed || res.writableEnded;
+
+  res.status(200);
+  res.set({
+    'Content-Type': CONTENT_TYPES[format],
+    'Content-Disposition': `attachment; filename="${filename}.${format}"`,
+    'Cache-Control': 'no-store',
+  });
+
+  const serialize = format === 'csv'
+    ? (row) => csvLine(columns.map(([, value]) => value(row)))
+    : (row) => `${JSON.stringify(row)}\n`;
+
+  const writeBatch = async (batch) => {
+    const rows = await resolve(batch);
+    if (res.destroyed) {
+      return;
+    }
+    if (!res.write(rows.map(serialize).join(''))) {
+      await waitForDrain(res);
+    }
+  };
+
+  let exported = 0;
+
+  try {
+    if (format === 'csv') {
+      res.write(csvLine(columns.map(([header]) => header)));
+    }
+
+    let batch = [];
+    for await (const doc of cursor) {
+      batch.push(doc);
+      if (batch.length >= batchSize) {
+        await writeBatch(batch);
+        exported += batch.length;
+        batch = [];
+        if (clientGone()) {
+          break;
+        }
+      }
+    }
+
+    if (batch.length > 0 && !clientGone()) {
+      await writeBatch(batch);
+      exported += batch.length;
+    }
+
+    res.end();
+  } catch (error) {
+    // Headers are long gone, so the only signal left is a truncated body
+    logger.error(`Export of ${filename} failed after ${exported} rows: ${error.message}`);
+    res.destroy(error);
+  } finally {
+    await cursor.close();
+  }
+
+  return exported;
+};
@@ -1,7 +1,9 @@
 import jwt from 'jsonwebtoken';
 
-export const generateAccessToken = (userId) => {
-  return jwt.sign({ id: userId }, process.env.JWT_SECRET, {
+// The role claim lets protect() spot a stale cached principal and lets
+// clients read the role without decoding the user
+export const generateAccessToken = (userId, role) => {
+  return jwt.sign({ id: userId, role }, process.env.JWT_SECRET, {
     expiresIn: process.env.JWT_EXPIRES_IN,
   });
 };
@@ -0,0 +1,66 @@
+// Size-bounded LRU map with per-entry TTL.
+// Map iteration order is insertion order, so re-inserting on read keeps the
+// least recently used entry at the front, ready for eviction.
+class LRUCache {
+  constructor({ max = 500, ttl = 60 * 1000 } = {}) {
+    this.max = max;
+    this.ttl = ttl;
+    this.entries = new Map();
+    this.hits = 0;
+    this.misses = 0;
+  }
+
+  get(key) {
+    const entry = this.entries.get(key);
+
+    if (!entry) {
+      this.misses += 1;
+      return undefined;
+    }
+
+    if (entry.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      this.misses += 1;
+      return undefined;
+    }
+
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.hits += 1;
+    return entry.value;
+  }
+
+  set(key, value, ttl = this.ttl) {
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: Date.now() + ttl });
+
+    if (this.entries.size > this.max) {
+      this.entries.delete(this.entries.keys().next().value);
+    }
+  }
+
+  delete(key) {
+    return this.entries.delete(key);
+  }
+
+  deletePrefix(prefix) {
+    let removed = 0;
+    for (const key of this.entries.keys()) {
+      if (key.startsWith(prefix)) {
+        this.entries.delete(key);
+        removed += 1;
+      }
+    }
+    return removed;
+  }
+
+  clear() {
+    this.entries.clear();
+  }
+
+  get size() {
+    return this.entries.size;
+  }
+}
+
+export default LRUCache;
@@ -0,0 +1,153 @@
+// Minimal Prometheus registry: counters, gauges and histograms with labels,
+// rendered in the text exposition format (version 0.0.4).
+
+const escapeLabel = (value) =>
+  String(value).replace(/\\/g, '\\\\').replace(/\n/g, '\\n').replace(/"/g, '\\"');
+
+const formatLabels = (labels) => {
+  const pairs = Object.entries(labels);
+  if (pairs.length === 0) {
+    return '';
+  }
+  return `{${pairs.map(([key, value]) => `${key}="${escapeLabel(value)}"`).join(',')}}`;
+};
+
+const labelKey = (labels) => JSON.stringify(Object.entries(labels).sort());
+
+class Metric {
+  constructor(type, name, help, collect) {
+    this.type = type;
+    this.name = name;
+    this.help = help;
+    // Optional callback run on every scrape to set values from elsewhere
+    this.collect = collect;
+    this.series = new Map();
+  }
+
+  entry(labels, create) {
+    const key = labelKey(labels);
+    if (!this.series.has(key)) {
+      this.series.set(key, { labels, ...create() });
+    }
+    return this.series.get(key);
+  }
+
+  header() {
+    return [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} ${this.type}`];
+  }
+}
+
+export class Counter extends Metric {
+  constructor(name, help, collect) {
+    super('counter', name, help, collect);
+  }
+
+  inc(labels = {}, value = 1) {
+    this.entry(labels, () => ({ value: 0 })).value += value;
+  }
+
+  // For counters kept elsewhere (e.g. cache hit totals), read at scrape time
+  set(labels, value) {
+    this.entry(labels, () => ({ value: 0 })).value = value;
+  }
+
+  render() {
+    return [...this.series.values()].map(({ labels, value }) => `${this.name}${formatLabels(labels)} ${value}`);
+  }
+}
+
+export class Gauge extends Metric {
+  constructor(name, help, collect) {
+    super('gauge', name, help, collect);
+  }
+
+  set(labels, value) {
+    this.entry(labels, () => ({ value: 0 })).value = value;
+  }
+
+  inc(labels = {}, value = 1) {
+    this.entry(labels, () => ({ value: 0 })).value += value;
+  }
+
+  dec(labels = {}, value = 1) {
+    this.inc(labels, -value);
+  }
+
+  render() {
+    return [...this.series.values()].map(({ labels, value }) => `${this.name}${formatLabels(labels)} ${value}`);
+  }
+}
+
+export class Histogram extends Metric {
+  constructor(name, help, buckets) {
+    super('histogram', name, help);
+    this.buckets = [...buckets].sort((a, b) => a - b);
+  }
+
+  observe(labels, value) {
+    const series = this.entry(labels, () => ({
+      counts: new Array(this.buckets.length).fill(0),
+      sum: 0,
+      count: 0,
+    }));
+
+    // Counts are per bucket here and made cumulative when rendered
+    const index = this.buckets.findIndex((bound) => value <= bound);
+    if (index !== -1) {
+      series.counts[index] += 1;
+    }
+    series.sum += value;
+    series.count += 1;
+  }
+
+  render() {
+    const lines = [];
+    this.series.forEach(({ labels, counts, sum, count }) => {
+      let cumulative = 0;
+      this.buckets.forEach((bound, index) => {
+        cumulative += counts[index];
+        lines.push(`${this.name}_bucket${formatLabels({ ...labels, le: bound })} ${cumulative}`);
+      });
+      lines.push(`${this.name}_bucket${formatLabels({ ...labels, le: '+Inf' })} ${count}`);
+      lines.push(`${this.name}_sum${formatLabels(labels)} ${sum}`);
+      lines.push(`${this.name}_count${formatLabels(labels)} ${count}`);
+    });
+    return lines;
+  }
+}
+
+export class Registry {
+  constructor() {
+    this.metrics = [];
+  }
+
+  register(metric) {
+    this.metrics.push(metric);
+    return metric;
+  }
+
+  counter(name, help, collect) {
+    return this.register(new Counter(name, help, collect));
+  }
+
+  gauge(name, help, collect) {
+    return this.register(new Gauge(name, help, collect));
+  }
+
+  histogram(name, help, buckets) {
+    return this.register(new Histogram(name, help, buckets));
+  }
+
+  render() {
+    const lines = [];
+    this.metrics.forEach((metric) => {
+      if (metric.collect) {
+        metric.collect(metric);
+      }
+      lines.push(...metric.header(), ...metric.render());
+    });
+    return `${lines.join('\n')}\n`;
+  }
+}
+
+export const CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8';
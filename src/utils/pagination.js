@@ -0,0 +1,72 @@
+import mongoose from 'mongoose';
+import ErrorResponse from './errorResponse.js';
+
+export const DEFAULT_PAGE_SIZE = 20;
+export const MAX_PAGE_SIZE = 100;
+
+// Clamp a `limit` query param to 1..max
+export const parseLimit = (limit, fallback = DEFAULT_PAGE_SIZE, max = MAX_PAGE_SIZE) => {
+  const parsed = parseInt(limit, 10);
+  if (Number.isNaN(parsed) || parsed < 1) {
+    return fallback;
+  }
+  return Math.min(parsed, max);
+};
+
+// Opaque cursor holding the sort value and _id of the last returned document
+export const encodeCursor = (doc, field) => {
+  const value = doc[field];
+  const isDate = value instanceof Date;
+
+  return Buffer.from(
+    JSON.stringify([isDate ? value.toISOString() : value, doc._id.toString(), isDate])
+  ).toString('base64url');
+};
+
+export const decodeCursor = (cursor) => {
+  try {
+    const [value, id, isDate] = JSON.parse(
+      Buffer.from(cursor, 'base64url').toString('utf8')
+    );
+
+    if (!mongoose.Types.ObjectId.isValid(id)) {
+      throw new Error('Invalid cursor id');
+    }
+
+    return {
+      value: isDate ? new Date(value) : value,
+      id: new mongoose.Types.ObjectId(id),
+    };
+  } catch (error) {
+    throw new ErrorResponse('Invalid pagination cursor', 400);
+  }
+};
+
+// Filter that resumes a `{ [field]: direction, _id: idDirection }` sort after the cursor
+export const keysetFilter = (field, direction, { value, id }, idDirection = direction) => {
+  const op = direction === 1 ? '$gt' : '$lt';
+  const idOp = idDirection === 1 ? '$gt' : '$lt';
+
+  return {
+    $or: [{ [field]: { [op]: value } }, { [field]: value, _id: { [idOp]: id } }],
+  };
+};
+
+// Turn a comma separated `fields` param into a whitelisted projection.
+// Returns null when no fields were requested (full document).
+export const buildProjection = (fields, allowed, required = []) => {
+  if (!fields) {
+    return null;
+  }
+
+  const selected = fields
+    .split(',')
+    .map((f) => f.trim())
+    .filter((f) => allowed.includes(f));
+
+  if (selected.length === 0) {
+    return null;
+  }
+
+  return [...new Set([...selected, ...required])].join(' ');
+};
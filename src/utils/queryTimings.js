@@ -0,0 +1,54 @@
+import { performance } from 'perf_hooks';
+import { recordQuery } from '../config/metrics.js';
+
+const QUERY_OPERATIONS = [
+  'countDocuments',
+  'deleteMany',
+  'deleteOne',
+  'distinct',
+  'estimatedDocumentCount',
+  'find',
+  'findOne',
+  'findOneAndDelete',
+  'findOneAndReplace',
+  'findOneAndUpdate',
+  'replaceOne',
+  'updateMany',
+  'updateOne',
+];
+
+const elapsedSeconds = (startedAt) => (performance.now() - startedAt) / 1000;
+
+// Schema plugin timing queries, aggregations and document saves into the
+// mongodb_query_duration_seconds histogram. Failed operations are not
+// recorded; bulkWrite and insertMany run outside schema middleware.
+const queryTimings = (schema) => {
+  schema.pre(QUERY_OPERATIONS, function () {
+    this._timingStartedAt = performance.now();
+  });
+  schema.post(QUERY_OPERATIONS, function () {
+    if (this._timingStartedAt !== undefined) {
+      recordQuery(this.model.modelName, this.op, elapsedSeconds(this._timingStartedAt));
+    }
+  });
+
+  schema.pre('aggregate', function () {
+    this._timingStartedAt = performance.now();
+  });
+  schema.post('aggregate', function () {
+    if (this._timingStartedAt !== undefined) {
+      recordQuery(this.model().modelName, 'aggregate', elapsedSeconds(this._timingStartedAt));
+    }
+  });
+
+  schema.pre('save', function () {
+    this.$locals.timingStartedAt = performance.now();
+  });
+  schema.post('save', function () {
+    if (this.$locals.timingStartedAt !== undefined) {
+      recordQuery(this.constructor.modelName, 'save', elapsedSeconds(this.$locals.timingStartedAt));
+    }
+  });
+};
+
+export default queryTimings;
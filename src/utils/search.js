@@ -0,0 +1,6 @@
+// Escape user input for use inside a RegExp
+export const escapeRegex = (value) => value.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+
+// Lowercased, whitespace-collapsed form used for prefix autocomplete
+export const normalizeSearchKey = (value = '') =>
+  value.toLowerCase().replace(/\s+/g, ' ').trim();
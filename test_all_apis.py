@@ -4,11 +4,30 @@ Comprehensive Test Script for Taakra Backend API
 Tests all endpoints with proper authentication, error handling, and colored output
 """
 
-import requests
+import argparse
+import asyncio
+import contextlib
+import io
 import json
+import math
+import random
+import re
+import socket
+import subprocess
+import sys
+import threading
 import time
+import uuid
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
+
+import requests
 from colorama import init, Fore, Style
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 
 # Initialize colorama for colored console output
 init(autoreset=True)
@@ -19,7 +38,7 @@ ADMIN_EMAIL = "admin@taakra.com"
 ADMIN_PASSWORD = "123456"
 
 # Test data storage
-test_data = {
+TEST_DATA_DEFAULTS = {
     'admin_token': None,
     'admin_refresh_token': None,
     'user_token': None,
@@ -28,35 +47,175 @@ test_data = {
     'category_id': None,
     'competition_id': None,
     'registration_id': None,
+    'competition_ids': None,
     'test_user_email': None,
     'support_user_email': None,
+    'support_user_id': None,
 }
 
+class ThreadLocalTestData(threading.local):
+    """Per-thread test_data so concurrent virtual users never share tokens or ids"""
+
+    def __init__(self):
+        self.data = dict(TEST_DATA_DEFAULTS)
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+
+    def reset(self):
+        self.data = dict(TEST_DATA_DEFAULTS)
+
+test_data = ThreadLocalTestData()
+
 # Test statistics
 stats = {
     'passed': 0,
     'failed': 0,
     'total': 0
 }
+stats_lock = threading.Lock()
+
+# Load mode state (see run_load_test)
+load_config = {
+    'enabled': False,
+    'limiter': None,
+}
+load_samples = defaultdict(list)
+load_samples_lock = threading.Lock()
+
+# Every test result of a functional run, with request timings (see
+# print_test); feeds the latency report, --json and --junit
+test_results = []
+report_config = {
+    'response_chars': 200,
+}
+
+# One pooled HTTP session per thread
+_thread_local = threading.local()
+
+OBJECT_ID_PATTERN = re.compile(r'/[0-9a-fA-F]{24}(?=/|$)')
+
+class TimedConnectionMixin:
+    """Record DNS and connect time of new connections in the thread's timing dict"""
+
+    def _new_conn(self):
+        timing = getattr(_thread_local, 'timing', None)
+        if timing is None:
+            return super()._new_conn()
+
+        # Resolve once and connect to that address, so the DNS figure is the
+        # lookup this connection actually used
+        started = time.perf_counter()
+        try:
+            address = socket.getaddrinfo(self._dns_host, self.port, type=socket.SOCK_STREAM)[0][4][0]
+        except OSError:
+            address = None  # _new_conn() below raises the real error
+        timing['dns'] = time.perf_counter() - started
+        if address is None:
+            return super()._new_conn()
+
+        # Only the socket connect reads _dns_host; TLS still verifies self.host
+        host = self._dns_host
+        self._dns_host = address
+        try:
+            return super()._new_conn()
+        finally:
+            self._dns_host = host
+
+    def connect(self):
+        timing = getattr(_thread_local, 'timing', None)
+        if timing is None:
+            return super().connect()
+
+        # TCP, plus the TLS handshake for https, without the DNS lookup
+        timing['dns'] = 0.0
+        started = time.perf_counter()
+        result = super().connect()
+        timing['connect'] = time.perf_counter() - started - timing['dns']
+        return result
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    pass
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+class TimedAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections report their setup time"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+
+def get_session():
+    """Get the requests.Session owned by the current thread"""
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        adapter = TimedAdapter()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _thread_local.session = session
+    return session
+
+def unique_suffix():
+    """Timestamp plus a random tag, unique across concurrent virtual users"""
+    return f"{int(time.time())}_{uuid.uuid4().hex[:8]}"
 
 def print_header(text):
     """Print a formatted header"""
+    if load_config['enabled']:
+        return
     print(f"\n{'='*80}")
     print(f"{Fore.CYAN}{Style.BRIGHT}{text.center(80)}")
     print(f"{'='*80}\n")
 
-def print_test(test_name, status, status_code=None, response=None, error=None):
-    """Print test results with colored output"""
-    stats['total'] += 1
+def truncate(text):
+    """Shorten response text to --response-chars (0 = keep everything)"""
+    limit = report_config['response_chars']
+    return f"{text[:limit]}..." if limit and len(text) > limit else text
+
+def print_test(test_name, status, status_code=None, response=None, error=None, timing=None):
+    """Print test results with colored output and record them for the reports"""
+    with stats_lock:
+        stats['total'] += 1
+        if status == 'PASS':
+            stats['passed'] += 1
+        else:
+            stats['failed'] += 1
+
+    if load_config['enabled']:
+        return
+
+    test_results.append({
+        'name': test_name,
+        'status': status,
+        'status_code': status_code,
+        'error': error,
+        **(timing or {}),
+    })
 
     if status == 'PASS':
-        stats['passed'] += 1
         status_text = f"{Fore.GREEN}[PASS]{Style.RESET_ALL}"
     else:
-        stats['failed'] += 1
         status_text = f"{Fore.RED}[FAIL]{Style.RESET_ALL}"
 
-    print(f"{status_text} {test_name}")
+    if timing:
+        print(f"{status_text} {test_name} ({timing['total_ms']:.1f} ms)")
+    else:
+        print(f"{status_text} {test_name}")
 
     if status_code:
         print(f"  Status Code: {status_code}")
@@ -64,11 +223,11 @@ def print_test(test_name, status, status_code=None, response=None, error=None):
     if response:
         try:
             if isinstance(response, dict):
-                print(f"  Response: {json.dumps(response, indent=2)[:200]}...")
+                print(f"  Response: {truncate(json.dumps(response, indent=2))}")
             else:
-                print(f"  Response: {str(response)[:200]}...")
+                print(f"  Response: {truncate(str(response))}")
         except:
-            print(f"  Response: {str(response)[:200]}...")
+            print(f"  Response: {truncate(str(response))}")
 
     if error:
         print(f"  {Fore.RED}Error: {error}{Style.RESET_ALL}")
@@ -76,22 +235,45 @@ def print_test(test_name, status, status_code=None, response=None, error=None):
     print()
 
 def make_request(method, endpoint, test_name, headers=None, data=None, params=None, expected_status=200, expect_fail=False):
-    """Make HTTP request with error handling"""
+    """Make HTTP request with error handling and per-phase timing"""
     url = f"{BASE_URL}{endpoint}"
+    http = get_session()
+
+    if load_config['limiter']:
+        load_config['limiter'].wait()
+
+    # Filled by TimedConnectionMixin when a new connection is opened
+    phases = {'dns': 0.0, 'connect': 0.0}
+    _thread_local.timing = phases
+    started = time.perf_counter()
+
+    def timing(elapsed, ttfb=None, size=0):
+        return {
+            'method': method,
+            'endpoint': OBJECT_ID_PATTERN.sub('/:id', endpoint),
+            'dns_ms': round(phases['dns'] * 1000, 3),
+            'connect_ms': round(phases['connect'] * 1000, 3),
+            'ttfb_ms': round(ttfb * 1000, 3) if ttfb is not None else None,
+            'total_ms': round(elapsed * 1000, 3),
+            'bytes': size,
+        }
 
     try:
         if method == 'GET':
-            response = requests.get(url, headers=headers, params=params)
+            response = http.get(url, headers=headers, params=params)
         elif method == 'POST':
-            response = requests.post(url, headers=headers, json=data)
+            response = http.post(url, headers=headers, json=data)
         elif method == 'PUT':
-            response = requests.put(url, headers=headers, json=data)
+            response = http.put(url, headers=headers, json=data)
         elif method == 'DELETE':
-            response = requests.delete(url, headers=headers)
+            response = http.delete(url, headers=headers)
         else:
             raise ValueError(f"Unsupported HTTP method: {method}")
 
+        elapsed = time.perf_counter() - started
         status_code = response.status_code
+        # requests' elapsed: from sending the request until the headers arrived
+        request_timing = timing(elapsed, response.elapsed.total_seconds(), len(response.content))
 
         try:
             response_data = response.json()
@@ -100,30 +282,39 @@ def make_request(method, endpoint, test_name, headers=None, data=None, params=No
 
         # Check if status code matches expected
         if expect_fail:
-            # For tests that should fail (like 503 for disabled chatbot)
-            if status_code >= 400:
-                print_test(test_name, 'PASS', status_code, response_data)
-                return response_data, status_code
-            else:
-                print_test(test_name, 'FAIL', status_code, response_data,
-                          f"Expected failure status (>=400), got {status_code}")
-                return response_data, status_code
+            # For tests that should fail (validation errors, forbidden access)
+            passed = status_code >= 400
+            error = None if passed else f"Expected failure status (>=400), got {status_code}"
         else:
             # Normal success tests
-            if status_code == expected_status:
-                print_test(test_name, 'PASS', status_code, response_data)
-                return response_data, status_code
-            else:
-                print_test(test_name, 'FAIL', status_code, response_data,
-                          f"Expected {expected_status}, got {status_code}")
-                return response_data, status_code
+            passed = status_code == expected_status
+            error = None if passed else f"Expected {expected_status}, got {status_code}"
+
+        record_sample(method, endpoint, elapsed, passed)
+        print_test(test_name, 'PASS' if passed else 'FAIL', status_code, response_data, error,
+                   request_timing)
+        return response_data, status_code
 
     except requests.exceptions.ConnectionError as e:
-        print_test(test_name, 'FAIL', None, None, f"Connection failed: {str(e)}")
+        elapsed = time.perf_counter() - started
+        record_sample(method, endpoint, elapsed, False)
+        print_test(test_name, 'FAIL', None, None, f"Connection failed: {str(e)}", timing(elapsed))
         return None, None
     except Exception as e:
-        print_test(test_name, 'FAIL', None, None, str(e))
+        elapsed = time.perf_counter() - started
+        record_sample(method, endpoint, elapsed, False)
+        print_test(test_name, 'FAIL', None, None, str(e), timing(elapsed))
         return None, None
+    finally:
+        _thread_local.timing = None
+
+def record_sample(method, endpoint, elapsed, ok):
+    """Record one request latency for the load report (no-op outside load mode)"""
+    if not load_config['enabled']:
+        return
+    key = f"{method} {OBJECT_ID_PATTERN.sub('/:id', endpoint)}"
+    with load_samples_lock:
+        load_samples[key].append((elapsed, ok))
 
 def get_auth_headers(token):
     """Get authorization headers"""
@@ -158,7 +349,7 @@ def test_authentication():
 
     # 2. User Signup
     timestamp = int(time.time())
-    test_email = f"testuser_{timestamp}@test.com"
+    test_email = f"testuser_{unique_suffix()}@test.com"
     test_data['test_user_email'] = test_email
 
     signup_data = {
@@ -281,7 +472,8 @@ def test_competitions():
             'title': f'Test Competition {timestamp}',
             'description': 'A comprehensive test competition',
             'category': test_data['category_id'],
-            'venue': 'Test Venue',
+            # Unique venue so concurrent runs never collide on a booking
+            'venue': f'Test Venue {unique_suffix()}',
             'building': 'Test Building',
             'startDate': start_date.isoformat(),
             'endDate': end_date.isoformat(),
@@ -310,7 +502,7 @@ def test_competitions():
             'title': f'Updated Competition {int(time.time())}',
             'description': 'Updated description',
             'category': test_data['category_id'],
-            'venue': 'Updated Venue',
+            'venue': f'Updated Venue {unique_suffix()}',
             'building': 'Updated Building',
             'startDate': start_date.isoformat(),
             'endDate': end_date.isoformat(),
@@ -360,6 +552,30 @@ def test_registrations():
 
     # Note: Delete is tested in cleanup section
 
+def test_bulk_registrations():
+    """Test bulk registration endpoint"""
+    print_header("BULK REGISTRATION TESTS")
+
+    # Load mode: a fresh user registers for several competitions at once
+    if test_data['user_token'] and test_data['competition_ids']:
+        headers = get_auth_headers(test_data['user_token'])
+        make_request('POST', '/api/registrations/bulk', 'Bulk Registration (Self)',
+                    headers=headers, data={'competitions': test_data['competition_ids']},
+                    expected_status=201)
+        return
+
+    # Functional run: the test user is already registered, so the admin's
+    # bulk request must skip the pair instead of double counting it
+    if test_data['admin_token'] and test_data['user_id'] and test_data['competition_id']:
+        headers = get_auth_headers(test_data['admin_token'])
+        bulk_data = {
+            'users': [test_data['user_id']],
+            'competitions': [test_data['competition_id']]
+        }
+        response, status = make_request('POST', '/api/registrations/bulk',
+                                       'Bulk Registration (Admin, Duplicate Skipped)',
+                                       headers=headers, data=bulk_data, expected_status=200)
+
 def test_admin_endpoints():
     """Test admin-only endpoints"""
     print_header("ADMIN ENDPOINTS TESTS")
@@ -378,7 +594,7 @@ def test_admin_endpoints():
 
     # 3. Add Support Member (First create a user, then promote to support)
     timestamp = int(time.time())
-    support_email = f"support_{timestamp}@test.com"
+    support_email = f"support_{unique_suffix()}@test.com"
     test_data['support_user_email'] = support_email
 
     # First create the user via signup
@@ -387,8 +603,11 @@ def test_admin_endpoints():
         'email': support_email,
         'password': '123456'
     }
-    make_request('POST', '/api/auth/signup', 'Create User for Support Role',
-                data=new_user_data, expected_status=201)
+    response, status = make_request('POST', '/api/auth/signup', 'Create User for Support Role',
+                                   data=new_user_data, expected_status=201)
+
+    if response and status == 201:
+        test_data['support_user_id'] = response.get('data', {}).get('user', {}).get('_id')
 
     # Then promote the user to support
     support_data = {
@@ -416,7 +635,7 @@ def test_chat_endpoints():
                     'Get Chat History', headers=headers)
 
 def test_chatbot_endpoint():
-    """Test chatbot endpoint (should return 503 - disabled)"""
+    """Test chatbot endpoint"""
     print_header("CHATBOT ENDPOINT TEST")
 
     if not test_data['user_token']:
@@ -425,13 +644,26 @@ def test_chatbot_endpoint():
 
     headers = get_auth_headers(test_data['user_token'])
 
-    # Chatbot is disabled, should return 503
+    # 1. Ask a question
+    chatbot_data = {
+        'message': 'How do I register for a competition?'
+    }
+    response, status = make_request('POST', '/api/chatbot', 'Chatbot Query',
+                                   headers=headers, data=chatbot_data)
+
+    # 2. Same question, differently written - served from the answer cache
     chatbot_data = {
-        'message': 'Hello chatbot!'
+        'message': 'how do I register for a   COMPETITION'
     }
-    response, status = make_request('POST', '/api/chatbot', 'Chatbot Query (Disabled - Expect 503)',
-                                   headers=headers, data=chatbot_data,
-                                   expected_status=503, expect_fail=True)
+    response, status = make_request('POST', '/api/chatbot', 'Chatbot Query (Normalized Repeat)',
+                                   headers=headers, data=chatbot_data)
+    if response and not response.get('data', {}).get('cached'):
+        print(f"{Fore.YELLOW}  Note: repeated question was not served from cache{Style.RESET_ALL}")
+
+    # 3. Empty message (should fail)
+    make_request('POST', '/api/chatbot', 'Chatbot Query (Empty - Expect 400)',
+                headers=headers, data={'message': '   '},
+                expected_status=400, expect_fail=True)
 
 def test_authorization():
     """Test authorization (non-admin trying admin endpoints)"""
@@ -460,33 +692,50 @@ def test_authorization():
                                    headers=headers,
                                    expected_status=403, expect_fail=True)
 
-def cleanup_test_data():
-    """Clean up test data"""
-    print_header("CLEANUP TEST DATA")
+def test_deletion():
+    """Test the delete endpoints on the scenario's own fixtures"""
+    print_header("DELETION TESTS")
 
     if not test_data['admin_token']:
-        print(f"{Fore.YELLOW}Skipping cleanup - no admin token available{Style.RESET_ALL}")
+        print(f"{Fore.YELLOW}Skipping deletion tests - no admin token available{Style.RESET_ALL}")
         return
 
     headers = get_auth_headers(test_data['admin_token'])
 
+    # Deleted resources are cleared so teardown doesn't try again
     # 1. Delete Registration
     if test_data['registration_id']:
-        make_request('DELETE', f'/api/registrations/{test_data["registration_id"]}',
-                    'Delete Test Registration', headers=headers)
+        response, status = make_request('DELETE', f'/api/registrations/{test_data["registration_id"]}',
+                                       'Delete Test Registration', headers=headers)
+        if status == 200:
+            test_data['registration_id'] = None
 
     # 2. Delete Competition
     if test_data['competition_id']:
-        make_request('DELETE', f'/api/competitions/{test_data["competition_id"]}',
-                    'Delete Test Competition', headers=headers)
+        response, status = make_request('DELETE', f'/api/competitions/{test_data["competition_id"]}',
+                                       'Delete Test Competition', headers=headers)
+        if status == 200:
+            test_data['competition_id'] = None
 
     # 3. Delete Category
     if test_data['category_id']:
-        make_request('DELETE', f'/api/categories/{test_data["category_id"]}',
-                    'Delete Test Category', headers=headers)
-
-    print(f"\n{Fore.YELLOW}Note: Test users (testuser_* and support_*) remain in database.{Style.RESET_ALL}")
-    print(f"{Fore.YELLOW}They can be manually removed from the database if needed.{Style.RESET_ALL}")
+        response, status = make_request('DELETE', f'/api/categories/{test_data["category_id"]}',
+                                       'Delete Test Category', headers=headers)
+        if status == 200:
+            test_data['category_id'] = None
+
+    # 4. Non-admin cannot delete users
+    if test_data['user_token'] and test_data['user_id']:
+        make_request('DELETE', f'/api/admin/users/{test_data["user_id"]}',
+                    'User Deleting User (Should Fail)', headers=get_auth_headers(test_data['user_token']),
+                    expected_status=403, expect_fail=True)
+
+    # 5. Delete User
+    if test_data['user_id']:
+        response, status = make_request('DELETE', f'/api/admin/users/{test_data["user_id"]}',
+                                       'Delete Test User', headers=headers)
+        if status == 200:
+            test_data['user_id'] = None
 
 def print_summary():
     """Print test summary"""
@@ -509,12 +758,860 @@ def print_summary():
 
     print("\n" + "="*80 + "\n")
 
+# ============================================================================
+# SCENARIOS
+# ============================================================================
+
+class FixtureError(Exception):
+    """A scenario's fixtures could not be created"""
+
+# name -> (fixtures, tests). Every scenario gets fresh fixtures, so
+# scenarios can run in any order and in parallel. 'competition' implies
+# 'category'; 'registration' implies 'user' and 'competition'.
+SCENARIOS = {
+    'health': ((), [test_health_check]),
+    'authentication': ((), [test_authentication]),
+    'categories': ((), [test_categories]),
+    'competitions': (('category',), [test_competitions]),
+    'registrations': (('user', 'competition'), [test_registrations]),
+    'bulk-registrations': (('registration',), [test_bulk_registrations]),
+    'admin': ((), [test_admin_endpoints]),
+    'chat': (('user',), [test_chat_endpoints]),
+    'chatbot': (('user',), [test_chatbot_endpoint]),
+    'authorization': (('user',), [test_authorization]),
+    'deletion': (('registration',), [test_deletion]),
+}
+
+# Teardown order: users first (their registrations are removed with
+# them), then competitions, then the categories they belonged to
+CLEANUP_ORDER = (
+    ('user_id', '/api/admin/users'),
+    ('support_user_id', '/api/admin/users'),
+    ('competition_id', '/api/competitions'),
+    ('category_id', '/api/categories'),
+)
+
+# Per worker process; the admin logs in once per worker, not per scenario
+_worker_state = {'admin_token': None}
+
+def init_worker(base_url):
+    """Process pool initializer"""
+    global BASE_URL
+    BASE_URL = base_url
+
+def fixture_request(method, endpoint, token=None, data=None, expected_status=201):
+    """Uncounted request for fixture setup; raises FixtureError on failure"""
+    headers = get_auth_headers(token) if token else None
+    try:
+        response = get_session().request(method, f"{BASE_URL}{endpoint}",
+                                         headers=headers, json=data, timeout=30)
+    except requests.RequestException as e:
+        raise FixtureError(f"{method} {endpoint} failed: {e}") from e
+    if response.status_code != expected_status:
+        raise FixtureError(f"{method} {endpoint} returned {response.status_code}: {response.text[:200]}")
+    return response.json().get('data', {})
+
+def get_admin_token():
+    """Admin access token, logged in once per worker"""
+    if not _worker_state['admin_token']:
+        data = fixture_request('POST', '/api/auth/login', expected_status=200,
+                               data={'email': ADMIN_EMAIL, 'password': ADMIN_PASSWORD})
+        _worker_state['admin_token'] = data.get('accessToken')
+    return _worker_state['admin_token']
+
+def setup_fixtures(fixtures):
+    """Create the scenario's own user, category, competition and registration"""
+    needs = set(fixtures)
+    if 'registration' in needs:
+        needs |= {'user', 'competition'}
+    if 'competition' in needs:
+        needs.add('category')
+
+    if 'user' in needs:
+        email = f"testuser_{unique_suffix()}@test.com"
+        data = fixture_request('POST', '/api/auth/signup', data={
+            'name': 'Fixture User', 'email': email, 'password': 'TestPass123!'})
+        test_data['test_user_email'] = email
+        test_data['user_id'] = data.get('user', {}).get('_id')
+        test_data['user_token'] = data.get('accessToken')
+        test_data['user_refresh_token'] = data.get('refreshToken')
+
+    if 'category' in needs:
+        data = fixture_request('POST', '/api/categories', test_data['admin_token'], {
+            'name': f'Fixture Category {unique_suffix()}',
+            'description': 'Created for an API test scenario',
+        })
+        test_data['category_id'] = data.get('_id')
+
+    if 'competition' in needs:
+        start_date = datetime.now() + timedelta(days=20)
+        data = fixture_request('POST', '/api/competitions', test_data['admin_token'], {
+            'title': f'Fixture Competition {unique_suffix()}',
+            'description': 'Created for an API test scenario',
+            'category': test_data['category_id'],
+            'venue': f'Fixture Venue {unique_suffix()}',
+            'building': 'Fixture Building',
+            'startDate': start_date.isoformat(),
+            'endDate': (start_date + timedelta(hours=2)).isoformat(),
+            'dayNumber': 1,
+        })
+        test_data['competition_id'] = data.get('_id')
+
+    if 'registration' in needs:
+        data = fixture_request('POST', '/api/registrations', test_data['user_token'],
+                               {'competition': test_data['competition_id']})
+        test_data['registration_id'] = data.get('_id')
+
+def teardown_fixtures():
+    """Delete everything the scenario created; returns what could not be removed"""
+    leftovers = []
+    token = test_data['admin_token']
+
+    for key, endpoint in CLEANUP_ORDER:
+        resource_id = test_data[key]
+        if not resource_id:
+            continue
+        if not token:
+            leftovers.append(f"{endpoint}/{resource_id}")
+            continue
+        try:
+            response = get_session().delete(f"{BASE_URL}{endpoint}/{resource_id}",
+                                            headers=get_auth_headers(token), timeout=30)
+            # 404: the scenario already deleted it
+            if response.status_code not in (200, 404):
+                leftovers.append(f"{endpoint}/{resource_id} ({response.status_code})")
+        except requests.RequestException as e:
+            leftovers.append(f"{endpoint}/{resource_id} ({e})")
+
+    return leftovers
+
+def delete_users(user_ids):
+    """Delete throwaway users with the admin token; returns how many are left behind"""
+    if not user_ids:
+        return 0
+    try:
+        token = get_admin_token()
+    except FixtureError as e:
+        print(f"{Fore.YELLOW}Could not clean up {len(user_ids)} test users: {e}{Style.RESET_ALL}")
+        return len(user_ids)
+
+    def delete(user_id):
+        try:
+            response = get_session().delete(f"{BASE_URL}/api/admin/users/{user_id}",
+                                            headers=get_auth_headers(token), timeout=30)
+            return response.status_code in (200, 404)
+        except requests.RequestException:
+            return False
+
+    with ThreadPoolExecutor(max_workers=min(32, len(user_ids))) as executor:
+        left = sum(1 for deleted in executor.map(delete, user_ids) if not deleted)
+
+    color = Fore.YELLOW if left else Fore.GREEN
+    print(f"{color}Cleaned up {len(user_ids) - left}/{len(user_ids)} test users{Style.RESET_ALL}")
+    return left
+
+def run_scenario(task):
+    """Run one (scenario, round) with its own fixtures; output is captured and returned"""
+    name, round_number = task
+    fixtures, tests = SCENARIOS[name]
+    test_data.reset()
+    before = dict(stats)
+    first_result = len(test_results)
+    buffer = io.StringIO()
+    started = time.perf_counter()
+
+    with contextlib.redirect_stdout(buffer):
+        try:
+            test_data['admin_token'] = get_admin_token()
+            setup_fixtures(fixtures)
+            for test in tests:
+                test()
+        except Exception as e:
+            print_test(f"{name} scenario setup", 'FAIL', error=str(e))
+        finally:
+            leftovers = teardown_fixtures()
+
+    results = [{**result, 'scenario': name, 'round': round_number}
+               for result in test_results[first_result:]]
+    del test_results[first_result:]
+
+    return {
+        'name': name,
+        'round': round_number,
+        'results': results,
+        'output': buffer.getvalue(),
+        'passed': stats['passed'] - before['passed'],
+        'failed': stats['failed'] - before['failed'],
+        'total': stats['total'] - before['total'],
+        'elapsed': time.perf_counter() - started,
+        'leftovers': leftovers,
+    }
+
+def run_scenarios(names, workers, repeat=1, warmup=0):
+    """Run scenarios on a process pool and print their output in order.
+
+    With repeat/warmup every scenario runs warmup + repeat times; results
+    of the warmup rounds are dropped from the timing reports. Returns the
+    recorded test results of the measured rounds.
+    """
+    rounds = warmup + repeat
+    tasks = [(name, round_number) for round_number in range(rounds) for name in names]
+    print(f"{Fore.CYAN}Running {len(names)} scenarios"
+          f"{f' x {rounds} rounds ({warmup} warmup)' if rounds > 1 else ''} on {workers} "
+          f"worker{'s' if workers != 1 else ''}{Style.RESET_ALL}")
+    started = time.perf_counter()
+
+    if workers == 1:
+        init_worker(BASE_URL)
+        results = map(run_scenario, tasks)
+        executor = None
+    else:
+        # Each worker process keeps one Session (see get_session) for
+        # every scenario it runs, so connections are reused
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                       initargs=(BASE_URL,))
+        results = executor.map(run_scenario, tasks)
+
+    leftovers = []
+    measured = []
+    try:
+        for result in results:
+            # Later rounds only show their output when something failed
+            if result['round'] == 0 or result['failed']:
+                print(result['output'], end='')
+            label = f"{result['name']} #{result['round'] + 1}" if rounds > 1 else result['name']
+            print(f"{Fore.CYAN}Scenario {label}: {result['passed']}/{result['total']} passed "
+                  f"in {result['elapsed']:.2f}s{Style.RESET_ALL}")
+            # Only the parent's totals feed print_summary
+            if executor:
+                for key in ('passed', 'failed', 'total'):
+                    stats[key] += result[key]
+            if result['round'] >= warmup:
+                measured.extend(result['results'])
+            leftovers.extend(result['leftovers'])
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+    if leftovers:
+        print(f"\n{Fore.YELLOW}Could not clean up: {', '.join(leftovers)}{Style.RESET_ALL}")
+    print(f"\n{Fore.CYAN}Scenarios finished in {time.perf_counter() - started:.2f}s{Style.RESET_ALL}")
+    return measured
+
+# ============================================================================
+# TIMING REPORTS
+# ============================================================================
+
+def summarize_timings(results):
+    """Per-endpoint latency statistics ("METHOD /path/:id") from test results"""
+    grouped = defaultdict(list)
+    for result in results:
+        if result.get('total_ms') is not None:
+            grouped[f"{result['method']} {result['endpoint']}"].append(result)
+
+    endpoints = {}
+    for key, samples in sorted(grouped.items()):
+        totals = sorted(sample['total_ms'] for sample in samples)
+        ttfbs = sorted(sample['ttfb_ms'] for sample in samples if sample['ttfb_ms'] is not None)
+        endpoints[key] = {
+            'samples': len(samples),
+            'failures': sum(1 for sample in samples if sample['status'] != 'PASS'),
+            'total_ms': {
+                'mean': round(sum(totals) / len(totals), 2),
+                'p50': round(percentile(totals, 50), 2),
+                'p90': round(percentile(totals, 90), 2),
+                'p95': round(percentile(totals, 95), 2),
+                'p99': round(percentile(totals, 99), 2),
+                'max': round(totals[-1], 2),
+            },
+            'ttfb_ms': {
+                'p50': round(percentile(ttfbs, 50), 2),
+                'p95': round(percentile(ttfbs, 95), 2),
+            },
+            # Non-zero only for requests that opened a new connection
+            'dns_ms_mean': round(sum(sample['dns_ms'] for sample in samples) / len(samples), 3),
+            'connect_ms_mean': round(sum(sample['connect_ms'] for sample in samples) / len(samples), 3),
+            'bytes_mean': round(sum(sample['bytes'] for sample in samples) / len(samples)),
+        }
+    return endpoints
+
+def print_latency_report(endpoints):
+    """Print per-endpoint latency percentiles, slowest p95 first"""
+    print_header("LATENCY REPORT")
+
+    print(f"{'Endpoint':<45} {'Samples':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'TTFB p95':>9} {'Conn ms':>8} {'Bytes':>7}")
+    print('-' * 106)
+    for key, summary in sorted(endpoints.items(), key=lambda item: -item[1]['total_ms']['p95']):
+        total = summary['total_ms']
+        color = Fore.RED if summary['failures'] else ''
+        print(f"{color}{key:<45} {summary['samples']:>7} {total['p50']:>8.1f} {total['p95']:>8.1f} "
+              f"{total['p99']:>8.1f} {summary['ttfb_ms']['p95']:>9.1f} "
+              f"{summary['dns_ms_mean'] + summary['connect_ms_mean']:>8.2f} "
+              f"{summary['bytes_mean']:>7}{Style.RESET_ALL}")
+    print("\n" + "="*80 + "\n")
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def write_json_report(path, args, started_at, results, endpoints):
+    """Write the run's summary, per-endpoint statistics and every sample as JSON"""
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'started_at': started_at.isoformat(timespec='seconds'),
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'base_url': BASE_URL,
+            'scenarios': args.scenarios,
+            'repeat': args.repeat,
+            'warmup': args.warmup,
+            'workers': args.workers,
+        },
+        'summary': dict(stats),
+        'endpoints': endpoints,
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+    print(f"JSON report written to {path}")
+
+def write_junit_report(path, results):
+    """Write one JUnit test suite per scenario round, one test case per check"""
+    suites = ET.Element('testsuites', name='taakra-api')
+    grouped = defaultdict(list)
+    for result in results:
+        grouped[(result['scenario'], result['round'])].append(result)
+
+    for (scenario, round_number), cases in grouped.items():
+        suite = ET.SubElement(suites, 'testsuite', name=f"{scenario}#{round_number + 1}",
+                              tests=str(len(cases)),
+                              failures=str(sum(1 for case in cases if case['status'] != 'PASS')),
+                              time=f"{sum(case.get('total_ms') or 0 for case in cases) / 1000:.3f}")
+        for case in cases:
+            testcase = ET.SubElement(suite, 'testcase', classname=f"api.{scenario}", name=case['name'],
+                                     time=f"{(case.get('total_ms') or 0) / 1000:.3f}")
+            if case['status'] != 'PASS':
+                failure = ET.SubElement(testcase, 'failure', message=case['error'] or 'failed')
+                if case.get('method'):
+                    failure.text = f"{case['method']} {case['endpoint']} -> {case['status_code']}"
+
+    suites.set('tests', str(len(results)))
+    suites.set('failures', str(sum(1 for result in results if result['status'] != 'PASS')))
+    ET.ElementTree(suites).write(path, encoding='utf-8', xml_declaration=True)
+    print(f"JUnit report written to {path}")
+
+def compare_reports(current, baseline, threshold, min_delta_ms):
+    """Print p95 changes per endpoint and return the regressions.
+
+    An endpoint regresses when its p95 grows by more than `threshold`
+    percent and by more than `min_delta_ms` (so a 2 ms -> 3 ms blip on a
+    fast endpoint doesn't fail a deploy), or when it gains failures.
+    """
+    regressions = []
+
+    print(f"\n{Fore.CYAN}{'Endpoint':<45} {'p95 ms':>20} {'change':>8} {'failures':>10}{Style.RESET_ALL}")
+    for key, result in current['endpoints'].items():
+        base = baseline['endpoints'].get(key)
+        if not base:
+            print(f"{key:<45} {'(no baseline)':>20}")
+            continue
+
+        p95, base_p95 = result['total_ms']['p95'], base['total_ms']['p95']
+        change = (p95 - base_p95) / base_p95 * 100 if base_p95 else 0.0
+
+        problems = []
+        if change > threshold and p95 - base_p95 > min_delta_ms:
+            problems.append(f"p95 {base_p95:.1f} -> {p95:.1f} ms (+{change:.1f}%)")
+        if result['failures'] > base['failures']:
+            problems.append(f"failures {base['failures']} -> {result['failures']}")
+
+        color = Fore.RED if problems else Fore.GREEN
+        print(f"{color}{key:<45} {base_p95:>8.1f} -> {p95:<9.1f} {change:>+7.1f}% "
+              f"{base['failures']:>4} -> {result['failures']:<3}{Style.RESET_ALL}")
+        regressions.extend(f"{key}: {problem}" for problem in problems)
+
+    missing = sorted(set(baseline['endpoints']) - set(current['endpoints']))
+    if missing:
+        print(f"\n{Fore.YELLOW}Not measured in this run: {', '.join(missing)}{Style.RESET_ALL}")
+
+    if regressions:
+        print(f"\n{Fore.RED}Regressions beyond {threshold}%:{Style.RESET_ALL}")
+        for regression in regressions:
+            print(f"  - {regression}")
+    else:
+        print(f"\n{Fore.GREEN}No regressions beyond {threshold}%{Style.RESET_ALL}")
+
+    return regressions
+
+def run_compare(argv):
+    """`test_all_apis.py compare CURRENT BASELINE`: exit 1 on a p95 regression"""
+    parser = argparse.ArgumentParser(prog='test_all_apis.py compare',
+                                     description='Compare two --json reports per endpoint')
+    parser.add_argument('current', help='Report to check')
+    parser.add_argument('baseline', help='Baseline report')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Allowed p95 increase in percent before flagging a regression')
+    parser.add_argument('--min-delta-ms', type=float, default=5.0,
+                        help='Ignore p95 increases smaller than this many milliseconds')
+    args = parser.parse_args(argv)
+
+    with open(args.current) as f:
+        current = json.load(f)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = compare_reports(current, baseline, args.threshold, args.min_delta_ms)
+    return 1 if regressions else 0
+
+# ============================================================================
+# LOAD TESTING
+# ============================================================================
+
+LOAD_FLOWS = {
+    'auth': test_authentication,
+    'competitions': test_competitions,
+    'registrations': test_registrations,
+    'bulk-registrations': test_bulk_registrations,
+    'chat': test_chat_endpoints,
+}
+
+# Competitions each virtual user registers for in the bulk flow
+BULK_REGISTRATION_SIZE = 5
+
+class RateLimiter:
+    """Thread-safe pacer that spaces requests evenly to hit a target rate"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self.lock = threading.Lock()
+        self.next_slot = time.perf_counter()
+
+    def wait(self):
+        with self.lock:
+            now = time.perf_counter()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not values:
+        return 0.0
+    rank = max(0, math.ceil(pct / 100 * len(values)) - 1)
+    return values[rank]
+
+def fetch_competition_ids():
+    """Existing competitions for virtual users to register against"""
+    try:
+        response = get_session().get(f"{BASE_URL}/api/competitions", params={'limit': 100})
+        return [c['_id'] for c in response.json().get('data', [])]
+    except Exception:
+        return []
+
+def run_virtual_user(flows, deadline, competition_ids):
+    """Replay the selected flows as one user until the deadline passes.
+    Returns the ids of the users its auth flow signed up."""
+    created = []
+    while time.perf_counter() < deadline:
+        test_data.reset()
+        for flow in flows:
+            if time.perf_counter() >= deadline:
+                break
+            # Only registrations get real competitions; test_competitions
+            # would otherwise update seeded competitions with the admin token
+            if flow is test_registrations and competition_ids:
+                test_data['competition_id'] = random.choice(competition_ids)
+            if flow is test_bulk_registrations and competition_ids:
+                test_data['competition_ids'] = random.sample(
+                    competition_ids, min(BULK_REGISTRATION_SIZE, len(competition_ids)))
+            flow()
+        if test_data['user_id']:
+            created.append(test_data['user_id'])
+    return created
+
+def print_load_report(elapsed):
+    """Print per-endpoint throughput, latency percentiles and error rates"""
+    print_header("LOAD TEST REPORT")
+
+    print(f"{'Endpoint':<45} {'Reqs':>7} {'RPS':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'Errors':>8}")
+    print('-' * 100)
+
+    total_requests = 0
+    total_errors = 0
+    for key in sorted(load_samples):
+        samples = load_samples[key]
+        latencies = sorted(latency * 1000 for latency, _ in samples)
+        errors = sum(1 for _, ok in samples if not ok)
+        total_requests += len(samples)
+        total_errors += errors
+        error_rate = errors / len(samples) * 100
+        color = Fore.RED if errors else Fore.GREEN
+        print(f"{key:<45} {len(samples):>7} {len(samples) / elapsed:>8.1f} "
+              f"{percentile(latencies, 50):>9.1f} {percentile(latencies, 95):>9.1f} "
+              f"{percentile(latencies, 99):>9.1f} {color}{error_rate:>7.2f}%{Style.RESET_ALL}")
+
+    print('-' * 100)
+    overall_error_rate = (total_errors / total_requests * 100) if total_requests else 0
+    print(f"Duration: {elapsed:.1f}s  Requests: {total_requests}  "
+          f"Throughput: {total_requests / elapsed:.1f} req/s  Error rate: {overall_error_rate:.2f}%")
+    print("\n" + "="*80 + "\n")
+
+def run_load_test(users, rate, duration, flow_names, ramp_up=0):
+    """Run the selected flows as `users` concurrent virtual users"""
+    # Every other flow needs the tokens created by the auth flow, and flows
+    # depend on each other's ids, so always replay them in suite order
+    flow_names = [name for name in LOAD_FLOWS if name == 'auth' or name in flow_names]
+    flows = [LOAD_FLOWS[name] for name in flow_names]
+    needs_competitions = {'registrations', 'bulk-registrations'} & set(flow_names)
+    competition_ids = fetch_competition_ids() if needs_competitions else []
+
+    load_config['enabled'] = True
+    load_config['limiter'] = RateLimiter(rate) if rate else None
+
+    print(f"{Fore.CYAN}Running {users} virtual users for {duration}s "
+          f"({'unthrottled' if not rate else f'{rate} req/s target'}) "
+          f"flows: {', '.join(flow_names)}{Style.RESET_ALL}")
+
+    started = time.perf_counter()
+    deadline = started + duration
+    stagger = ramp_up / users if users else 0
+
+    created = []
+    with ThreadPoolExecutor(max_workers=users) as executor:
+        futures = []
+        for _ in range(users):
+            futures.append(executor.submit(run_virtual_user, flows, deadline, competition_ids))
+            if stagger:
+                time.sleep(stagger)
+        for future in futures:
+            created.extend(future.result())
+
+    load_config['enabled'] = False
+    load_config['limiter'] = None
+    print_load_report(time.perf_counter() - started)
+
+    # Every auth iteration signs up a fresh user; don't leave them behind
+    delete_users(created)
+
+# ============================================================================
+# SOCKET LOAD TESTING
+# ============================================================================
+
+SOCKET_MESSAGE_PREFIX = 'socket-load'
+
+def create_socket_users(count):
+    """Sign up `count` throwaway users in parallel and return (user_id, token) pairs"""
+    def signup(_):
+        try:
+            response = get_session().post(f"{BASE_URL}/api/auth/signup", json={
+                'name': 'Socket Load User',
+                'email': f"testuser_{unique_suffix()}@test.com",
+                'password': 'TestPass123!',
+            }, timeout=30)
+            if response.status_code != 201:
+                return None
+            data = response.json()['data']
+            return data['user']['_id'], data['accessToken']
+        except (requests.RequestException, ValueError, KeyError):
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(32, count)) as executor:
+        return [user for user in executor.map(signup, range(count)) if user]
+
+class SocketLoadStats:
+    """Connection, delivery and error counters for one socket load run"""
+
+    def __init__(self, run_id):
+        self.run_id = run_id
+        self.connect_times = []
+        self.connect_failures = 0
+        self.disconnects = 0
+        self.errors = 0
+        self.pending = {}
+        self.delivery_latencies = []
+        self.closing = False
+
+    def message_text(self, seq):
+        return f"{SOCKET_MESSAGE_PREFIX} {self.run_id} {seq}"
+
+    def lookup(self, payload):
+        """Pending entry for a message emitted by this run, or None"""
+        parts = str((payload or {}).get('message', '')).split()
+        if len(parts) != 3 or parts[0] != SOCKET_MESSAGE_PREFIX or parts[1] != self.run_id:
+            return None
+        return self.pending.get(int(parts[2]))
+
+    def record_delivery(self, payload):
+        entry = self.lookup(payload)
+        if entry:
+            entry['received'] += 1
+            self.delivery_latencies.append(time.perf_counter() - entry['sent_at'])
+
+    def record_ack(self, payload):
+        entry = self.lookup(payload)
+        if entry:
+            entry['acked'] = True
+
+async def open_socket_client(socketio, user_id, token, stats):
+    """Connect and authenticate one socket; returns the client or None"""
+    loop = asyncio.get_running_loop()
+    client = socketio.AsyncClient(reconnection=False)
+    authenticated = loop.create_future()
+
+    async def on_authenticated(data):
+        if not authenticated.done():
+            authenticated.set_result(True)
+
+    async def on_error(data):
+        stats.errors += 1
+        if not authenticated.done():
+            authenticated.set_result(False)
+
+    async def on_receive(payload):
+        stats.record_delivery(payload)
+
+    async def on_sent(payload):
+        stats.record_ack(payload)
+
+    async def on_disconnect(*args):
+        if not stats.closing:
+            stats.disconnects += 1
+
+    client.on('authenticated', on_authenticated)
+    client.on('error', on_error)
+    client.on('receiveMessage', on_receive)
+    client.on('messageSent', on_sent)
+    client.on('disconnect', on_disconnect)
+
+    started = time.perf_counter()
+    try:
+        await client.connect(BASE_URL, transports=['websocket'], wait_timeout=10)
+        await client.emit('authenticate', token)
+        ok = await asyncio.wait_for(authenticated, timeout=10)
+    except Exception:
+        ok = False
+
+    if not ok:
+        stats.connect_failures += 1
+        try:
+            await client.disconnect()
+        except Exception:
+            pass
+        return None
+
+    stats.connect_times.append(time.perf_counter() - started)
+    return client
+
+async def socket_load(socketio, users, connections, send_rate, duration, connect_rate, drain, typing_ratio):
+    """Open `connections` sockets over `users`, then send messages at `send_rate` per second"""
+    loop = asyncio.get_running_loop()
+    stats = SocketLoadStats(uuid.uuid4().hex[:8])
+
+    # Connections are spread round-robin, so users get several "tabs"
+    assignments = [users[i % len(users)] for i in range(connections)]
+    tasks = []
+    for user_id, token in assignments:
+        tasks.append(asyncio.create_task(open_socket_client(socketio, user_id, token, stats)))
+        if connect_rate:
+            await asyncio.sleep(1 / connect_rate)
+    clients = await asyncio.gather(*tasks)
+
+    sockets_by_user = defaultdict(list)
+    for (user_id, _), client in zip(assignments, clients):
+        if client:
+            sockets_by_user[user_id].append(client)
+    online = list(sockets_by_user)
+
+    print(f"{Fore.CYAN}{len(stats.connect_times)}/{connections} sockets authenticated "
+          f"for {len(online)} users; sending {send_rate} msg/s for {duration}s{Style.RESET_ALL}")
+
+    seq = 0
+    sends = set()
+    if len(online) >= 2:
+        deadline = loop.time() + duration
+        next_send = loop.time()
+        while loop.time() < deadline:
+            sender_id, receiver_id = random.sample(online, 2)
+            client = random.choice(sockets_by_user[sender_id])
+
+            if typing_ratio and random.random() < typing_ratio:
+                await client.emit('typing', {'receiverId': receiver_id})
+                await client.emit('stopTyping', {'receiverId': receiver_id})
+
+            seq += 1
+            stats.pending[seq] = {
+                'sent_at': time.perf_counter(),
+                'expected': len(sockets_by_user[receiver_id]),
+                'received': 0,
+                'acked': False,
+            }
+            task = asyncio.create_task(client.emit('sendMessage', {
+                'receiverId': receiver_id,
+                'message': stats.message_text(seq),
+            }))
+            sends.add(task)
+            task.add_done_callback(sends.discard)
+
+            next_send += 1 / send_rate
+            delay = next_send - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+    else:
+        print(f"{Fore.RED}Need at least two connected users to send messages{Style.RESET_ALL}")
+
+    # Give in-flight messages time to arrive before counting drops
+    if sends:
+        await asyncio.gather(*sends, return_exceptions=True)
+    await asyncio.sleep(drain)
+
+    stats.closing = True
+    await asyncio.gather(*(client.disconnect() for client in clients if client), return_exceptions=True)
+    return stats, connections, duration
+
+def print_socket_report(stats, connections, duration):
+    """Print connection cost, delivery latency and drop counts"""
+    print_header("SOCKET LOAD REPORT")
+
+    connect_ms = sorted(t * 1000 for t in stats.connect_times)
+    delivery_ms = sorted(t * 1000 for t in stats.delivery_latencies)
+    sent = len(stats.pending)
+    acked = sum(1 for entry in stats.pending.values() if entry['acked'])
+    expected = sum(entry['expected'] for entry in stats.pending.values())
+    delivered = sum(min(entry['received'], entry['expected']) for entry in stats.pending.values())
+    dropped = expected - delivered
+    drop_rate = dropped / expected * 100 if expected else 0
+
+    def latency_line(label, values):
+        print(f"{label:<28} p50 {percentile(values, 50):>8.1f}  p95 {percentile(values, 95):>8.1f}  "
+              f"p99 {percentile(values, 99):>8.1f}  max {(values[-1] if values else 0):>8.1f} ms")
+
+    print(f"Connections: {connections} requested, {len(stats.connect_times)} authenticated, "
+          f"{stats.connect_failures} failed, {stats.disconnects} dropped mid-run")
+    latency_line('Connect + authenticate', connect_ms)
+    print(f"Messages: {sent} sent ({sent / duration:.1f}/s), {acked} acknowledged (messageSent)")
+    color = Fore.RED if dropped else Fore.GREEN
+    print(f"Deliveries: {delivered}/{expected} received, {color}{dropped} dropped ({drop_rate:.2f}%){Style.RESET_ALL}")
+    latency_line('sendMessage -> receiveMessage', delivery_ms)
+    print(f"Socket errors: {stats.errors}")
+    print("\n" + "="*80 + "\n")
+
+def run_socket_load_test(connections, socket_users, send_rate, duration, connect_rate, drain, typing_ratio):
+    """Socket.IO chat load: authenticated connections exchanging messages"""
+    try:
+        import socketio
+    except ImportError:
+        print(f"{Fore.RED}Socket load mode needs python-socketio: "
+              f"pip install 'python-socketio[asyncio_client]'{Style.RESET_ALL}")
+        return
+
+    user_count = socket_users or min(connections, 200)
+    print(f"{Fore.CYAN}Signing up {user_count} socket load users...{Style.RESET_ALL}")
+    users = create_socket_users(user_count)
+    try:
+        if len(users) < 2:
+            print(f"{Fore.RED}Could not create enough users ({len(users)} signed up){Style.RESET_ALL}")
+            return
+
+        stats, connections, duration = asyncio.run(socket_load(
+            socketio, users, connections, send_rate, duration, connect_rate, drain, typing_ratio))
+        print_socket_report(stats, connections, duration)
+    finally:
+        # Same admin delete the scenario teardown uses
+        delete_users([user_id for user_id, _ in users])
+
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
 
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Taakra backend API test suite')
+    parser.add_argument('--base-url', default=BASE_URL, help='Backend base URL')
+    parser.add_argument('--load', action='store_true',
+                        help='Run concurrent load generation instead of the functional suite')
+    parser.add_argument('--users', type=int, default=50, help='Number of virtual users (load mode)')
+    parser.add_argument('--rate', type=float, default=0,
+                        help='Target total requests per second, 0 = unthrottled (load mode)')
+    parser.add_argument('--duration', type=float, default=30, help='Test duration in seconds (load mode)')
+    parser.add_argument('--ramp-up', type=float, default=0,
+                        help='Seconds over which virtual users are started (load mode)')
+    parser.add_argument('--flows', default=','.join(LOAD_FLOWS),
+                        help=f"Comma separated flows to replay: {', '.join(LOAD_FLOWS)}")
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Worker processes for the functional suite, 1 = run inline')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f"Comma separated scenarios to run: {', '.join(SCENARIOS)}")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='Measured rounds of every scenario, for stable latency percentiles')
+    parser.add_argument('--warmup', type=int, default=0,
+                        help='Extra rounds before the measured ones, left out of the timing reports')
+    parser.add_argument('--json', metavar='PATH', help='Write results, timings and per-endpoint latency as JSON')
+    parser.add_argument('--junit', metavar='PATH', help='Write results as JUnit XML')
+    parser.add_argument('--response-chars', type=int, default=200,
+                        help='Characters of each response to print, 0 = all')
+    parser.add_argument('--socket-load', action='store_true',
+                        help='Run the Socket.IO chat load test instead of the functional suite')
+    parser.add_argument('--connections', type=int, default=500,
+                        help='Authenticated sockets to open (socket load mode)')
+    parser.add_argument('--socket-users', type=int, default=0,
+                        help='Distinct users behind the sockets, default min(connections, 200) (socket load mode)')
+    parser.add_argument('--send-rate', type=float, default=50,
+                        help='Total messages per second across all sockets (socket load mode)')
+    parser.add_argument('--connect-rate', type=float, default=100,
+                        help='New connections per second while ramping up, 0 = all at once (socket load mode)')
+    parser.add_argument('--drain', type=float, default=5,
+                        help='Seconds to wait for in-flight messages before counting drops (socket load mode)')
+    parser.add_argument('--typing-ratio', type=float, default=0.1,
+                        help='Fraction of messages preceded by typing/stopTyping (socket load mode)')
+    args = parser.parse_args()
+
+    args.flows = [name.strip() for name in args.flows.split(',') if name.strip()]
+    unknown = [name for name in args.flows if name not in LOAD_FLOWS]
+    if unknown:
+        parser.error(f"Unknown flows: {', '.join(unknown)}")
+
+    args.scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)}")
+    args.repeat = max(1, args.repeat)
+    args.warmup = max(0, args.warmup)
+    args.workers = max(1, min(args.workers, len(args.scenarios) * (args.repeat + args.warmup)))
+
+    return args
+
 def main():
     """Main test execution"""
+    global BASE_URL
+    if sys.argv[1:2] == ['compare']:
+        sys.exit(run_compare(sys.argv[2:]))
+
+    args = parse_args()
+    BASE_URL = args.base_url.rstrip('/')
+    report_config['response_chars'] = max(0, args.response_chars)
+
+    if args.load:
+        try:
+            run_load_test(args.users, args.rate, args.duration, args.flows, args.ramp_up)
+        except KeyboardInterrupt:
+            print(f"\n\n{Fore.YELLOW}Load test interrupted by user{Style.RESET_ALL}")
+        return
+
+    if args.socket_load:
+        try:
+            run_socket_load_test(args.connections, args.socket_users, args.send_rate, args.duration,
+                                 args.connect_rate, args.drain, args.typing_ratio)
+        except KeyboardInterrupt:
+            print(f"\n\n{Fore.YELLOW}Socket load test interrupted by user{Style.RESET_ALL}")
+        return
+
     print(f"\n{Fore.CYAN}{Style.BRIGHT}")
     print("╔" + "="*78 + "╗")
     print("║" + "TAAKRA BACKEND API - COMPREHENSIVE TEST SUITE".center(78) + "║")
@@ -523,20 +1620,17 @@ def main():
     print("╚" + "="*78 + "╝")
     print(Style.RESET_ALL)
 
+    started_at = datetime.now()
     try:
-        # Run all tests in order
-        test_health_check()
-        test_authentication()
-        test_categories()
-        test_competitions()
-        test_registrations()
-        test_admin_endpoints()
-        test_chat_endpoints()
-        test_chatbot_endpoint()
-        test_authorization()
-
-        # Cleanup
-        cleanup_test_data()
+        # Scenarios create and clean up their own data, so they run in parallel
+        results = run_scenarios(args.scenarios, args.workers, args.repeat, args.warmup)
+
+        endpoints = summarize_timings(results)
+        print_latency_report(endpoints)
+        if args.json:
+            write_json_report(args.json, args, started_at, results, endpoints)
+        if args.junit:
+            write_junit_report(args.junit, results)
 
         # Print summary
         print_summary()
@@ -548,5 +1642,8 @@ def main():
         print(f"\n\n{Fore.RED}Unexpected error during test execution: {str(e)}{Style.RESET_ALL}")
         print_summary()
 
+    # Non-zero exit so CI can gate on the run
+    sys.exit(1 if stats['failed'] else 0)
+
 if __name__ == '__main__':
     main()